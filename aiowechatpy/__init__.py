@@ -13,6 +13,8 @@ from aiowechatpy.oauth import WeChatOAuth  # NOQA
 from aiowechatpy.parser import parse_message  # NOQA
 from aiowechatpy.pay import WeChatPay  # NOQA
 from aiowechatpy.replies import create_reply  # NOQA
+from aiowechatpy.router import MessageRouter  # NOQA
+from aiowechatpy.dedupe import MessageDeduplicator  # NOQA
 
 __version__ = "2.0.0.alpha26"
 __author__ = "messense"
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.asgi
+    ~~~~~~~~~~~~~~~~
+
+    This module provides ASGI applications serving WeChat callbacks
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import asyncio
+import logging
+from urllib.parse import parse_qsl
+from xml.parsers.expat import ExpatError
+
+from aiowechatpy.crypto import WeChatCrypto
+from aiowechatpy.dedupe import envelope_key, message_key
+from aiowechatpy.exceptions import InvalidAppIdException, InvalidSignatureException
+from aiowechatpy.parser import parse_message
+from aiowechatpy.replies import EmptyReply
+from aiowechatpy.utils import check_signature, to_binary
+from aiowechatpy.work.crypto import WeChatCrypto as WorkWeChatCrypto
+from aiowechatpy.work.exceptions import InvalidCorpIdException
+
+logger = logging.getLogger(__name__)
+
+_XML_HEADERS = [(b"content-type", b"application/xml; charset=utf-8")]
+_TEXT_HEADERS = [(b"content-type", b"text/plain; charset=utf-8")]
+
+
+class _HTTPError(Exception):
+    def __init__(self, status):
+        self.status = status
+
+
+async def send_reply(client, message, reply):
+    """
+    以客服消息（企业微信为应用消息）发送被动回复，用于处理超时的回复
+
+    支持文本、图片、语音、视频和图文回复，其他类型的回复只记录日志
+
+    :param client: 公众号或企业微信的 WeChatClient
+    :param message: 收到的消息
+    :param reply: 回复
+    """
+    user_id = message.source
+    agent = getattr(message, "agent", None)
+    if agent:
+        if reply.type == "text":
+            return await client.message.send_text(agent, user_id, reply.content)
+        if reply.type in ("image", "voice"):
+            return await getattr(client.message, f"send_{reply.type}")(agent, user_id, reply.media_id)
+        if reply.type == "video":
+            return await client.message.send_video(agent, user_id, reply.media_id, reply.title, reply.description)
+        if reply.type == "news":
+            return await client.message.send_articles(agent, user_id, reply.articles)
+    else:
+        if reply.type == "text":
+            return await client.message.send_text(user_id, reply.content)
+        if reply.type in ("image", "voice"):
+            return await getattr(client.message, f"send_{reply.type}")(user_id, reply.media_id)
+        if reply.type == "video":
+            return await client.message.send_video(user_id, reply.media_id, reply.title, reply.description)
+        if reply.type == "news":
+            return await client.message.send_articles(user_id, reply.articles)
+    logger.warning("Can not send late %s reply to %s", reply.type, user_id)
+
+
+class BaseCallbackApp:
+    """
+    微信服务器回调的 ASGI 应用基类
+
+    处理函数没有在 ``deadline`` 秒内返回时先回复空串，避免微信服务器超时重试，处理函数返回后把回复交给
+    ``on_timeout`` 发送。签名错误返回 403，消息无法解析返回 400，其他错误记录日志后以 ``error_response`` 响应。
+
+    指定 ``dedupe`` 时，微信服务器重试的消息不再调用处理函数，直接回复第一次处理的结果；加密消息在解密前
+    以 Encrypt 查找记录。
+
+    :param router: ``MessageRouter``
+    :param deadline: 可选，等待处理函数的最长时间，单位秒，微信服务器 5 秒内收不到回复会重试
+    :param on_timeout: 可选，async 函数 ``on_timeout(message, reply)``，发送超时的回复
+    :param client: 可选，未指定 ``on_timeout`` 时用于以客服消息发送超时的回复
+    :param max_body_size: 可选，请求体的最大字节数
+    :param dedupe: 可选，``MessageDeduplicator``
+    """
+
+    # (status, headers, body) answered when handling a request failed unexpectedly
+    error_response = (500, _TEXT_HEADERS, b"")
+
+    def __init__(self, router=None, deadline=4.5, on_timeout=None, client=None, max_body_size=1024 * 1024, dedupe=None):
+        self.router = router
+        self.deadline = deadline
+        if on_timeout is None and client is not None:
+
+            async def on_timeout(message, reply):
+                await send_reply(client, message, reply)
+
+        self.on_timeout = on_timeout
+        self.max_body_size = max_body_size
+        self.dedupe = dedupe
+        # late replies being sent, referenced so they are not garbage collected
+        self._tasks = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        try:
+            if scope["method"] == "GET":
+                status, headers, body = 200, _TEXT_HEADERS, to_binary(self.verify(params))
+            elif scope["method"] == "POST":
+                status, headers, body = 200, _XML_HEADERS, await self.handle(params, await self._read_body(receive))
+            else:
+                status, headers, body = 405, _TEXT_HEADERS, b""
+        except _HTTPError as e:
+            status, headers, body = e.status, _TEXT_HEADERS, b""
+        except (InvalidSignatureException, InvalidAppIdException, InvalidCorpIdException):
+            status, headers, body = 403, _TEXT_HEADERS, b""
+        except (ExpatError, KeyError, ValueError):
+            # malformed XML, or well-formed XML that is not a message
+            logger.warning("Bad callback request", exc_info=True)
+            status, headers, body = 400, _TEXT_HEADERS, b""
+        except Exception:
+            logger.exception("Failed to handle callback request")
+            status, headers, body = self.error_response
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise _HTTPError(400)
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                raise _HTTPError(413)
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    def verify(self, params):
+        """处理服务器配置验证的 GET 请求，返回响应内容"""
+        raise NotImplementedError()
+
+    async def handle(self, params, body):
+        """处理推送消息的 POST 请求，返回响应内容"""
+        raise NotImplementedError()
+
+    async def reply(self, message):
+        """
+        调用处理函数，超时返回 ``EmptyReply``，处理函数返回后交给 ``on_timeout`` 发送
+
+        :param message: 消息对象
+        :return: 回复对象
+        """
+        if self.router is None:
+            return EmptyReply()
+        task = asyncio.ensure_future(self.router.dispatch(message))
+        # unlike wait_for, wait leaves the handler running on timeout
+        await asyncio.wait((task,), timeout=self.deadline)
+        if not task.done():
+            logger.warning("Handler of %r missed the %ss deadline", message, self.deadline)
+            self._tasks.add(task)
+            task.add_done_callback(lambda task: self._send_late(task, message))
+            return EmptyReply()
+        if task.cancelled():
+            return EmptyReply()
+        if task.exception() is not None:
+            logger.error("Failed to handle %r", message, exc_info=task.exception())
+            return EmptyReply()
+        return task.result()
+
+    async def render(self, message, aliases=()):
+        """
+        调用处理函数并返回回复的 XML，重复的消息返回第一次处理的结果
+
+        :param message: 消息对象
+        :param aliases: 可选，同时记录结果的其他去重 key
+        :return: 回复的 XML，空回复为空串
+        """
+        if message is None:
+            # empty body, nothing to handle
+            return ""
+        if self.dedupe is None:
+            return (await self.reply(message)).render()
+
+        async def compute():
+            return (await self.reply(message)).render()
+
+        # None means another node is handling it
+        return await self.dedupe.run(message_key(message), compute, aliases) or ""
+
+    async def _render_encrypted(self, body, signature, timestamp, nonce):
+        encrypt = self.crypto.get_encrypt(body)
+        aliases = ()
+        if self.dedupe is not None:
+            # retries carry the same Encrypt, so they are found without decrypting
+            self.crypto.check_encrypt(encrypt, signature, timestamp, nonce)
+            key = envelope_key(encrypt)
+            xml = await self.dedupe.get(key)
+            if xml is not None:
+                return xml
+            aliases = (key,)
+        message = self.crypto.parse_message({"Encrypt": encrypt}, signature, timestamp, nonce)
+        return await self.render(message, aliases)
+
+    def _send_late(self, task, message):
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Failed to handle %r", message, exc_info=task.exception())
+            return
+        reply = task.result()
+        if isinstance(reply, EmptyReply):
+            return
+        if self.on_timeout is None:
+            logger.warning("Dropped late reply to %r, on_timeout is not set", message)
+            return
+        sending = asyncio.ensure_future(self.on_timeout(message, reply))
+        self._tasks.add(sending)
+        sending.add_done_callback(self._sent)
+
+    def _sent(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to send late reply", exc_info=task.exception())
+
+    async def aclose(self):
+        """等待正在处理的超时回复完成，ASGI 服务器关闭时自动调用"""
+        # finished handlers may start sending, so wait until nothing is left
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class WeChatCallbackApp(BaseCallbackApp):
+    """
+    公众号消息回调的 ASGI 应用，支持明文模式、兼容模式和安全模式
+
+    .. code-block:: python
+
+        app = WeChatCallbackApp(router, token, encoding_aes_key, app_id, client=client)
+        # uvicorn module:app
+
+    :param router: ``MessageRouter``
+    :param token: 公众号消息校验 Token
+    :param encoding_aes_key: 可选，消息加解密 Key，明文模式不需要
+    :param app_id: 可选，公众号 AppID，明文模式不需要
+    :param kwargs: ``BaseCallbackApp`` 的其他参数
+    """
+
+    def __init__(self, router, token, encoding_aes_key=None, app_id=None, **kwargs):
+        super().__init__(router, **kwargs)
+        self.token = token
+        self.crypto = WeChatCrypto(token, encoding_aes_key, app_id) if encoding_aes_key else None
+
+    def verify(self, params):
+        check_signature(self.token, params.get("signature", ""), params.get("timestamp", ""), params.get("nonce", ""))
+        return params.get("echostr", "")
+
+    async def handle(self, params, body):
+        timestamp, nonce = params.get("timestamp", ""), params.get("nonce", "")
+        check_signature(self.token, params.get("signature", ""), timestamp, nonce)
+        encrypted = params.get("encrypt_type") == "aes"
+        if encrypted:
+            if self.crypto is None:
+                raise _HTTPError(400)
+            xml = await self._render_encrypted(body, params.get("msg_signature", ""), timestamp, nonce)
+            # encrypted per request, retries may come with another nonce
+            return self.crypto.encrypt_message_bytes(xml, nonce, timestamp) if xml else b""
+        return to_binary(await self.render(parse_message(body)))
+
+
+class WorkCallbackApp(BaseCallbackApp):
+    """
+    企业微信应用消息回调的 ASGI 应用
+
+    :param router: ``MessageRouter``，应使用 ``MessageRouter(create_reply=aiowechatpy.work.create_reply)``
+    :param token: 回调 Token
+    :param encoding_aes_key: 回调 EncodingAESKey
+    :param corp_id: 企业 ID
+    :param kwargs: ``BaseCallbackApp`` 的其他参数
+    """
+
+    def __init__(self, router, token, encoding_aes_key, corp_id, **kwargs):
+        super().__init__(router, **kwargs)
+        self.crypto = WorkWeChatCrypto(token, encoding_aes_key, corp_id)
+
+    def verify(self, params):
+        return self.crypto.check_signature(
+            params.get("msg_signature", ""), params.get("timestamp", ""), params.get("nonce", ""), params["echostr"]
+        )
+
+    async def handle(self, params, body):
+        timestamp, nonce = params.get("timestamp", ""), params.get("nonce", "")
+        xml = await self._render_encrypted(body, params.get("msg_signature", ""), timestamp, nonce)
+        return self.crypto.encrypt_message_bytes(xml, nonce, timestamp) if xml else b""
+
+
+class ComponentCallbackApp(BaseCallbackApp):
+    """
+    第三方平台授权事件回调的 ASGI 应用
+
+    由 ``WeChatComponent.parse_message`` 保存 component_verify_ticket、换取授权信息后，再把通知交给 ``router``
+    （可选），响应 ``success``。代公众号接收的消息与公众号回调相同，使用第三方平台的 Token、Key 和 AppID 创建
+    ``WeChatCallbackApp`` 即可。
+
+    换取授权信息等处理失败时记录日志并同样响应 ``success``，重试不能解决这些错误。
+
+    :param component: ``WeChatComponent``
+    :param router: 可选，``MessageRouter``，按通知类型如 ``authorized`` 注册处理函数，返回值被忽略
+    :param kwargs: ``BaseCallbackApp`` 的其他参数
+    """
+
+    # a failed push, e.g. query_auth rejected by the server, is not fixed by a retry
+    error_response = (200, _XML_HEADERS, b"success")
+
+    def __init__(self, component, router=None, **kwargs):
+        super().__init__(router, **kwargs)
+        self.component = component
+
+    def verify(self, params):
+        raise _HTTPError(405)
+
+    async def handle(self, params, body):
+        signature = params.get("msg_signature", "")
+        timestamp, nonce = params.get("timestamp", ""), params.get("nonce", "")
+
+        async def compute():
+            message = await self.component.parse_message(body, signature, timestamp, nonce)
+            await self.reply(message)
+            return "success"
+
+        if self.dedupe is None:
+            await compute()
+        else:
+            # retries skip saving the ticket and querying the authorization again
+            encrypt = self.component.crypto.get_encrypt(body)
+            self.component.crypto.check_encrypt(encrypt, signature, timestamp, nonce)
+            await self.dedupe.run(envelope_key(encrypt), compute)
+        return b"success"
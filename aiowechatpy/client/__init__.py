@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 
 
-import time
-
 from aiowechatpy.client.base import BaseWeChatClient
 from aiowechatpy.client import api
 
@@ -50,8 +48,11 @@ class WeChatClient(BaseWeChatClient):
         session=None,
         timeout=None,
         auto_retry=True,
+        transport=None,
+        rate_limiter=None,
+        retry_policy=None,
     ):
-        super().__init__(appid, session, timeout, auto_retry)
+        super().__init__(appid, session, timeout, auto_retry, transport, rate_limiter, retry_policy)
         self.appid = appid
         self.secret = secret
 
@@ -84,9 +85,23 @@ class WeChatComponentClient(WeChatClient):
         component,
         session=None,
         timeout=None,
+        transport=None,
+        rate_limiter=None,
+        retry_policy=None,
     ):
         # 未用到secret，所以这里没有
-        super().__init__(appid, "", session, timeout)
+        super().__init__(
+            appid,
+            "",
+            session,
+            timeout,
+            transport=transport,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+        )
+        if transport is None:
+            # borrowed from the component, which closes it
+            self._http = component._http
         self.appid = appid
         self.component = component
         # 如果公众号是刚授权，外部还没有缓存access_token和refresh_token
@@ -110,12 +125,12 @@ class WeChatComponentClient(WeChatClient):
     async def get_access_token(self):
         access_token = await self.session.get(self.access_token_key)
         if not access_token:
-            await self.fetch_access_token()
+            await self._refresh_access_token()
             access_token = await self.session.get(self.access_token_key)
         return access_token
 
     async def refresh_token(self):
-        return self.session.get(self.refresh_token_key)
+        return await self.session.get(self.refresh_token_key)
 
     async def fetch_access_token(self):
         """
@@ -129,9 +144,10 @@ class WeChatComponentClient(WeChatClient):
         :return: 返回的 JSON 数据包
         """
         expires_in = 7200
-        result = await self.component.refresh_authorizer_token(self.appid, self.refresh_token)
+        result = await self.component.refresh_authorizer_token(self.appid, await self.refresh_token())
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        await self.session.set(self.access_token_key, result["authorizer_access_token"], expires_in)
-        self.expires_at = int(time.time()) + expires_in
+        await self._store_access_token(result["authorizer_access_token"], expires_in)
+        if result.get("authorizer_refresh_token"):
+            await self.session.set(self.refresh_token_key, result["authorizer_refresh_token"])
         return result
@@ -7,6 +7,18 @@ class BaseWeChatAPI:
     def __init__(self, client=None):
         self._client = client
 
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        # bind a copy to the client on first access, the cached attribute
+        # then shadows this non-data descriptor
+        if instance is None:
+            return self
+        api = type(self)(instance)
+        instance.__dict__[self._name] = api
+        return api
+
     async def _get(self, url, **kwargs):
         if getattr(self, "API_BASE_URL", None):
             kwargs["api_base_url"] = self.API_BASE_URL
@@ -3,8 +3,6 @@
 import json
 from enum import IntEnum
 
-import httpx
-
 from aiowechatpy.client.api.base import BaseWeChatAPI
 
 
@@ -317,7 +315,7 @@ class WeChatCloud(BaseWeChatAPI):
         :param env: 云开发环境 ID
         """
         with open(path, "rb") as f:
-            res =await  self._post(
+            res = await self._post(
                 "tcb/uploadfile",
                 data={
                     "env": env,
@@ -327,7 +325,7 @@ class WeChatCloud(BaseWeChatAPI):
             signature = res["authorization"]
             token = res["token"]
             cos_file_id = res["cos_file_id"]
-            upload_res = await httpx.AsyncClient().post(
+            upload_res = await self._client._http.post(
                 res["url"],
                 files={
                     "key": path,
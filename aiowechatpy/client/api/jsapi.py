@@ -20,15 +20,57 @@ from aiowechatpy.schemes import JsApiCardExt
 
 
 class WeChatJSAPI(BaseWeChatAPI):
-    def get_ticket(self, type="jsapi"):
+    # session 中缓存的 ticket 名称及其对应的 ticket 类型
+    TICKET_TYPES = {
+        "jsapi": "jsapi",
+        "jsapi_card": "wx_card",
+    }
+
+    async def get_ticket(self, type="jsapi"):
         """
         获取微信 JS-SDK ticket
 
         :return: 返回的 JSON 数据包
         """
-        return self._get("ticket/getticket", params={"type": type})
+        return await self._get("ticket/getticket", params={"type": type})
+
+    async def get_ticket_expires_at(self, name):
+        """
+        获取 session 中缓存的 ticket 过期时间
+
+        :param name: ticket 名称，``jsapi`` 或 ``jsapi_card``
+        :return: 过期时间戳，未缓存时返回 0
+        """
+        return await self.session.get(f"{self.appid}_{name}_ticket_expires_at") or 0
 
-    def get_jsapi_ticket(self):
+    async def refresh_ticket(self, name):
+        """
+        重新获取 ticket 并缓存到 session 中
+
+        :param name: ticket 名称，``jsapi`` 或 ``jsapi_card``
+        :return: ticket
+        """
+        res = await self.get_ticket(self.TICKET_TYPES[name])
+        ticket = res["ticket"]
+        expires_in = int(res["expires_in"])
+        await self.session.set_many(
+            {
+                f"{self.appid}_{name}_ticket": ticket,
+                f"{self.appid}_{name}_ticket_expires_at": int(time.time()) + expires_in,
+            },
+            expires_in,
+        )
+        return ticket
+
+    async def _get_cached_ticket(self, name):
+        ticket, expires_at = await self.session.get_many(
+            [f"{self.appid}_{name}_ticket", f"{self.appid}_{name}_ticket_expires_at"]
+        )
+        if not ticket or int(expires_at or 0) < int(time.time()):
+            ticket = await self.refresh_ticket(name)
+        return ticket
+
+    async def get_jsapi_ticket(self):
         """
         获取微信 JS-SDK ticket
 
@@ -36,17 +78,7 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: ticket
         """
-        ticket_key = f"{self.appid}_jsapi_ticket"
-        expires_at_key = f"{self.appid}_jsapi_ticket_expires_at"
-        ticket = self.session.get(ticket_key)
-        expires_at = self.session.get(expires_at_key) or 0
-        if not ticket or expires_at < int(time.time()):
-            jsapi_ticket_response = self.get_ticket("jsapi")
-            ticket = jsapi_ticket_response["ticket"]
-            expires_at = int(time.time()) + int(jsapi_ticket_response["expires_in"])
-            self.session.set(ticket_key, ticket)
-            self.session.set(expires_at_key, expires_at)
-        return ticket
+        return await self._get_cached_ticket("jsapi")
 
     def get_jsapi_signature(self, noncestr, ticket, timestamp, url):
         """
@@ -68,7 +100,7 @@ class WeChatJSAPI(BaseWeChatAPI):
         signer.add_data(*data)
         return signer.signature
 
-    def get_jsapi_card_ticket(self):
+    async def get_jsapi_card_ticket(self):
         """
         获取 api_ticket：是用于调用微信卡券JS API的临时票据, 有效期为7200 秒, 通过access_token 来获取.
         微信文档地址：https://developers.weixin.qq.com/doc/offiaccount/OA_Web_Apps/JS-SDK.html#62
@@ -76,18 +108,7 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: ticket
         """
-        jsapi_card_ticket_key = f"{self.appid}_jsapi_card_ticket"
-        jsapi_card_ticket_expire_at_key = f"{self.appid}_jsapi_card_ticket_expires_at"
-
-        ticket = self.session.get(jsapi_card_ticket_key)
-        expires_at = self.session.get(jsapi_card_ticket_expire_at_key, 0)
-        if not ticket or int(expires_at) < int(time.time()):
-            ticket_response = self.get_ticket("wx_card")
-            ticket = ticket_response["ticket"]
-            expires_at = int(time.time()) + int(ticket_response["expires_in"])
-            self.session.set(jsapi_card_ticket_key, ticket)
-            self.session.set(jsapi_card_ticket_expire_at_key, expires_at)
-        return ticket
+        return await self._get_cached_ticket("jsapi_card")
 
     def get_jsapi_add_card_params(
         self,
@@ -33,7 +33,7 @@ class WeChatMedia(BaseWeChatAPI):
 
         :return: requests 的 Response 实例
         """
-        return self._get("media/get", params={"media_id": media_id})
+        return self._get("media/get", params={"media_id": media_id}, binary=True)
 
     def get_url(self, media_id):
         """
@@ -13,7 +13,7 @@ class WeChatWxa(BaseWeChatAPI):
         详情请参考
         https://developers.weixin.qq.com/miniprogram/dev/api-backend/open-api/qr-code/wxacode.createQRCode.html
         """
-        return await self._post("cgi-bin/wxaapp/createwxaqrcode", data={"path": path, "width": width})
+        return await self._post("cgi-bin/wxaapp/createwxaqrcode", data={"path": path, "width": width}, binary=True)
 
     async def get_wxa_code(
         self,
@@ -41,6 +41,7 @@ class WeChatWxa(BaseWeChatAPI):
                 "is_hyaline": is_hyaline,
                 "env_version": env_version,
             },
+            binary=True,
         )
 
     async def get_wxa_code_unlimited(
@@ -73,6 +74,7 @@ class WeChatWxa(BaseWeChatAPI):
                 check_path=check_path,
                 env_version=env_version,
             ),
+            binary=True,
         )
 
     async def send_template_message(
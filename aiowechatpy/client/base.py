@@ -1,43 +1,105 @@
 # -*- coding: utf-8 -*-
-import json
 import time
-import inspect
+import asyncio
 import logging
+import weakref
 
 import httpx
 
+from aiowechatpy.codec import default_codec
 from aiowechatpy.constants import WeChatErrorCode
 from aiowechatpy.session import SessionStorage
 from aiowechatpy.session.memorystorage import MemoryStorage
 from aiowechatpy.exceptions import WeChatClientException, APILimitedException
-from aiowechatpy.client.api.base import BaseWeChatAPI
+from aiowechatpy.client.ratelimit import RateLimiter
+from aiowechatpy.client.refresher import TokenRefresher
+from aiowechatpy.client.retry import RetryPolicy
+from aiowechatpy.transport import TransportManager, get_transport_manager
+from aiowechatpy.utils import SingleFlight
 
 
 logger = logging.getLogger(__name__)
 
+# seconds a node may hold the token refresh lease
+TOKEN_LEASE_TTL = 10
+# seconds between checks for a token refreshed by the lease holder
+TOKEN_LEASE_POLL_INTERVAL = 0.1
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseWeChatAPI)
+# session -> in-flight token fetches of the clients sharing it, keyed by the
+# session object itself, an id() may be reused once the session is collected
+_token_flights = weakref.WeakKeyDictionary()
 
 
-class BaseWeChatClient:
-    API_BASE_URL = ""
+def get_token_flight(session):
+    """The SingleFlight coalescing token fetches of the clients sharing ``session``"""
+    flight = _token_flights.get(session)
+    if flight is None:
+        flight = _token_flights[session] = SingleFlight()
+    return flight
+
+
+async def fetch_with_lease(session, lease_key, fetch, read_shared):
+    """
+    Run ``fetch`` on exactly one node sharing ``session``
+
+    The node holding the lease fetches, the others poll ``read_shared``
+    until it returns the value published by the lease holder. If the
+    holder does not publish before the lease expires, fetch anyway.
+    The lease may be won just after another holder published and
+    released it, so the new holder reads once more before fetching.
+    """
+    lease = await session.acquire_lease(lease_key, TOKEN_LEASE_TTL)
+    if lease:
+        try:
+            result = await read_shared()
+            if result:
+                return result
+            return await fetch()
+        finally:
+            await session.release_lease(lease_key, lease)
+
+    deadline = time.time() + TOKEN_LEASE_TTL
+    while time.time() < deadline:
+        await asyncio.sleep(TOKEN_LEASE_POLL_INTERVAL)
+        result = await read_shared()
+        if result:
+            return result
+    logger.warning("Timed out waiting for %s, fetch it on this node", lease_key)
+    return await fetch()
 
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, api in api_endpoints:
-            api_cls = type(api)
-            api = api_cls(self)
-            setattr(self, name, api)
-        return self
 
-    def __init__(self, appid, session: SessionStorage = None, timeout=None, auto_retry=True):
-        self._http = httpx.AsyncClient()
+class BaseWeChatClient:
+    API_BASE_URL = ""
+    # query parameter carrying the token in API requests
+    ACCESS_TOKEN_PARAM = "access_token"
+    # codec of JSON request and response bodies
+    json_codec = default_codec
+
+    def __init__(
+        self,
+        appid,
+        session: SessionStorage = None,
+        timeout=None,
+        auto_retry=True,
+        transport: TransportManager = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+    ):
+        # a manager given to this client is closed with it, the process-wide one is not
+        self._owns_transport = transport is not None and transport is not get_transport_manager()
+        self._http = transport or get_transport_manager()
         self.appid = appid
+        self.expires_at = None
         self.session: SessionStorage = session or MemoryStorage()
         self.timeout = timeout
         self.auto_retry = auto_retry
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.refresher = None
+
+    @property
+    def _token_flight(self):
+        return get_token_flight(self.session)
 
     @property
     def access_token_key(self):
@@ -45,14 +107,13 @@ class BaseWeChatClient:
 
     @property
     def access_token_expires_at_key(self):
-        return f"{self.appid}_access_token_expires_at"
+        return f"{self.access_token_key}_expires_at"
 
     async def get_expires_at(self):
         return await self.session.get(self.access_token_expires_at_key, None)
 
-    # todo: async setter 实现不正确
-    async def set_expires_at(self, value):
-        await self.session.set(self.access_token_expires_at_key, value)
+    async def set_expires_at(self, value, ttl=None):
+        await self.session.set(self.access_token_expires_at_key, value, ttl)
 
     async def _request(self, method, url_or_endpoint, **kwargs):
         if not url_or_endpoint.startswith(("http://", "https://")):
@@ -63,15 +124,35 @@ class BaseWeChatClient:
 
         if "params" not in kwargs:
             kwargs["params"] = {}
-        if isinstance(kwargs["params"], dict) and "access_token" not in kwargs["params"]:
-            kwargs["params"]["access_token"] = self.access_token
+        if isinstance(kwargs["params"], dict) and self.ACCESS_TOKEN_PARAM not in kwargs["params"]:
+            kwargs["params"][self.ACCESS_TOKEN_PARAM] = await self.access_token()
         if isinstance(kwargs.get("data", ""), dict):
-            body = json.dumps(kwargs["data"], ensure_ascii=False)
-            body = body.encode("utf-8")
-            kwargs["data"] = body
+            kwargs["content"] = self.json_codec.dumps(kwargs.pop("data"))
 
-        kwargs["timeout"] = kwargs.get("timeout", self.timeout)
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
         result_processor = kwargs.pop("result_processor", None)
+        binary = kwargs.pop("binary", False)
+        retry_policy = kwargs.pop("retry_policy", None) or self.retry_policy
+        idempotent = kwargs.pop("idempotent", None)
+        if idempotent is None:
+            idempotent = retry_policy.is_idempotent(method, url)
+
+        attempt = 1
+        while True:
+            try:
+                return await self._send_request(method, url, result_processor, binary=binary, **kwargs)
+            except Exception as e:
+                delay = retry_policy.get_delay(attempt, e, idempotent)
+                if delay is None:
+                    raise
+                logger.info("Request %s %s failed: %r, retry in %.2f seconds", method, url, e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_request(self, method, url, result_processor=None, token_retry=True, binary=False, **kwargs):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(self.appid, url)
         res = await self._http.request(method=method, url=url, **kwargs)
         try:
             res.raise_for_status()
@@ -84,21 +165,36 @@ class BaseWeChatClient:
                 response=res,
             )
 
-        return await self._handle_result(res, method, url, result_processor, **kwargs)
+        return await self._handle_result(res, method, url, result_processor, token_retry, binary, **kwargs)
 
-    def _decode_result(self, res):
+    def _decode_result(self, res, binary=False):
+        """
+        按响应的 Content-Type 解码，JSON 和文本响应解码为 JSON，图片、音视频等二进制响应直接返回 Response 对象
+
+        :param binary: 可选，接口正常返回二进制内容，响应没有 Content-Type 时不尝试解码
+        """
+        content_type = res.headers.get("Content-Type", "").partition(";")[0].strip().lower()
+        if content_type:
+            # some JSON results, such as errors of media/get, are served as text/plain
+            decode = content_type.endswith("json") or content_type.startswith("text/")
+        else:
+            decode = not binary
+        if not decode:
+            return res
         try:
-            result = json.loads(res.content.decode("utf-8", "ignore"), strict=False)
+            result = self.json_codec.loads(res.content)
         except (TypeError, ValueError):
             # Return origin response object if we can not decode it as JSON
             logger.debug("Can not decode response as JSON", exc_info=True)
             return res
         return result
 
-    async def _handle_result(self, res, method=None, url=None, result_processor=None, **kwargs):
+    async def _handle_result(
+        self, res, method=None, url=None, result_processor=None, token_retry=True, binary=False, **kwargs
+    ):
         if not isinstance(res, dict):
             # Dirty hack around asyncio based AsyncWeChatClient
-            result = self._decode_result(res)
+            result = self._decode_result(res, binary)
         else:
             result = res
 
@@ -110,20 +206,29 @@ class BaseWeChatClient:
             result.update(result.pop("base_resp"))
         if "errcode" in result:
             result["errcode"] = int(result["errcode"])
+        if self.rate_limiter is not None and url:
+            self.rate_limiter.feedback(self.appid, url, result.get("errcode", 0))
 
         if "errcode" in result and result["errcode"] != 0:
             errcode = result["errcode"]
             errmsg = result.get("errmsg", errcode)
-            if self.auto_retry and errcode in (
+            if self.auto_retry and token_retry and errcode in (
                 WeChatErrorCode.INVALID_CREDENTIAL.value,
                 WeChatErrorCode.INVALID_ACCESS_TOKEN.value,
                 WeChatErrorCode.EXPIRED_ACCESS_TOKEN.value,
             ):
                 logger.info("Access token expired, fetch a new one and retry request")
-                await self.fetch_access_token()
+                stale_token = kwargs["params"].get(self.ACCESS_TOKEN_PARAM)
                 access_token = await self.session.get(self.access_token_key)
-                kwargs["params"]["access_token"] = access_token
-                return await self._request(method=method, url_or_endpoint=url, result_processor=result_processor, **kwargs)
+                if not access_token or access_token == stale_token:
+                    # nobody has replaced the rejected token yet
+                    await self._refresh_access_token(stale_token)
+                    access_token = await self.session.get(self.access_token_key)
+                kwargs["params"][self.ACCESS_TOKEN_PARAM] = access_token
+                # retry once, a token rejected again is not going to be fixed by refreshing
+                return await self._send_request(
+                    method, url, result_processor, token_retry=False, binary=binary, **kwargs
+                )
             elif errcode == WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value:
                 # api freq out of limit
                 raise APILimitedException(errcode, errmsg, client=self, request=res.request, response=res)
@@ -152,7 +257,7 @@ class BaseWeChatClient:
                 request=reqe.request,
                 response=res,
             )
-        result = res.json()
+        result = self.json_codec.loads(res.content)
         if "errcode" in result and result["errcode"] != 0:
             raise WeChatClientException(
                 result["errcode"],
@@ -165,17 +270,66 @@ class BaseWeChatClient:
         expires_in = 7200
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        await self.session.set(self.access_token_key, result["access_token"], expires_in)
-        self.expires_at = int(time.time()) + expires_in
+        await self._store_access_token(result["access_token"], expires_in)
         return result
 
+    async def _store_access_token(self, access_token, expires_in):
+        """Save a fetched token and its expiry where every node can read them"""
+        self.expires_at = int(time.time()) + expires_in
+        # one batched write, so a reader does not pair the old token with the new expiry
+        await self.session.set_many(
+            {self.access_token_key: access_token, self.access_token_expires_at_key: self.expires_at}, expires_in
+        )
+
+    async def _read_shared_access_token(self, stale_token=None, min_ttl=60):
+        """Read a token refreshed by another node, None if there is none valid for ``min_ttl`` seconds"""
+        keys = [self.access_token_key, self.access_token_expires_at_key]
+        if stale_token:
+            # the rejected token may still be cached in front of the shared storage
+            await self.session.discard_local(keys)
+        access_token, expires_at = await self.session.get_many(keys)
+        if not access_token or access_token == stale_token:
+            return None
+        if not expires_at or expires_at - time.time() <= min_ttl:
+            return None
+        self.expires_at = expires_at
+        return {"access_token": access_token, "expires_in": int(expires_at - time.time())}
+
+    async def _fetch_shared_access_token(self, stale_token=None, min_ttl=60):
+        result = await self._read_shared_access_token(stale_token, min_ttl)
+        if result:
+            return result
+        return await fetch_with_lease(
+            self.session,
+            f"{self.access_token_key}_lease",
+            self.fetch_access_token,
+            lambda: self._read_shared_access_token(stale_token, min_ttl),
+        )
+
     async def fetch_access_token(self):
         raise NotImplementedError()
 
+    async def _refresh_access_token(self, stale_token=None, min_ttl=60):
+        """
+        Fetch a new access token
+
+        Concurrent callers for the same token share one fetch, and across
+        processes sharing the session only the lease holder fetches while
+        the others pick up its token if it is valid for ``min_ttl`` seconds.
+        ``stale_token`` is a token rejected by the server, which must not be
+        taken as refreshed.
+        """
+        return await self._token_flight.do(
+            self.access_token_key, self._fetch_shared_access_token, stale_token, min_ttl
+        )
+
     async def access_token(self):
         """WeChat access token"""
         access_token = await self.session.get(self.access_token_key)
         if access_token:
+            if self.expires_at is None:
+                # first use on this node, pick up the expiry shared by the node which fetched it
+                self.expires_at = await self.get_expires_at() or 0
             if not self.expires_at:
                 # user provided access_token, just return it
                 return access_token
@@ -184,5 +338,44 @@ class BaseWeChatClient:
             if self.expires_at - timestamp > 60:
                 return access_token
 
-        await self.fetch_access_token()
+        await self._refresh_access_token()
         return await self.session.get(self.access_token_key)
+
+    async def get_access_token(self):
+        return await self.access_token()
+
+    def start_refresher(self, tickets=(), ahead=300, jitter=60, interval=30):
+        """
+        启动后台任务，在 access token 和 ticket 过期前主动刷新，需在事件循环中调用
+
+        参数说明请参考 :class:`aiowechatpy.client.refresher.TokenRefresher`，
+        刷新统计见返回对象的 ``stats`` 属性。
+
+        :return: TokenRefresher 对象
+        """
+        if self.refresher is None:
+            self.refresher = TokenRefresher(self, tickets, ahead, jitter, interval)
+        self.refresher.start()
+        return self.refresher
+
+    async def stop_refresher(self):
+        """停止后台刷新任务"""
+        if self.refresher is not None:
+            await self.refresher.stop()
+
+    async def aclose(self):
+        """
+        释放客户端占用的资源，停止后台刷新任务
+
+        通过 ``transport`` 参数指定的连接池管理器随客户端关闭；进程内默认的连接池由所有客户端共享，
+        不会随客户端关闭，进程退出前可调用 ``TransportManager.aclose()`` 关闭
+        """
+        await self.stop_refresher()
+        if self._owns_transport:
+            await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.client.ratelimit
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    This module provides a token bucket rate limiter keyed by appid and
+    API endpoint, which slows down when WeChat reports frequency limits.
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+import asyncio
+from urllib.parse import urlparse
+
+from aiowechatpy.constants import WeChatErrorCode
+
+# 触发自适应降速的返回码
+LIMITED_ERROR_CODES = frozenset(
+    (
+        WeChatErrorCode.SYSTEM_BUSY.value,
+        WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value,
+        WeChatErrorCode.API_MINUTE_QUOTA_REACH_LIMIT.value,
+        WeChatErrorCode.OUT_OF_RESPONSE_COUNT_LIMIT.value,
+    )
+)
+
+
+def normalize_endpoint(url_or_endpoint):
+    """``https://api.weixin.qq.com/cgi-bin/message/custom/send`` -> ``message/custom/send``"""
+    path = urlparse(url_or_endpoint).path.strip("/")
+    if path.startswith("cgi-bin/"):
+        path = path[len("cgi-bin/") :]
+    return path
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    :param rate: 每秒生成的令牌数，即允许的最大请求速率
+    :param burst: 可选，桶容量，即允许的突发请求数，默认等于 ``rate``
+    :param min_rate: 可选，降速后的最低速率
+    """
+
+    def __init__(self, rate, burst=None, min_rate=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """获取一个令牌，没有可用令牌时等待"""
+        self._refill()
+        # reserve the token first, so that waiters are served in order
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return
+        try:
+            await asyncio.sleep(-self.tokens / self.rate)
+        except asyncio.CancelledError:
+            self.tokens += 1
+            raise
+
+    def slow_down(self, factor):
+        """按 ``factor`` 降低速率，并清空已积累的令牌"""
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.tokens = min(self.tokens, 0)
+
+    def speed_up(self, step):
+        """按 ``step`` 恢复速率，最高恢复到初始速率"""
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + step)
+
+
+class RateLimiter:
+    """
+    按 appid 和接口限制请求速率
+
+    收到 45009、45011、45047 或 -1（系统繁忙）时按 ``backoff`` 倍数降速，
+    之后每次成功调用按初始速率的 ``recovery`` 比例逐步恢复。
+    一个 RateLimiter 对象可由多个客户端共享。
+
+    :param quotas: 可选，各接口每秒允许的请求数，如 ``{"message/custom/send": 50, "user/info": 100}``，
+                   接口名为去掉 ``cgi-bin/`` 前缀的 URL 路径
+    :param default_rate: 可选，未在 ``quotas`` 中配置的接口每秒允许的请求数，默认不限制
+    :param burst: 可选，允许的突发请求数与速率的比值，默认为 1，即一秒的请求量
+    :param backoff: 可选，触发频率限制时的降速倍数
+    :param recovery: 可选，每次成功调用恢复的速率比例
+    """
+
+    def __init__(self, quotas=None, default_rate=None, burst=1, backoff=0.5, recovery=0.01):
+        self.quotas = {normalize_endpoint(endpoint): rate for endpoint, rate in (quotas or {}).items()}
+        self.default_rate = default_rate
+        self.burst = burst
+        self.backoff = backoff
+        self.recovery = recovery
+        self._buckets = {}
+
+    def get_bucket(self, appid, endpoint):
+        """获取 appid 下接口对应的令牌桶，接口不限速时返回 None"""
+        endpoint = normalize_endpoint(endpoint)
+        key = (appid, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = self.quotas.get(endpoint, self.default_rate)
+            if not rate:
+                return None
+            bucket = self._buckets[key] = TokenBucket(rate, max(1, rate * self.burst))
+        return bucket
+
+    async def acquire(self, appid, endpoint):
+        bucket = self.get_bucket(appid, endpoint)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def feedback(self, appid, endpoint, errcode):
+        """根据接口返回码调整速率"""
+        bucket = self.get_bucket(appid, endpoint)
+        if bucket is None:
+            return
+        if errcode in LIMITED_ERROR_CODES:
+            bucket.slow_down(self.backoff)
+        elif not errcode:
+            bucket.speed_up(bucket.max_rate * self.recovery)
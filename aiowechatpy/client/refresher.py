@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.client.refresher
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    This module refreshes access tokens and JS-SDK tickets in the
+    background, ahead of their expiry.
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+import random
+import asyncio
+import logging
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshStats:
+    """单个 token 或 ticket 的刷新统计"""
+
+    def __init__(self):
+        # 成功刷新次数
+        self.refreshes = 0
+        # 失败次数
+        self.failures = 0
+        # 连续失败次数，成功刷新后清零
+        self.consecutive_failures = 0
+        # 最近一次成功刷新的时间戳
+        self.last_refresh_at = None
+        # 最近一次失败的时间戳
+        self.last_failure_at = None
+        # 最近一次失败的异常
+        self.last_error = None
+
+    def __repr__(self):
+        return (
+            f"RefreshStats(refreshes={self.refreshes}, failures={self.failures}, "
+            f"last_refresh_at={self.last_refresh_at}, last_failure_at={self.last_failure_at})"
+        )
+
+
+class TokenRefresher:
+    """
+    后台刷新 access token 和 JS-SDK ticket
+
+    在 token / ticket 过期前 ``ahead`` 秒（再提前 0 到 ``jitter`` 秒的随机时间，避免多个节点同时刷新）
+    重新获取并写入 session，请求路径上只需从 session 读取。
+
+    :param client: WeChatClient 或企业微信 WeChatClient 对象
+    :param tickets: 可选，需要刷新的 ticket 名称，公众号为 ``jsapi``、``jsapi_card``，
+                    企业微信为 ``jsapi``、``agent_jsapi``
+    :param ahead: 可选，提前刷新的时间，单位秒
+    :param jitter: 可选，提前刷新的最大随机时间，单位秒
+    :param interval: 可选，检查过期时间的间隔，单位秒
+    """
+
+    def __init__(self, client, tickets=(), ahead=300, jitter=60, interval=30):
+        self.client = client
+        self.ahead = ahead
+        self.jitter = jitter
+        self.interval = interval
+        self.targets = {
+            "access_token": (
+                self._access_token_expires_at,
+                partial(client._refresh_access_token, min_ttl=ahead + jitter),
+            ),
+        }
+        for name in tickets:
+            self.targets[f"{name}_ticket"] = (
+                partial(client.jsapi.get_ticket_expires_at, name),
+                partial(client.jsapi.refresh_ticket, name),
+            )
+        self.stats = {name: RefreshStats() for name in self.targets}
+        self._jitters = {name: random.uniform(0, jitter) for name in self.targets}
+        self._task = None
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def _access_token_expires_at(self):
+        if not await self.client.session.get(self.client.access_token_key):
+            return 0
+        # None for an access token provided by the user, which can not be refreshed
+        return await self.client.get_expires_at()
+
+    async def refresh_due(self):
+        """刷新所有即将过期的 token 和 ticket"""
+        for name, (get_expires_at, refresh) in self.targets.items():
+            stats = self.stats[name]
+            try:
+                expires_at = await get_expires_at()
+                if expires_at is None or expires_at - time.time() > self.ahead + self._jitters[name]:
+                    continue
+                logger.info("Refreshing %s of %s ahead of expiry", name, self.client.appid)
+                await refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                stats.last_failure_at = time.time()
+                stats.last_error = e
+                logger.warning("Failed to refresh %s of %s", name, self.client.appid, exc_info=True)
+            else:
+                stats.refreshes += 1
+                stats.consecutive_failures = 0
+                stats.last_refresh_at = time.time()
+                self._jitters[name] = random.uniform(0, self.jitter)
+
+    async def _run(self):
+        while True:
+            await self.refresh_due()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """启动后台刷新任务，需在事件循环中调用"""
+        if not self.running:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """停止后台刷新任务"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.client.retry
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    This module provides the retry policy for transient API failures.
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import random
+
+import httpx
+
+from aiowechatpy.client.ratelimit import normalize_endpoint
+from aiowechatpy.constants import WeChatErrorCode
+from aiowechatpy.exceptions import WeChatClientException
+
+# 请求尚未发送到服务器的异常，任何请求都可以安全重试
+NOT_SENT_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+    """
+    API 请求重试策略
+
+    按指数退避重试：第 n 次重试前等待 ``min(backoff_max, backoff_base * 2 ** (n - 1))`` 秒，
+    启用 ``jitter`` 时在 0 到该值之间随机取值。
+
+    非幂等请求（默认为 GET 以外的请求）可能已被服务器执行，只在请求未发出（连接失败）时重试，
+    不会因超时、5xx 或 ``retry_errcodes`` 中的错误码重复发送：系统繁忙时请求仍可能已被执行。
+
+    :param max_attempts: 可选，最多尝试次数，包括第一次请求
+    :param backoff_base: 可选，第一次重试前的等待时间，单位秒
+    :param backoff_max: 可选，最长等待时间，单位秒
+    :param jitter: 可选，是否随机化等待时间
+    :param retry_errcodes: 可选，幂等请求可以重试的微信错误码，默认为 -1（系统繁忙）
+    :param retry_statuses: 可选，幂等请求可以重试的 HTTP 状态码
+    :param retry_exceptions: 可选，幂等请求可以重试的异常类型
+    :param idempotent_endpoints: 可选，视为幂等的 POST 接口，如 ``user/info/batchget``
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_base=0.2,
+        backoff_max=5.0,
+        jitter=True,
+        retry_errcodes=(WeChatErrorCode.SYSTEM_BUSY.value,),
+        retry_statuses=(500, 502, 503, 504),
+        retry_exceptions=(httpx.TransportError,),
+        idempotent_endpoints=(),
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_errcodes = frozenset(retry_errcodes)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.idempotent_endpoints = frozenset(normalize_endpoint(endpoint) for endpoint in idempotent_endpoints)
+
+    def is_idempotent(self, method, url):
+        return method.upper() in ("GET", "HEAD", "OPTIONS") or normalize_endpoint(url) in self.idempotent_endpoints
+
+    def is_retryable(self, exc, idempotent):
+        if isinstance(exc, NOT_SENT_EXCEPTIONS):
+            return True
+        if isinstance(exc, WeChatClientException):
+            if exc.errcode is not None:
+                # a busy server may still have applied the call, so only repeat idempotent ones
+                return idempotent and exc.errcode in self.retry_errcodes
+            return idempotent and exc.response is not None and exc.response.status_code in self.retry_statuses
+        return idempotent and isinstance(exc, self.retry_exceptions)
+
+    def backoff(self, attempt):
+        """第 ``attempt`` 次请求失败后的等待时间"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def get_delay(self, attempt, exc, idempotent):
+        """
+        第 ``attempt`` 次请求因 ``exc`` 失败后，返回重试前的等待时间，不重试时返回 None
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(exc, idempotent):
+            return None
+        return self.backoff(attempt)
+
+
+# 不重试
+NO_RETRY = RetryPolicy(max_attempts=1)
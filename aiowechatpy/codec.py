@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.codec
+    ~~~~~~~~~~~~~~~~~
+
+    This module provides the JSON codec used for API request and
+    response bodies, backed by orjson when it is installed.
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec:
+    """
+    基于标准库 json 的编解码器
+
+    自定义编解码器需实现 ``dumps`` 和 ``loads`` 方法，``dumps`` 返回 UTF-8 编码的 bytes
+    """
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", "ignore")
+        # WeChat may return unescaped control characters in strings
+        return json.loads(data, strict=False)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    基于 orjson 的编解码器
+
+    orjson 不支持的对象（如非字符串的键、超过 64 位的整数）及不符合规范的响应（如字符串中未转义的控制字符）
+    回退到标准库处理
+    """
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+
+def get_default_codec() -> JSONCodec:
+    """安装了 orjson 时返回 OrjsonCodec，否则返回 JSONCodec"""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+default_codec = get_default_codec()
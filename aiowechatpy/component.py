@@ -8,17 +8,18 @@
     :copyright: (c) 2015 by hunter007.
     :license: MIT, see LICENSE for more details.
 """
-import json
 import logging
 import time
 from urllib.parse import quote
 
 import httpx
-import xmltodict
 
 from aiowechatpy.client import WeChatComponentClient
+from aiowechatpy.client.base import fetch_with_lease, get_token_flight
+from aiowechatpy.codec import default_codec
 from aiowechatpy.constants import WeChatErrorCode
 from aiowechatpy.crypto import WeChatCrypto
+from aiowechatpy.dispatch import MessageDispatcher
 from aiowechatpy.exceptions import (
     APILimitedException,
     WeChatClientException,
@@ -27,13 +28,24 @@ from aiowechatpy.exceptions import (
 )
 from aiowechatpy.messages import COMPONENT_MESSAGE_TYPES, ComponentUnknownMessage
 from aiowechatpy.session.memorystorage import MemoryStorage
-from aiowechatpy.utils import to_text
+from aiowechatpy.transport import get_transport_manager
+from aiowechatpy.xmlparser import parse_xml
 
 logger = logging.getLogger(__name__)
 
+_dispatcher = MessageDispatcher(
+    lambda info_type, _: ("message", (info_type or "").lower()),
+    {"message": COMPONENT_MESSAGE_TYPES},
+    ComponentUnknownMessage,
+    type_field="InfoType",
+    subtype_field=None,
+)
+
 
 class BaseWeChatComponent:
     API_BASE_URL = "https://api.weixin.qq.com/cgi-bin"
+    # codec of JSON request and response bodies
+    json_codec = default_codec
 
     def __init__(
         self,
@@ -43,14 +55,17 @@ class BaseWeChatComponent:
         encoding_aes_key,
         session=None,
         auto_retry=True,
+        transport=None,
     ):
         """
         :param component_appid: 第三方平台appid
         :param component_appsecret: 第三方平台appsecret
         :param component_token: 公众号消息校验Token
         :param encoding_aes_key: 公众号消息加解密Key
+        :param transport: 可选，连接池管理器，默认使用进程内共享的连接池
         """
-        self._http = httpx.AsyncClient()
+        self._owns_transport = transport is not None and transport is not get_transport_manager()
+        self._http = transport or get_transport_manager()
         self.component_appid = component_appid
         self.component_appsecret = component_appsecret
         self.expires_at = None
@@ -58,6 +73,18 @@ class BaseWeChatComponent:
         self.session = session or MemoryStorage()
         self.auto_retry = auto_retry
 
+    @property
+    def _token_flight(self):
+        return get_token_flight(self.session)
+
+    @property
+    def access_token_key(self):
+        return f"{self.component_appid}_component_access_token"
+
+    @property
+    def access_token_expires_at_key(self):
+        return f"{self.access_token_key}_expires_at"
+
     async def component_verify_ticket(self):
         return await self.session.get(f"{self.component_appid}_component_verify_ticket")
 
@@ -71,9 +98,9 @@ class BaseWeChatComponent:
         if "params" not in kwargs:
             kwargs["params"] = {}
         if isinstance(kwargs["params"], dict) and "component_access_token" not in kwargs["params"]:
-            kwargs["params"]["component_access_token"] = self.access_token
-        if isinstance(kwargs["data"], dict):
-            kwargs["data"] = json.dumps(kwargs["data"])
+            kwargs["params"]["component_access_token"] = await self.access_token()
+        if isinstance(kwargs.get("data", ""), dict):
+            kwargs["content"] = self.json_codec.dumps(kwargs.pop("data"))
 
         res = await self._http.request(method=method, url=url, **kwargs)
         try:
@@ -90,7 +117,7 @@ class BaseWeChatComponent:
         return await self._handle_result(res, method, url, **kwargs)
 
     async def _handle_result(self, res, method=None, url=None, **kwargs):
-        result = json.loads(res.content.decode("utf-8", "ignore"), strict=False)
+        result = self.json_codec.loads(res.content)
         if "errcode" in result:
             result["errcode"] = int(result["errcode"])
 
@@ -103,10 +130,12 @@ class BaseWeChatComponent:
                 WeChatErrorCode.EXPIRED_ACCESS_TOKEN.value,
             ):
                 logger.info("Component access token expired, fetch a new one and retry request")
-                await self.fetch_access_token()
-                kwargs["params"]["component_access_token"] = await self.session.get(
-                    f"{self.component_appid}_component_access_token"
-                )
+                stale_token = kwargs["params"].get("component_access_token")
+                access_token = await self.session.get(self.access_token_key)
+                if not access_token or access_token == stale_token:
+                    await self._refresh_access_token(stale_token)
+                    access_token = await self.session.get(self.access_token_key)
+                kwargs["params"]["component_access_token"] = access_token
                 return await self._request(method=method, url_or_endpoint=url, **kwargs)
             elif errcode == WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value:
                 # api freq out of limit
@@ -126,7 +155,7 @@ class BaseWeChatComponent:
         url = f"{self.API_BASE_URL}{'/component/api_component_token'}"
         return await self._fetch_access_token(
             url=url,
-            data=json.dumps(
+            data=self.json_codec.dumps(
                 {
                     "component_appid": self.component_appid,
                     "component_appsecret": self.component_appsecret,
@@ -138,7 +167,7 @@ class BaseWeChatComponent:
     async def _fetch_access_token(self, url, data):
         """The real fetch access token"""
         logger.info("Fetching component access token")
-        res = await self._http.post(url=url, data=data)
+        res = await self._http.post(url=url, content=data)
         try:
             res.raise_for_status()
         except httpx.HTTPError as reqe:
@@ -149,7 +178,7 @@ class BaseWeChatComponent:
                 request=reqe.request,
                 response=res,
             )
-        result = res.json()
+        result = self.json_codec.loads(res.content)
         if "errcode" in result and result["errcode"] != 0:
             raise WeChatClientException(
                 result["errcode"],
@@ -162,14 +191,51 @@ class BaseWeChatComponent:
         expires_in = 7200
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        await self.session.set(f"{self.component_appid}_component_access_token", result["component_access_token"], expires_in)
         self.expires_at = int(time.time()) + expires_in
+        await self.session.set_many(
+            {
+                self.access_token_key: result["component_access_token"],
+                self.access_token_expires_at_key: self.expires_at,
+            },
+            expires_in,
+        )
         return result
 
+    async def _read_shared_access_token(self, stale_token=None):
+        """Read a component access token refreshed by another node"""
+        keys = [self.access_token_key, self.access_token_expires_at_key]
+        if stale_token:
+            # the rejected token may still be cached in front of the shared storage
+            await self.session.discard_local(keys)
+        access_token, expires_at = await self.session.get_many(keys)
+        if not access_token or access_token == stale_token:
+            return None
+        if not expires_at or expires_at - time.time() <= 60:
+            return None
+        self.expires_at = expires_at
+        return {"component_access_token": access_token, "expires_in": int(expires_at - time.time())}
+
+    async def _fetch_shared_access_token(self, stale_token=None):
+        result = await self._read_shared_access_token(stale_token)
+        if result:
+            return result
+        return await fetch_with_lease(
+            self.session,
+            f"{self.access_token_key}_lease",
+            self.fetch_access_token,
+            lambda: self._read_shared_access_token(stale_token),
+        )
+
+    async def _refresh_access_token(self, stale_token=None):
+        """Fetch a new component access token, only one caller in the fleet fetches it"""
+        return await self._token_flight.do(self.access_token_key, self._fetch_shared_access_token, stale_token)
+
     async def access_token(self):
         """WeChat component access token"""
-        access_token = await self.session.get(f"{self.component_appid}_component_access_token")
+        access_token = await self.session.get(self.access_token_key)
         if access_token:
+            if self.expires_at is None:
+                self.expires_at = await self.session.get(self.access_token_expires_at_key) or 0
             if not self.expires_at:
                 # user provided access_token, just return it
                 return access_token
@@ -178,8 +244,8 @@ class BaseWeChatComponent:
             if self.expires_at - timestamp > 60:
                 return access_token
 
-        await self.fetch_access_token()
-        return await self.session.get(f"{self.component_appid}_component_access_token")
+        await self._refresh_access_token()
+        return await self.session.get(self.access_token_key)
 
     async def get(self, url, **kwargs):
         return await self._request(method="get", url_or_endpoint=url, **kwargs)
@@ -187,6 +253,17 @@ class BaseWeChatComponent:
     async def post(self, url, **kwargs):
         return await self._request(method="post", url_or_endpoint=url, **kwargs)
 
+    async def aclose(self):
+        """关闭通过 ``transport`` 参数指定的连接池管理器，进程内默认的连接池需通过 ``TransportManager.aclose()`` 关闭"""
+        if self._owns_transport:
+            await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
 
 class WeChatComponent(BaseWeChatComponent):
     PRE_AUTH_URL = "https://mp.weixin.qq.com/cgi-bin/componentloginpage"
@@ -248,7 +325,10 @@ class WeChatComponent(BaseWeChatComponent):
             expires_in = 7200
             if "expires_in" in result["authorization_info"]:
                 expires_in = result["authorization_info"]["expires_in"]
-            await self.session.set(access_token_key, access_token, expires_in)
+            await self.session.set_many(
+                {access_token_key: access_token, f"{access_token_key}_expires_at": int(time.time()) + expires_in},
+                expires_in,
+            )
         if (
             "authorizer_refresh_token" in result["authorization_info"]
             and result["authorization_info"]["authorizer_refresh_token"]
@@ -347,39 +427,29 @@ class WeChatComponent(BaseWeChatComponent):
         """
         access_token_key = f"{authorizer_appid}_access_token"
         refresh_token_key = f"{authorizer_appid}_refresh_token"
-        access_token = self.session.get(access_token_key)
-        refresh_token = self.session.get(refresh_token_key)
+        access_token, refresh_token = await self.session.get_many([access_token_key, refresh_token_key])
         assert refresh_token
 
+        client = WeChatComponentClient(authorizer_appid, self, session=self.session)
         if not access_token:
-            ret = await self.refresh_authorizer_token(authorizer_appid, refresh_token)
-            access_token = ret["authorizer_access_token"]
-            access_token_key = f"{authorizer_appid}_access_token"
-            expires_in = 7200
-            if "expires_in" in ret:
-                expires_in = ret["expires_in"]
-            await self.session.set(access_token_key, access_token, expires_in)
-
-        return WeChatComponentClient(authorizer_appid, self, session=self.session)
+            await client._refresh_access_token()
+        return client
 
-    def parse_message(self, msg, msg_signature, timestamp, nonce):
+    async def parse_message(self, msg, msg_signature, timestamp, nonce):
         """
-        处理 wechat server 推送消息
+        处理 wechat server 推送消息，保存 component_verify_ticket，授权通知会同时换取授权信息
 
         :params msg: 加密内容
         :params msg_signature: 消息签名
         :params timestamp: 时间戳
         :params nonce: 随机数
         """
-        content = self.crypto.decrypt_message(msg, msg_signature, timestamp, nonce)
-        message = xmltodict.parse(to_text(content))["xml"]
-        message_type = message["InfoType"].lower()
-        message_class = COMPONENT_MESSAGE_TYPES.get(message_type, ComponentUnknownMessage)
-        msg = message_class(message)
+        content = self.crypto.decrypt_message_bytes(msg, msg_signature, timestamp, nonce)
+        msg = _dispatcher.dispatch(parse_xml(content).get("xml"))
         if msg.type == "component_verify_ticket":
-            self.session.set(f"{self.component_appid}_{msg.type}", msg.verify_ticket)
+            await self.session.set(f"{self.component_appid}_{msg.type}", msg.verify_ticket)
         elif msg.type in ("authorized", "updateauthorized"):
-            msg.query_auth_result = self.query_auth(msg.authorization_code)
+            msg.query_auth_result = await self.query_auth(msg.authorization_code)
         return msg
 
     def get_component_oauth(self, authorizer_appid):
@@ -400,13 +470,15 @@ class ComponentOAuth:
 
     API_BASE_URL = "https://api.weixin.qq.com/"
     OAUTH_BASE_URL = "https://open.weixin.qq.com/connect/"
+    # codec of JSON request and response bodies
+    json_codec = default_codec
 
     def __init__(self, component, app_id):
         """
         :param component: WeChatComponent
         :param app_id: 微信公众号 app_id
         """
-        self._http = httpx.AsyncClient()
+        self._http = component._http
         self.app_id = app_id
         self.component = component
 
@@ -449,7 +521,7 @@ class ComponentOAuth:
             params={
                 "appid": self.app_id,
                 "component_appid": self.component.component_appid,
-                "component_access_token": self.component.access_token,
+                "component_access_token": await self.component.access_token(),
                 "code": code,
                 "grant_type": "authorization_code",
             },
@@ -474,7 +546,7 @@ class ComponentOAuth:
                 "grant_type": "refresh_token",
                 "refresh_token": refresh_token,
                 "component_appid": self.component.component_appid,
-                "component_access_token": self.component.access_token,
+                "component_access_token": await self.component.access_token(),
             },
         )
         self.access_token = res["access_token"]
@@ -508,9 +580,7 @@ class ComponentOAuth:
             url = url_or_endpoint
 
         if isinstance(kwargs.get("data", ""), dict):
-            body = json.dumps(kwargs["data"], ensure_ascii=False)
-            body = body.encode("utf-8")
-            kwargs["data"] = body
+            kwargs["content"] = self.json_codec.dumps(kwargs.pop("data"))
 
         res = await self._http.request(method=method, url=url, **kwargs)
         try:
@@ -527,7 +597,7 @@ class ComponentOAuth:
         return await self._handle_result(res, method=method, url=url, **kwargs)
 
     async def _handle_result(self, res, method=None, url=None, **kwargs):
-        result = json.loads(res.content.decode("utf-8", "ignore"), strict=False)
+        result = self.json_codec.loads(res.content)
         if "errcode" in result:
             result["errcode"] = int(result["errcode"])
 
@@ -540,8 +610,12 @@ class ComponentOAuth:
                 WeChatErrorCode.EXPIRED_ACCESS_TOKEN.value,
             ):
                 logger.info("Component access token expired, fetch a new one and retry request")
-                await self.component.fetch_access_token()
-                kwargs["params"]["component_access_token"] = self.component.access_token
+                stale_token = kwargs["params"].get("component_access_token")
+                access_token = await self.component.session.get(self.component.access_token_key)
+                if not access_token or access_token == stale_token:
+                    await self.component._refresh_access_token(stale_token)
+                    access_token = await self.component.session.get(self.component.access_token_key)
+                kwargs["params"]["component_access_token"] = access_token
                 return await self._request(method=method, url_or_endpoint=url, **kwargs)
             elif errcode == WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value:
                 # api freq out of limit
@@ -9,12 +9,14 @@
     :license: MIT, see LICENSE for more details.
 """
 
+import re
 import json
 import time
 import base64
 import hashlib
+import functools
 
-from aiowechatpy.utils import to_text, to_binary, WeChatSigner
+from aiowechatpy.utils import to_text, to_binary
 from aiowechatpy.exceptions import (
     InvalidAppIdException,
     InvalidMchIdException,
@@ -23,11 +25,35 @@ from aiowechatpy.exceptions import (
 from aiowechatpy.crypto.base import BasePrpCrypto, WeChatCipher, BaseRefundCrypto
 from aiowechatpy.crypto.pkcs7 import PKCS7Encoder
 
+_ENVELOPE = b"""<xml>
+<Encrypt><![CDATA[%s]]></Encrypt>
+<MsgSignature><![CDATA[%s]]></MsgSignature>
+<TimeStamp>%s</TimeStamp>
+<Nonce><![CDATA[%s]]></Nonce>
+</xml>"""
+
+_ENCRYPT_RE = re.compile(rb"<Encrypt>\s*(?:<!\[CDATA\[([^\]]*)\]\]>|([^<]*))\s*</Encrypt>")
+
+
+def _get_encrypt(msg):
+    if isinstance(msg, dict):
+        return msg["Encrypt"]
+    # the envelope is small and flat, so find Encrypt instead of parsing it
+    match = _ENCRYPT_RE.search(to_binary(msg))
+    if match is not None:
+        return (match.group(1) or match.group(2)).strip()
+    from aiowechatpy.xmlparser import parse_xml
+
+    data = parse_xml(msg).get("xml")
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid encrypted message: {data!r}")
+    return data["Encrypt"]
+
 
 def _get_signature(token, timestamp, nonce, encrypt):
-    signer = WeChatSigner()
-    signer.add_data(token, timestamp, nonce, encrypt)
-    return signer.signature
+    # what WeChatSigner does, without building a signer per message
+    data = sorted((to_binary(token), to_binary(timestamp), to_binary(nonce), to_binary(encrypt)))
+    return hashlib.sha1(b"".join(data)).hexdigest()
 
 
 class PrpCrypto(BasePrpCrypto):
@@ -37,6 +63,12 @@ class PrpCrypto(BasePrpCrypto):
     def decrypt(self, text, app_id):
         return self._decrypt(text, app_id, InvalidAppIdException)
 
+    def decrypt_bytes(self, text, app_id):
+        return self._decrypt_bytes(text, app_id, InvalidAppIdException)
+
+    def decrypt_many_bytes(self, texts, app_id):
+        return self._decrypt_many_bytes(texts, app_id, InvalidAppIdException)
+
 
 class BaseWeChatCrypto:
     def __init__(self, token, encoding_aes_key, _id):
@@ -45,43 +77,82 @@ class BaseWeChatCrypto:
         assert len(self.key) == 32
         self.token = token
         self._id = _id
+        self._id_bytes = to_binary(_id)
+        # crypto class -> instance holding the cipher of the key
+        self._prp_cryptos = {}
+
+    def _get_prp_crypto(self, crypto_class):
+        pc = self._prp_cryptos.get(crypto_class)
+        if pc is None:
+            pc = self._prp_cryptos[crypto_class] = crypto_class(self.key)
+        return pc
 
     def _check_signature(self, signature, timestamp, nonce, echo_str, crypto_class=None):
         _signature = _get_signature(self.token, timestamp, nonce, echo_str)
         if _signature != signature:
             raise InvalidSignatureException()
-        pc = crypto_class(self.key)
+        pc = self._get_prp_crypto(crypto_class)
         return pc.decrypt(echo_str, self._id)
 
     def _encrypt_message(self, msg, nonce, timestamp=None, crypto_class=None):
+        return self._encrypt_message_bytes(msg, nonce, timestamp, crypto_class).decode()
+
+    def _encrypt_message_bytes(self, msg, nonce, timestamp=None, crypto_class=None):
         from aiowechatpy.replies import BaseReply
 
-        xml = """<xml>
-<Encrypt><![CDATA[{encrypt}]]></Encrypt>
-<MsgSignature><![CDATA[{signature}]]></MsgSignature>
-<TimeStamp>{timestamp}</TimeStamp>
-<Nonce><![CDATA[{nonce}]]></Nonce>
-</xml>"""
         if isinstance(msg, BaseReply):
             msg = msg.render()
-        timestamp = timestamp or to_text(int(time.time()))
-        pc = crypto_class(self.key)
-        encrypt = to_text(pc.encrypt(msg, self._id))
+        timestamp = to_binary(timestamp or int(time.time()))
+        nonce = to_binary(nonce)
+        pc = self._get_prp_crypto(crypto_class)
+        encrypt = pc.encrypt(to_binary(msg), self._id_bytes)
         signature = _get_signature(self.token, timestamp, nonce, encrypt)
-        return to_text(xml.format(encrypt=encrypt, signature=signature, timestamp=timestamp, nonce=nonce))
+        return _ENVELOPE % (encrypt, signature.encode(), timestamp, nonce)
 
-    def _decrypt_message(self, msg, signature, timestamp, nonce, crypto_class=None):
-        if not isinstance(msg, dict):
-            import xmltodict
+    def _encrypt_many(self, msgs, nonce, timestamp=None, crypto_class=None):
+        # CBC chains the blocks of each message, only the cipher can be shared
+        return [self._encrypt_message(msg, nonce, timestamp, crypto_class) for msg in msgs]
 
-            msg = xmltodict.parse(to_text(msg))["xml"]
+    def _decrypt_many(self, messages, crypto_class=None):
+        encrypts = []
+        for msg, signature, timestamp, nonce in messages:
+            encrypt = _get_encrypt(msg)
+            self.check_encrypt(encrypt, signature, timestamp, nonce)
+            encrypts.append(encrypt)
+        pc = self._get_prp_crypto(crypto_class)
+        return [to_text(xml) for xml in pc.decrypt_many_bytes(encrypts, self._id_bytes)]
 
-        encrypt = msg["Encrypt"]
+    def _decrypt_message(self, msg, signature, timestamp, nonce, crypto_class=None):
+        return to_text(self._decrypt_message_bytes(msg, signature, timestamp, nonce, crypto_class))
+
+    @staticmethod
+    def get_encrypt(msg):
+        """
+        取出加密消息中的 Encrypt 字段
+
+        :param msg: 加密的 XML 消息，或已解析的消息字典
+        :return: Encrypt 字段的内容
+        """
+        return _get_encrypt(msg)
+
+    def check_encrypt(self, encrypt, signature, timestamp, nonce):
+        """
+        校验 Encrypt 字段的消息签名，签名不一致时抛出 ``InvalidSignatureException``
+
+        :param encrypt: Encrypt 字段的内容
+        :param signature: 消息签名 msg_signature
+        :param timestamp: 时间戳
+        :param nonce: 随机数
+        """
         _signature = _get_signature(self.token, timestamp, nonce, encrypt)
         if _signature != signature:
             raise InvalidSignatureException()
-        pc = crypto_class(self.key)
-        return pc.decrypt(encrypt, self._id)
+
+    def _decrypt_message_bytes(self, msg, signature, timestamp, nonce, crypto_class=None):
+        encrypt = _get_encrypt(msg)
+        self.check_encrypt(encrypt, signature, timestamp, nonce)
+        pc = self._get_prp_crypto(crypto_class)
+        return pc.decrypt_bytes(encrypt, self._id_bytes)
 
 
 class WeChatCrypto(BaseWeChatCrypto):
@@ -92,9 +163,75 @@ class WeChatCrypto(BaseWeChatCrypto):
     def encrypt_message(self, msg, nonce, timestamp=None):
         return self._encrypt_message(msg, nonce, timestamp, PrpCrypto)
 
+    def encrypt_message_bytes(self, msg, nonce, timestamp=None):
+        """
+        加密回复并返回加密后 XML 的 bytes，可以直接作为响应内容
+
+        与 ``encrypt_message`` 的结果相同，但从回复到加密后的 XML 都使用 bytes，不经过中间的字符串。
+
+        :param msg: 回复对象或回复的 XML
+        :param nonce: 随机数
+        :param timestamp: 可选，时间戳，默认为当前时间
+        :return: 加密后的 XML bytes
+        """
+        return self._encrypt_message_bytes(msg, nonce, timestamp, PrpCrypto)
+
     def decrypt_message(self, msg, signature, timestamp, nonce):
         return self._decrypt_message(msg, signature, timestamp, nonce, PrpCrypto)
 
+    def decrypt_message_bytes(self, msg, signature, timestamp, nonce):
+        """
+        解密消息并返回解密后 XML 的 bytes，可以直接交给 ``parse_message`` 解析
+
+        与 ``decrypt_message`` 的结果相同，但不解码为字符串。
+
+        :param msg: 加密的 XML 消息
+        :param signature: 消息签名 msg_signature
+        :param timestamp: 时间戳
+        :param nonce: 随机数
+        :return: 解密后的 XML bytes
+        """
+        return self._decrypt_message_bytes(msg, signature, timestamp, nonce, PrpCrypto)
+
+    def encrypt_many(self, msgs, nonce, timestamp=None):
+        """
+        批量加密回复，结果与逐个调用 ``encrypt_message`` 相同
+
+        :param msgs: 回复对象或回复 XML 的列表
+        :param nonce: 随机数
+        :param timestamp: 可选，时间戳，默认为当前时间
+        :return: 加密后 XML 的列表
+        """
+        return self._encrypt_many(msgs, nonce, timestamp, PrpCrypto)
+
+    def decrypt_many(self, messages):
+        """
+        批量解密消息，结果与逐个调用 ``decrypt_message`` 相同
+
+        先逐个校验签名，再一次解密全部消息，适合处理积压或存档的加密消息。
+
+        :param messages: ``(msg, signature, timestamp, nonce)`` 的列表
+        :return: 解密后 XML 的列表
+        """
+        return self._decrypt_many(messages, PrpCrypto)
+
+    def parse_message(self, msg, signature, timestamp, nonce):
+        """
+        解密并解析微信服务器推送的加密消息
+
+        等同于 ``parse_message(crypto.decrypt_message(...))``，但只从外层 XML 中查找 Encrypt，
+        解密得到的 bytes 直接解析，不经过中间的字符串。
+
+        :param msg: 加密的 XML 消息
+        :param signature: 消息签名 msg_signature
+        :param timestamp: 时间戳
+        :param nonce: 随机数
+        :return: 对应的消息或事件
+        """
+        from aiowechatpy.parser import parse_message
+
+        return parse_message(self.decrypt_message_bytes(msg, signature, timestamp, nonce))
+
 
 class WeChatWxaCrypto:
     def __init__(self, key, iv, app_id):
@@ -118,13 +255,32 @@ class RefundCrypto(BaseRefundCrypto):
     def decrypt(self, text):
         return self._decrypt(text)
 
+    def encrypt_many(self, texts):
+        return self._encrypt_many(texts)
+
+    def decrypt_many(self, texts):
+        return self._decrypt_many(texts)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_refund_key(key):
+    return to_binary(hashlib.md5(to_binary(key)).hexdigest())
+
 
 class WeChatRefundCrypto:
     def __init__(self, key):
-        self.key = to_binary(hashlib.md5(to_binary(key)).hexdigest())
+        self.key = _get_refund_key(key)
         assert len(self.key) == 32
+        # crypto class -> instance holding the cipher of the key
+        self._cryptos = {}
 
-    def _decrypt_message(self, msg, appid, mch_id, crypto_class=None):
+    def _get_crypto(self, crypto_class):
+        pc = self._cryptos.get(crypto_class)
+        if pc is None:
+            pc = self._cryptos[crypto_class] = crypto_class(self.key)
+        return pc
+
+    def _get_req_info(self, msg, appid, mch_id):
         import xmltodict
 
         if not isinstance(msg, dict):
@@ -135,9 +291,33 @@ class WeChatRefundCrypto:
             raise InvalidAppIdException()
         if msg["mch_id"] != mch_id:
             raise InvalidMchIdException()
-        pc = crypto_class(self.key)
+        return req_info
+
+    def _decrypt_message(self, msg, appid, mch_id, crypto_class=None):
+        import xmltodict
+
+        req_info = self._get_req_info(msg, appid, mch_id)
+        pc = self._get_crypto(crypto_class)
         ret = pc.decrypt(req_info)
         return xmltodict.parse(to_text(ret))["root"]
 
+    def _decrypt_many(self, msgs, appid, mch_id, crypto_class=None):
+        import xmltodict
+
+        req_infos = [self._get_req_info(msg, appid, mch_id) for msg in msgs]
+        pc = self._get_crypto(crypto_class)
+        return [xmltodict.parse(to_text(ret))["root"] for ret in pc.decrypt_many(req_infos)]
+
     def decrypt_message(self, msg, appid, mch_id):
         return self._decrypt_message(msg, appid, mch_id, RefundCrypto)
+
+    def decrypt_many(self, msgs, appid, mch_id):
+        """
+        批量解密退款结果通知，结果与逐个调用 ``decrypt_message`` 相同
+
+        :param msgs: 退款结果通知的列表
+        :param appid: 公众账号 ID
+        :param mch_id: 商户号
+        :return: 解密后 req_info 的列表
+        """
+        return self._decrypt_many(msgs, appid, mch_id, RefundCrypto)
@@ -3,10 +3,11 @@
 import struct
 import socket
 import base64
+import secrets
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
-from aiowechatpy.utils import to_text, to_binary, random_string
+from aiowechatpy.utils import to_text, to_binary
 from aiowechatpy.crypto.pkcs7 import PKCS7Encoder
 
 
@@ -22,52 +23,108 @@ class BaseWeChatCipher:
         decryptor = self.cipher.decryptor()
         return decryptor.update(ciphertext) + decryptor.finalize()
 
+    def encrypt_many(self, plaintexts):
+        return [self.encrypt(plaintext) for plaintext in plaintexts]
+
+    def decrypt_many(self, ciphertexts):
+        return [self.decrypt(ciphertext) for ciphertext in ciphertexts]
+
+
+def _split(data, lengths):
+    view = memoryview(data)
+    start = 0
+    parts = []
+    for length in lengths:
+        parts.append(bytes(view[start : start + length]))
+        start += length
+    return parts
+
+
+def _check_blocks(texts):
+    lengths = [len(text) for text in texts]
+    if any(length % 16 for length in lengths):
+        raise ValueError("The length of the data is not a multiple of the block length.")
+    return lengths
+
 
 class WeChatCipher(BaseWeChatCipher):
     def __init__(self, key, iv=None):
         iv = iv or key[:16]
         super().__init__(Cipher(algorithms.AES(key), modes.CBC(iv)))
+        self.iv = iv
+        self.ecb = Cipher(algorithms.AES(key), modes.ECB())
+
+    def decrypt_many(self, ciphertexts):
+        # A CBC block decrypts to D(C[i]) ^ C[i - 1], so the blocks of all the
+        # messages are decrypted in one ECB pass and XORed with the previous
+        # ciphertext blocks, which are the IV for the first block of each message
+        lengths = _check_blocks(ciphertexts)
+        if not ciphertexts:
+            return []
+        decryptor = self.ecb.decryptor()
+        decrypted = decryptor.update(b"".join(ciphertexts)) + decryptor.finalize()
+        previous = b"".join([b for ciphertext in ciphertexts for b in (self.iv, ciphertext[:-16])])
+        size = len(decrypted)
+        plaintext = (int.from_bytes(decrypted, "big") ^ int.from_bytes(previous, "big")).to_bytes(size, "big")
+        return _split(plaintext, lengths)
 
 
 class AesEcbCipher(BaseWeChatCipher):
     def __init__(self, key):
         super().__init__(Cipher(algorithms.AES(key), modes.ECB()))
 
+    def encrypt_many(self, plaintexts):
+        # ECB blocks are independent, so all the messages are encrypted at once
+        lengths = _check_blocks(plaintexts)
+        return _split(self.encrypt(b"".join(plaintexts)), lengths)
+
+    def decrypt_many(self, ciphertexts):
+        lengths = _check_blocks(ciphertexts)
+        return _split(self.decrypt(b"".join(ciphertexts)), lengths)
+
 
 class BasePrpCrypto:
     def __init__(self, key):
         self.cipher = WeChatCipher(key)
 
     def get_random_string(self):
-        return random_string(16)
+        # 16 characters from os.urandom, random.sample is slower than encrypting
+        return secrets.token_urlsafe(12)
 
     def _encrypt(self, text, _id):
-        text = to_binary(text)
-        tmp_list = []
-        tmp_list.append(to_binary(self.get_random_string()))
-        length = struct.pack(b"I", socket.htonl(len(text)))
-        tmp_list.append(length)
-        tmp_list.append(text)
-        tmp_list.append(to_binary(_id))
-
-        text = b"".join(tmp_list)
-        text = PKCS7Encoder.encode(text)
-
-        ciphertext = to_binary(self.cipher.encrypt(text))
-        return base64.b64encode(ciphertext)
+        text, _id = to_binary(text), to_binary(_id)
+        # random(16) + length(4) + text + id + PKCS7 padding, laid out in one buffer
+        size = 20 + len(text) + len(_id)
+        padding = PKCS7Encoder.block_size - size % PKCS7Encoder.block_size
+        plaintext = bytearray(size + padding)
+        plaintext[:16] = to_binary(self.get_random_string())
+        struct.pack_into(b">I", plaintext, 16, len(text))
+        plaintext[20 : 20 + len(text)] = text
+        plaintext[20 + len(text) : size] = _id
+        plaintext[size:] = PKCS7Encoder.paddings[padding]
+        return base64.b64encode(self.cipher.encrypt(plaintext))
 
     def _decrypt(self, text, _id, exception=None):
+        return to_text(self._decrypt_bytes(text, _id, exception))
+
+    def _decrypt_bytes(self, text, _id, exception=None):
         text = to_binary(text)
         plain_text = self.cipher.decrypt(base64.b64decode(text))
+        return self._unpack(plain_text, _id, exception)
+
+    def _decrypt_many_bytes(self, texts, _id, exception=None):
+        plain_texts = self.cipher.decrypt_many([base64.b64decode(to_binary(text)) for text in texts])
+        return [self._unpack(plain_text, _id, exception) for plain_text in plain_texts]
+
+    def _unpack(self, plain_text, _id, exception=None):
         padding = plain_text[-1]
-        content = plain_text[16:-padding]
+        # slice a memoryview so only the XML itself is copied out
+        content = memoryview(plain_text)[16:-padding]
         xml_length = socket.ntohl(struct.unpack(b"I", content[:4])[0])
-        xml_content = to_text(content[4 : xml_length + 4])
-        from_id = to_text(content[xml_length + 4 :])
-        if from_id != _id:
+        if content[xml_length + 4 :] != to_binary(_id):
             exception = exception or Exception
             raise exception()
-        return xml_content
+        return bytes(content[4 : xml_length + 4])
 
 
 class BaseRefundCrypto:
@@ -81,9 +138,17 @@ class BaseRefundCrypto:
         ciphertext = to_binary(self.cipher.encrypt(text))
         return base64.b64encode(ciphertext)
 
+    def _encrypt_many(self, texts):
+        ciphertexts = self.cipher.encrypt_many([PKCS7Encoder.encode(to_binary(text)) for text in texts])
+        return [base64.b64encode(ciphertext) for ciphertext in ciphertexts]
+
     def _decrypt(self, text, exception=None):
         text = to_binary(text)
         plain_text = self.cipher.decrypt(base64.b64decode(text))
         padding = plain_text[-1]
         content = plain_text[:-padding]
         return content
+
+    def _decrypt_many(self, texts, exception=None):
+        plain_texts = self.cipher.decrypt_many([base64.b64decode(to_binary(text)) for text in texts])
+        return [plain_text[: -plain_text[-1]] for plain_text in plain_texts]
@@ -1,19 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from aiowechatpy.utils import to_binary
-
 
 class PKCS7Encoder:
     block_size = 32
+    # the padding for each padding length
+    paddings = tuple(bytes((count,)) * count for count in range(block_size + 1))
 
     @classmethod
     def encode(cls, text):
-        length = len(text)
-        padding_count = cls.block_size - length % cls.block_size
-        if padding_count == 0:
-            padding_count = cls.block_size
-        padding = to_binary(chr(padding_count))
-        return text + padding * padding_count
+        return text + cls.paddings[cls.block_size - len(text) % cls.block_size]
 
     @classmethod
     def decode(cls, decrypted):
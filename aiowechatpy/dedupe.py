@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.dedupe
+    ~~~~~~~~~~~~~~~~~~
+
+    This module drops the retries WeChat server sends for slow callbacks
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import asyncio
+import hashlib
+
+from aiowechatpy.session import SessionStorage
+from aiowechatpy.session.memorystorage import MemoryStorage
+from aiowechatpy.utils import to_binary
+
+
+def message_key(message):
+    """
+    消息的去重 key：普通消息为 MsgId，事件为 FromUserName + CreateTime + Event，第三方平台通知为
+    AppId + CreateTime + InfoType
+
+    :param message: 消息对象或解析后的消息字典
+    :return: 去重 key
+    """
+    data = message if isinstance(message, dict) else message._data
+    msg_id = data.get("MsgId")
+    if msg_id:
+        return f"msg:{msg_id}"
+    if "InfoType" in data:
+        return f"info:{data.get('AppId')}:{data.get('CreateTime')}:{data.get('InfoType')}"
+    return f"event:{data.get('FromUserName')}:{data.get('CreateTime')}:{data.get('Event')}"
+
+
+def envelope_key(encrypt):
+    """
+    加密消息未解密时的去重 key，重试的请求包含相同的 Encrypt
+
+    :param encrypt: 加密消息中的 Encrypt
+    :return: 去重 key
+    """
+    return f"encrypt:{hashlib.sha1(to_binary(encrypt)).hexdigest()}"
+
+
+class MessageDeduplicator:
+    """
+    推送消息去重
+
+    处理回调较慢时微信服务器会重试 3 次，每次重试都会重复调用处理函数。``run`` 以消息 key 记录响应内容，
+    ``ttl`` 秒内的重复消息直接返回记录的响应；仍在处理中的重复消息等待同一次处理的结果。
+
+    指定共享的 ``session`` 时，记录同时保存到共享存储，并以租约保证同一消息只有一个节点处理，
+    其他节点在处理期间收到的重复消息返回 None，调用方应回复空串。
+
+    :param ttl: 可选，记录保留时间，单位秒，应大于微信服务器重试的总时长
+    :param max_entries: 可选，进程内最多保留的记录数
+    :param session: 可选，多个进程或节点共享记录的 SessionStorage
+    :param prefix: 可选，共享存储中 key 的前缀
+    """
+
+    def __init__(self, ttl=60, max_entries=10000, session: SessionStorage = None, prefix="wechatpy:dedupe"):
+        self.ttl = ttl
+        self.local = MemoryStorage(max_entries=max_entries)
+        self.session = session
+        self.prefix = prefix
+        # key -> future of the response being computed in this process
+        self._inflight = {}
+
+    def _shared_key(self, key):
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key):
+        """
+        读取记录的响应
+
+        :param key: 去重 key
+        :return: 记录的响应，没有记录时返回 None
+        """
+        value = await self.local.get(key)
+        if value is None and self.session is not None:
+            value = await self.session.get(self._shared_key(key))
+            if value is not None:
+                await self.local.set(key, value, self.ttl)
+        return value
+
+    async def set(self, keys, value):
+        """
+        记录响应
+
+        :param keys: 去重 key 列表，同一消息可以有多个 key
+        :param value: 响应内容，使用共享存储时应能被其序列化，如 str
+        """
+        for key in keys:
+            await self.local.set(key, value, self.ttl)
+        if self.session is not None:
+            await self.session.set_many({self._shared_key(key): value for key in keys}, self.ttl)
+
+    async def run(self, key, compute, aliases=()):
+        """
+        处理消息，重复消息返回记录的响应
+
+        :param key: 去重 key
+        :param compute: 无参数的 async 函数，计算响应内容
+        :param aliases: 可选，同时记录响应的其他 key，如 ``envelope_key``
+        :return: 响应内容，其他节点正在处理时返回 None
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        lease = None
+        try:
+            if self.session is not None:
+                lease = await self.session.acquire_lease(self._shared_key(f"{key}:lease"), self.ttl)
+                if lease is None:
+                    # another node is handling it, it may also have finished
+                    value = await self.get(key)
+                    future.set_result(value)
+                    return value
+            value = await compute()
+            await self.set((key, *aliases), value)
+            future.set_result(value)
+            return value
+        finally:
+            if not future.done():
+                # failed, the retries are handled again
+                future.set_result(None)
+            del self._inflight[key]
+            if lease is not None:
+                await self.session.release_lease(self._shared_key(f"{key}:lease"), lease)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.dispatch
+    ~~~~~~~~~~~~~~~~~~~~
+
+    This module maps the type fields of pushed messages to message classes
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+
+
+class Registry(dict):
+    """消息或事件类型的注册表，修改时清空依赖它的分发表"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dispatchers = []
+
+    def _changed(self):
+        for dispatcher in self._dispatchers:
+            dispatcher.clear()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def __ior__(self, other):
+        # dict.__ior__ does not go through update
+        self.update(other)
+        return self
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+class MessageDispatcher:
+    """
+    消息分发表
+
+    ``normalize`` 把消息类型字段的原始值转换为注册表名称和注册表中的 key，结果按原始值缓存，
+    之后同类消息只需查一次表。注册表修改或注册 hook 时缓存清空，因此注册自定义消息类不影响分发速度。
+
+    :param normalize: 参数为类型字段和子类型字段的原始值，返回 (注册表名称, key)
+    :param registries: 注册表名称到注册表的字典
+    :param default: 未注册的类型使用的消息类
+    :param type_field: 可选，消息类型字段
+    :param subtype_field: 可选，子类型字段，如事件类型，为 None 时不使用
+    """
+
+    # bounds the table, type fields come from the request
+    max_entries = 1024
+
+    def __init__(self, normalize, registries, default, type_field="MsgType", subtype_field="Event"):
+        self.normalize = normalize
+        self.registries = registries
+        self.default = default
+        self.type_field = type_field
+        self.subtype_field = subtype_field
+        self.hooks = {}
+        # raw type fields -> (registry name, message class, hook)
+        self._table = {}
+        for registry in registries.values():
+            registry._dispatchers.append(self)
+
+    def add_hook(self, registry, key, hook):
+        """
+        注册特殊类型的处理函数
+
+        :param registry: 注册表名称
+        :param key: 注册表中的 key
+        :param hook: ``hook(message)``，可以修改消息，返回同一注册表中新的 key，返回 None 时不改变消息类
+        """
+        self.hooks[(registry, key)] = hook
+        self.clear()
+
+    def clear(self):
+        self._table.clear()
+
+    def _resolve(self, raw):
+        name, key = self.normalize(*raw)
+        entry = (name, self.registries[name].get(key, self.default), self.hooks.get((name, key)))
+        # unknown types are not cached, any value may be sent
+        if (entry[1] is not self.default or entry[2] is not None) and len(self._table) < self.max_entries:
+            self._table[raw] = entry
+        return entry
+
+    def resolve(self, message):
+        """
+        查找消息对应的消息类
+
+        :param message: 解析后的消息字典
+        :return: 消息类
+        """
+        if not isinstance(message, dict):
+            raise ValueError(f"Invalid message: {message!r}")
+        raw = (message.get(self.type_field), message.get(self.subtype_field))
+        try:
+            entry = self._table.get(raw)
+        except TypeError:
+            # repeated or nested type elements are parsed into lists or dicts
+            raise ValueError(f"Invalid message type: {raw!r}") from None
+        if entry is None:
+            entry = self._resolve(raw)
+        if entry[2] is None:
+            return entry[1]
+        name, message_class, hook = entry
+        key = hook(message)
+        if key is not None:
+            message_class = self.registries[name].get(key, self.default)
+        return message_class
+
+    def dispatch(self, message):
+        """
+        创建消息对应的消息或事件对象，``message`` 不是消息时抛出 ``ValueError``
+
+        :param message: 解析后的消息字典
+        """
+        return self.resolve(message)(message)
@@ -10,6 +10,7 @@
 """
 from typing import Dict, List
 
+from aiowechatpy.dispatch import Registry
 from aiowechatpy.fields import (
     Base64DecodeField,
     BaseField,
@@ -20,12 +21,13 @@ from aiowechatpy.fields import (
 )
 from aiowechatpy.messages import BaseMessage
 
-EVENT_TYPES = {}
+EVENT_TYPES = Registry()
 
 
 class BaseEvent(BaseMessage):
     """Base class for all events"""
 
+    __slots__ = ()
     type = "event"
     event = ""
 
@@ -44,6 +46,7 @@ class SubscribeEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "subscribe"
     key = StringField("EventKey", "")
 
@@ -56,6 +59,7 @@ class UnsubscribeEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "unsubscribe"
 
 
@@ -67,6 +71,7 @@ class SubscribeScanEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "subscribe_scan"
     scene_id = StringField("EventKey")
     ticket = StringField("Ticket")
@@ -80,6 +85,7 @@ class ScanEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "scan"
     scene_id = StringField("EventKey")
     ticket = StringField("Ticket")
@@ -93,6 +99,7 @@ class LocationEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "location"
     latitude = FloatField("Latitude", 0.0)
     longitude = FloatField("Longitude", 0.0)
@@ -107,6 +114,7 @@ class ClickEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "click"
     key = StringField("EventKey")
 
@@ -119,6 +127,7 @@ class ViewEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_event_pushes.html
     """
 
+    __slots__ = ()
     event = "view"
     url = StringField("EventKey")
 
@@ -131,6 +140,7 @@ class MassSendJobFinishEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Batch_Sends_and_Originality_Checks.html#7
     """
 
+    __slots__ = ()
     id = IntegerField("MsgID", 0)
     event = "masssendjobfinish"
     status = StringField("Status")
@@ -148,6 +158,7 @@ class TemplateSendJobFinishEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Template_Message_Interface.html#6
     """
 
+    __slots__ = ()
     id = IntegerField("MsgID")
     event = "templatesendjobfinish"
     status = StringField("Status")
@@ -161,6 +172,7 @@ class SubscribeMsgPopupEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Subscription_Messages/api.html
     """
 
+    __slots__ = ()
     event = "subscribe_msg_popup_event"
     subscribes_info = BaseField("SubscribeMsgPopupEvent", {})
 
@@ -195,6 +207,7 @@ class SubscribeMsgChangeEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Subscription_Messages/api.html
     """
 
+    __slots__ = ()
     event = "subscribe_msg_change_event"
     subscribes_info = BaseField("SubscribeMsgChangeEvent", {})
 
@@ -227,6 +240,7 @@ class SubscribeMsgSentEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Subscription_Messages/api.html
     """
 
+    __slots__ = ()
     event = "subscribe_msg_sent_event"
     subscribes_info = BaseField("SubscribeMsgSentEvent", {})
 
@@ -250,6 +264,7 @@ class SubscribeMsgSentEvent(BaseEvent):
 
 
 class BaseScanCodeEvent(BaseEvent):
+    __slots__ = ()
     key = StringField("EventKey")
     scan_code_info = BaseField("ScanCodeInfo", {})
 
@@ -270,6 +285,7 @@ class ScanCodePushEvent(BaseScanCodeEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Custom_Menus/Custom_Menu_Push_Events.html
     """
 
+    __slots__ = ()
     event = "scancode_push"
 
 
@@ -281,10 +297,12 @@ class ScanCodeWaitMsgEvent(BaseScanCodeEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Custom_Menus/Custom_Menu_Push_Events.html
     """
 
+    __slots__ = ()
     event = "scancode_waitmsg"
 
 
 class BasePictureEvent(BaseEvent):
+    __slots__ = ()
     key = StringField("EventKey")
     pictures_info = BaseField("SendPicsInfo", {})
 
@@ -310,6 +328,7 @@ class PicSysPhotoEvent(BasePictureEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Custom_Menus/Custom_Menu_Push_Events.html
     """
 
+    __slots__ = ()
     event = "pic_sysphoto"
 
 
@@ -321,6 +340,7 @@ class PicPhotoOrAlbumEvent(BasePictureEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Custom_Menus/Custom_Menu_Push_Events.html
     """
 
+    __slots__ = ()
     event = "pic_photo_or_album"
 
 
@@ -332,6 +352,7 @@ class PicWeChatEvent(BasePictureEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Custom_Menus/Custom_Menu_Push_Events.html
     """
 
+    __slots__ = ()
     event = "pic_weixin"
 
 
@@ -343,6 +364,7 @@ class LocationSelectEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Custom_Menus/Custom_Menu_Push_Events.html
     """
 
+    __slots__ = ()
     event = "location_select"
     key = StringField("EventKey")
     location_info = BaseField("SendLocationInfo", {})
@@ -379,11 +401,13 @@ class CardPassCheckEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#1
     """
 
+    __slots__ = ()
     event = "card_pass_check"
     card_id = StringField("CardId")
 
 
 class CardNotPassCheckEvent(BaseEvent):
+    __slots__ = ()
     event = "card_not_pass_check"
     card_id = StringField("CardId")
     refuse_reason = StringField("RefuseReason")
@@ -397,6 +421,7 @@ class UserGetCardEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#2
     """
 
+    __slots__ = ()
     event = "user_get_card"
     card_id = StringField("CardId")
     is_given_by_friend = IntegerField("IsGiveByFriend")
@@ -418,6 +443,7 @@ class UserGiftingCardEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#3
     """
 
+    __slots__ = ()
     event = "user_gifting_card"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -434,6 +460,7 @@ class UserDeleteCardEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#4
     """
 
+    __slots__ = ()
     event = "user_del_card"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -447,6 +474,7 @@ class UserConsumeCardEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#5
     """
 
+    __slots__ = ()
     event = "user_consume_card"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -466,6 +494,7 @@ class UserPayFromPayCell(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#6
     """
 
+    __slots__ = ()
     event = "user_pay_from_pay_cell"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -483,6 +512,7 @@ class UserViewCard(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#7
     """
 
+    __slots__ = ()
     event = "user_view_card"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -497,6 +527,7 @@ class UserEnterSessionFromCardEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#8
     """
 
+    __slots__ = ()
     event = "user_enter_session_from_card"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -510,6 +541,7 @@ class UpdateMemberCard(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#9
     """
 
+    __slots__ = ()
     event = "update_member_card"
     card_id = StringField("CardId")
     code = StringField("UserCardCode")
@@ -525,6 +557,7 @@ class CardSkuRemindEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#10
     """
 
+    __slots__ = ()
     event = "card_sku_remind"
     card_id = StringField("CardId")
     detail = StringField("Detail")
@@ -538,6 +571,7 @@ class CardPayOrderEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#11
     """
 
+    __slots__ = ()
     event = "card_pay_order"
     order_id = IntegerField("OrderId")
     status = StringField("Status")
@@ -561,12 +595,14 @@ class SubmitMembercardUserInfo(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Cards_and_Offer/Coupons_Vouchers_and_Cards_Event_Push_Messages.html#12
     """
 
+    __slots__ = ()
     event = "submit_membercard_user_info"
     card_id = StringField("CardId")
     card_code = StringField("UserCardCode")
 
 
 class MerchantOrderEvent(BaseEvent):
+    __slots__ = ()
     event = "merchant_order"
     order_id = StringField("OrderId")
     order_status = IntegerField("OrderStatus")
@@ -575,22 +611,26 @@ class MerchantOrderEvent(BaseEvent):
 
 
 class KfCreateSessionEvent(BaseEvent):
+    __slots__ = ()
     event = "kf_create_session"
     account = StringField("KfAccount")
 
 
 class KfCloseSessionEvent(BaseEvent):
+    __slots__ = ()
     event = "kf_close_session"
     account = StringField("KfAccount")
 
 
 class KfSwitchSessionEvent(BaseEvent):
+    __slots__ = ()
     event = "kf_switch_session"
     from_account = StringField("FromKfAccount")
     to_account = StringField("ToKfAccount")
 
 
 class DeviceTextEvent(BaseEvent):
+    __slots__ = ()
     event = "device_text"
     device_type = StringField("DeviceType")
     device_id = StringField("DeviceID")
@@ -600,6 +640,7 @@ class DeviceTextEvent(BaseEvent):
 
 
 class DeviceBindEvent(BaseEvent):
+    __slots__ = ()
     event = "device_bind"
     device_type = StringField("DeviceType")
     device_id = StringField("DeviceID")
@@ -609,6 +650,7 @@ class DeviceBindEvent(BaseEvent):
 
 
 class DeviceUnbindEvent(BaseEvent):
+    __slots__ = ()
     event = "device_unbind"
     device_type = StringField("DeviceType")
     device_id = StringField("DeviceID")
@@ -618,6 +660,7 @@ class DeviceUnbindEvent(BaseEvent):
 
 
 class DeviceSubscribeStatusEvent(BaseEvent):
+    __slots__ = ()
     event = "device_subscribe_status"
     device_type = StringField("DeviceType")
     device_id = StringField("DeviceID")
@@ -626,6 +669,7 @@ class DeviceSubscribeStatusEvent(BaseEvent):
 
 
 class DeviceUnsubscribeStatusEvent(BaseEvent):
+    __slots__ = ()
     event = "device_unsubscribe_status"
     device_type = StringField("DeviceType")
     device_id = StringField("DeviceID")
@@ -634,6 +678,7 @@ class DeviceUnsubscribeStatusEvent(BaseEvent):
 
 
 class ShakearoundUserShakeEvent(BaseEvent):
+    __slots__ = ()
     event = "shakearoundusershake"
     _chosen_beacon = BaseField("ChosenBeacon", {})
     _around_beacons = BaseField("AroundBeacons", {})
@@ -670,6 +715,7 @@ class ShakearoundUserShakeEvent(BaseEvent):
 
 
 class PoiCheckNotifyEvent(BaseEvent):
+    __slots__ = ()
     event = "poi_check_notify"
     poi_id = StringField("PoiId")
     uniq_id = StringField("UniqId")
@@ -678,6 +724,7 @@ class PoiCheckNotifyEvent(BaseEvent):
 
 
 class WiFiConnectedEvent(BaseEvent):
+    __slots__ = ()
     event = "wificonnected"
     connect_time = IntegerField("ConnectTime")
     expire_time = IntegerField("ExpireTime")
@@ -697,6 +744,7 @@ class QualificationVerifySuccessEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Account_Management/Wechat_Accreditation_Event_Push.html
     """
 
+    __slots__ = ()
     event = "qualification_verify_success"
     expired_time = DateTimeField("ExpiredTime")
 
@@ -709,6 +757,7 @@ class QualificationVerifyFailEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Account_Management/Wechat_Accreditation_Event_Push.html
     """
 
+    __slots__ = ()
     event = "qualification_verify_fail"
     fail_time = DateTimeField("FailTime")
     fail_reason = StringField("FailReason")
@@ -722,6 +771,7 @@ class NamingVerifySuccessEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Account_Management/Wechat_Accreditation_Event_Push.html
     """
 
+    __slots__ = ()
     event = "naming_verify_success"
     expired_time = DateTimeField("ExpiredTime")
 
@@ -734,6 +784,7 @@ class NamingVerifyFailEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Account_Management/Wechat_Accreditation_Event_Push.html
     """
 
+    __slots__ = ()
     event = "naming_verify_fail"
     fail_time = DateTimeField("FailTime")
     fail_reason = StringField("FailReason")
@@ -747,6 +798,7 @@ class AnnualRenewEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Account_Management/Wechat_Accreditation_Event_Push.html
     """
 
+    __slots__ = ()
     event = "annual_renew"
     expired_time = DateTimeField("ExpiredTime")
 
@@ -759,6 +811,7 @@ class VerifyExpiredEvent(BaseEvent):
     https://developers.weixin.qq.com/doc/offiaccount/Account_Management/Wechat_Accreditation_Event_Push.html
     """
 
+    __slots__ = ()
     event = "verify_expired"
     expired_time = DateTimeField("ExpiredTime")
 
@@ -771,6 +824,7 @@ class UserScanProductEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1455872179
     """
 
+    __slots__ = ()
     event = "user_scan_product"
     standard = StringField("KeyStandard")
     key = StringField("KeyStr")
@@ -789,6 +843,7 @@ class UserScanProductEnterSessionEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1455872179
     """
 
+    __slots__ = ()
     event = "user_scan_product_enter_session"
     standard = StringField("KeyStandard")
     key = StringField("KeyStr")
@@ -802,6 +857,7 @@ class UserScanProductAsyncEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1455872179
     """
 
+    __slots__ = ()
     event = "user_scan_product_async"
     standard = StringField("KeyStandard")
     key = StringField("KeyStr")
@@ -816,6 +872,7 @@ class UserScanProductVerifyActionEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1455872179
     """
 
+    __slots__ = ()
     event = "user_scan_product_verify_action"
     standard = StringField("KeyStandard")
     key = StringField("KeyStr")
@@ -831,6 +888,7 @@ class SubscribeScanProductEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1455872179
     """
 
+    __slots__ = ()
     event = "subscribe_scan_product"
     event_key = StringField("EventKey")
 
@@ -856,6 +914,7 @@ class UserAuthorizeInvoiceEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1497082828_r1cI2
     """
 
+    __slots__ = ()
     event = "user_authorize_invoice"
     success_order_id = StringField("SuccOrderId")  # 授权成功的订单号
     fail_order_id = StringField("FailOrderId")  # 授权失败的订单号
@@ -871,6 +930,7 @@ class UpdateInvoiceStatusEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1497082828_r1cI2
     """
 
+    __slots__ = ()
     event = "update_invoice_status"
     status = StringField("Status")  # 发票报销状态
     card_id = StringField("CardId")  # 发票 Card ID
@@ -885,6 +945,7 @@ class SubmitInvoiceTitleEvent(BaseEvent):
     https://mp.weixin.qq.com/wiki?id=mp1496554912_vfWU0
     """
 
+    __slots__ = ()
     event = "submit_invoice_title"
     title = StringField("title")  # 抬头
     phone = StringField("phone")  # 联系方式
@@ -903,6 +964,7 @@ class UserEnterTempSessionEvent(BaseEvent):
     https://developers.weixin.qq.com/miniprogram/dev/framework/open-ability/customer-message/receive.html
     """
 
+    __slots__ = ()
     event = "user_enter_tempsession"
     session_from = StringField("SessionFrom")
 
@@ -912,6 +974,7 @@ class ViewMiniProgramEvent(BaseEvent):
     从菜单进入小程序事件
     """
 
+    __slots__ = ()
     event = "view_miniprogram"
     page_path = StringField("EventKey")  # 小程序路径
     menu_id = StringField("MenuId")  # 菜单ID
@@ -924,6 +987,7 @@ class WxaMediaCheckEvent(BaseEvent):
     https://developers.weixin.qq.com/miniprogram/dev/api-backend/open-api/sec-check/security.mediaCheckAsync.html
     """
 
+    __slots__ = ()
     event = "wxa_media_check"
     is_risky = IntegerField("isrisky")  # 检测结果，0：暂未检测到风险，1：风险
     extra_info_json = StringField("extra_info_json")  # 附加信息，默认为空
@@ -20,26 +20,54 @@ from aiowechatpy.utils import to_text, to_binary, ObjectDict, timezone
 default_timezone = timezone("Asia/Shanghai")
 
 
+_MISSING = object()
+
+# defaults of these types are shared instead of deep copied
+_IMMUTABLE_TYPES = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+
+def cdata(text):
+    """Escape text for a CDATA section, ]]> is split into two sections"""
+    return text.replace("]]>", "]]]]><![CDATA[>")
+
+
 class FieldDescriptor:
     def __init__(self, field):
         self.field = field
         self.attr_name = field.name
+        self.copy_default = not isinstance(field.default, _IMMUTABLE_TYPES)
 
     def __get__(self, instance, instance_type=None):
-        if instance is not None:
-            value = instance._data.get(self.attr_name)
-            if value is None:
-                value = copy.deepcopy(self.field.default)
-                instance._data[self.attr_name] = value
-            if isinstance(value, dict):
-                value = ObjectDict(value)
-            if value and not isinstance(value, (dict, list, tuple)) and callable(self.field.converter):
-                value = self.field.converter(value)
-            return value
-        return self.field
+        if instance is None:
+            return self.field
+        # messages cache converted values, replies have no cache
+        cache = getattr(instance, "_cache", None)
+        if cache is None:
+            return self._convert(instance)
+        value = cache.get(self, _MISSING)
+        if value is _MISSING:
+            value = cache[self] = self._convert(instance)
+        return value
+
+    def _convert(self, instance):
+        value = instance._data.get(self.attr_name)
+        if value is None:
+            value = self.field.default
+            if self.copy_default:
+                value = copy.deepcopy(value)
+            instance._data[self.attr_name] = value
+        if isinstance(value, dict):
+            value = ObjectDict(value)
+        if value and not isinstance(value, (dict, list, tuple)) and callable(self.field.converter):
+            value = self.field.converter(value)
+        return value
 
     def __set__(self, instance, value):
         instance._data[self.attr_name] = value
+        cache = getattr(instance, "_cache", None)
+        if cache:
+            # several fields may read the same XML node
+            cache.clear()
 
 
 class BaseField:
@@ -52,6 +80,17 @@ class BaseField:
     def to_xml(self, value):
         raise NotImplementedError()
 
+    def xml_template(self):
+        """
+        Constant XML around the rendered value, replies compile it into their
+        render plan. Fields with no template render all of it in render_value
+        """
+        return "", ""
+
+    def render_value(self, value):
+        """Render the value between the prefix and suffix of xml_template"""
+        return self.to_xml(value)
+
     @classmethod
     def from_xml(cls, value):
         raise NotImplementedError()
@@ -77,8 +116,14 @@ class StringField(BaseField):
     converter = __to_text
 
     def to_xml(self, value):
-        value = self.converter(value)
-        return f"<{self.name}><![CDATA[{value}]]></{self.name}>"
+        prefix, suffix = self.xml_template()
+        return prefix + self.render_value(value) + suffix
+
+    def xml_template(self):
+        return f"<{self.name}><![CDATA[", f"]]></{self.name}>"
+
+    def render_value(self, value):
+        return cdata(self.converter(value))
 
     @classmethod
     def from_xml(cls, value):
@@ -89,8 +134,13 @@ class IntegerField(BaseField):
     converter = int
 
     def to_xml(self, value):
-        value = self.converter(value) if value is not None else self.default
-        return f"<{self.name}>{value}</{self.name}>"
+        return f"<{self.name}>{self.render_value(value)}</{self.name}>"
+
+    def xml_template(self):
+        return f"<{self.name}>", f"</{self.name}>"
+
+    def render_value(self, value):
+        return str(self.converter(value) if value is not None else self.default)
 
     @classmethod
     def from_xml(cls, value):
@@ -105,9 +155,13 @@ class DateTimeField(BaseField):
     converter = __converter
 
     def to_xml(self, value):
-        value = time.mktime(datetime.timetuple(value))
-        value = int(value)
-        return f"<{self.name}>{value}</{self.name}>"
+        return f"<{self.name}>{self.render_value(value)}</{self.name}>"
+
+    def xml_template(self):
+        return f"<{self.name}>", f"</{self.name}>"
+
+    def render_value(self, value):
+        return str(int(time.mktime(datetime.timetuple(value))))
 
     @classmethod
     def from_xml(cls, value):
@@ -118,8 +172,13 @@ class FloatField(BaseField):
     converter = float
 
     def to_xml(self, value):
-        value = self.converter(value) if value is not None else self.default
-        return f"<{self.name}>{value}</{self.name}>"
+        return f"<{self.name}>{self.render_value(value)}</{self.name}>"
+
+    def xml_template(self):
+        return f"<{self.name}>", f"</{self.name}>"
+
+    def render_value(self, value):
+        return str(self.converter(value) if value is not None else self.default)
 
     @classmethod
     def from_xml(cls, value):
@@ -127,11 +186,8 @@ class FloatField(BaseField):
 
 
 class ImageField(StringField):
-    def to_xml(self, value):
-        value = self.converter(value)
-        return f"""<Image>
-        <MediaId><![CDATA[{value}]]></MediaId>
-        </Image>"""
+    def xml_template(self):
+        return "<Image>\n        <MediaId><![CDATA[", "]]></MediaId>\n        </Image>"
 
     @classmethod
     def from_xml(cls, value):
@@ -139,29 +195,42 @@ class ImageField(StringField):
 
 
 class VoiceField(StringField):
-    def to_xml(self, value):
-        value = self.converter(value)
-        return f"""<Voice>
-        <MediaId><![CDATA[{value}]]></MediaId>
-        </Voice>"""
+    def xml_template(self):
+        return "<Voice>\n        <MediaId><![CDATA[", "]]></MediaId>\n        </Voice>"
 
     @classmethod
     def from_xml(cls, value):
         return value["MediaId"]
 
 
-class VideoField(StringField):
-    def to_xml(self, value):
-        kwargs = dict(media_id=self.converter(value["media_id"]))
-        content = "<MediaId><![CDATA[{media_id}]]></MediaId>"
-        if "title" in value:
-            kwargs["title"] = self.converter(value["title"])
-            content += "<Title><![CDATA[{title}]]></Title>"
-        if "description" in value:
-            kwargs["description"] = self.converter(value["description"])
-            content += "<Description><![CDATA[{description}]]></Description>"
-        tpl = f"""<Video>{content}</Video>"""
-        return tpl.format(**kwargs)
+class _CompoundField(StringField):
+    """A node of CDATA children, the first is required and the others are optional"""
+
+    # (key, tag) of the children
+    children = ()
+
+    def __init__(self, name, default=None):
+        super().__init__(name, default)
+        self._children = [(key, f"<{tag}><![CDATA[", f"]]></{tag}>") for key, tag in self.children]
+
+    def xml_template(self):
+        return f"<{self.name}>", f"</{self.name}>"
+
+    def render_value(self, value):
+        converter = self.converter
+        (key, prefix, suffix), *optional = self._children
+        parts = [prefix, cdata(converter(value[key])), suffix]
+        for key, prefix, suffix in optional:
+            if key in value:
+                parts += (prefix, cdata(converter(value[key])), suffix)
+        return "".join(parts)
+
+
+class VideoField(_CompoundField):
+    children = (("media_id", "MediaId"), ("title", "Title"), ("description", "Description"))
+
+    def xml_template(self):
+        return "<Video>", "</Video>"
 
     @classmethod
     def from_xml(cls, value):
@@ -173,24 +242,17 @@ class VideoField(StringField):
         return rv
 
 
-class MusicField(StringField):
-    def to_xml(self, value):
-        kwargs = dict(thumb_media_id=self.converter(value["thumb_media_id"]))
-        content = "<ThumbMediaId><![CDATA[{thumb_media_id}]]></ThumbMediaId>"
-        if "title" in value:
-            kwargs["title"] = self.converter(value["title"])
-            content += "<Title><![CDATA[{title}]]></Title>"
-        if "description" in value:
-            kwargs["description"] = self.converter(value["description"])
-            content += "<Description><![CDATA[{description}]]></Description>"
-        if "music_url" in value:
-            kwargs["music_url"] = self.converter(value["music_url"])
-            content += "<MusicUrl><![CDATA[{music_url}]]></MusicUrl>"
-        if "hq_music_url" in value:
-            kwargs["hq_music_url"] = self.converter(value["hq_music_url"])
-            content += "<HQMusicUrl><![CDATA[{hq_music_url}]]></HQMusicUrl>"
-        tpl = f"""<Music>{content}</Music>"""
-        return tpl.format(**kwargs)
+class MusicField(_CompoundField):
+    children = (
+        ("thumb_media_id", "ThumbMediaId"),
+        ("title", "Title"),
+        ("description", "Description"),
+        ("music_url", "MusicUrl"),
+        ("hq_music_url", "HQMusicUrl"),
+    )
+
+    def xml_template(self):
+        return "<Music>", "</Music>"
 
     @classmethod
     def from_xml(cls, value):
@@ -207,14 +269,18 @@ class MusicField(StringField):
 
 
 class ArticlesField(StringField):
-    def to_xml(self, articles):
-        article_count = len(articles)
+    def xml_template(self):
+        # ArticleCount and Articles are two nodes, render_value renders both
+        return "", ""
+
+    def render_value(self, articles):
+        converter = self.converter
         items = []
         for article in articles:
-            title = self.converter(article.get("title", ""))
-            description = self.converter(article.get("description", ""))
-            image = self.converter(article.get("image", ""))
-            url = self.converter(article.get("url", ""))
+            title = cdata(converter(article.get("title", "")))
+            description = cdata(converter(article.get("description", "")))
+            image = cdata(converter(article.get("image", "")))
+            url = cdata(converter(article.get("url", "")))
             item = f"""<item>
             <Title><![CDATA[{title}]]></Title>
             <Description><![CDATA[{description}]]></Description>
@@ -223,7 +289,7 @@ class ArticlesField(StringField):
             </item>"""
             items.append(item)
         items_str = "\n".join(items)
-        return f"""<ArticleCount>{article_count}</ArticleCount>
+        return f"""<ArticleCount>{len(articles)}</ArticleCount>
         <Articles>{items_str}</Articles>"""
 
     @classmethod
@@ -240,11 +306,8 @@ class ArticlesField(StringField):
 
 
 class TaskCardField(StringField):
-    def to_xml(self, value):
-        value = self.converter(value)
-        return f"""<TaskCard>
-            <ReplaceName><![CDATA[{value}]]></ReplaceName>
-        </TaskCard>"""
+    def xml_template(self):
+        return "<TaskCard>\n            <ReplaceName><![CDATA[", "]]></ReplaceName>\n        </TaskCard>"
 
     @classmethod
     def from_xml(cls, value):
@@ -267,8 +330,16 @@ class Base64DecodeField(StringField):
 
 class HardwareField(StringField):
     def to_xml(self, value=None):
+        return super().to_xml(value)
+
+    def xml_template(self):
+        # MessageView and MessageAction are two children, render_value renders the node
+        return "", ""
+
+    def render_value(self, value):
         value = value or {"view": "myrank", "action": "ranklist"}
+        view, action = cdata(str(value.get("view"))), cdata(str(value.get("action")))
         return f"""<{self.name}>
-        <MessageView><![CDATA[{value.get("view")}]]></MessageView>
-        <MessageAction><![CDATA[{value.get("action")}]]></MessageAction>
+        <MessageView><![CDATA[{view}]]></MessageView>
+        <MessageAction><![CDATA[{action}]]></MessageAction>
         </{self.name}>"""
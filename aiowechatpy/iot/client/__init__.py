@@ -23,10 +23,13 @@ class IotClient(BaseWeChatClient):
         session=None,
         timeout=None,
         auto_retry=True,
+        transport=None,
+        rate_limiter=None,
+        retry_policy=None,
     ):
         self.app_id = app_id
         self.secret = secret
-        super().__init__(app_id, session, timeout, auto_retry)
+        super().__init__(app_id, session, timeout, auto_retry, transport, rate_limiter, retry_policy)
 
     @property
     def access_token_key(self):
@@ -10,10 +10,11 @@
 """
 import copy
 
+from aiowechatpy.dispatch import Registry
 from aiowechatpy.fields import BaseField, DateTimeField, FieldDescriptor, IntegerField, StringField
 
-MESSAGE_TYPES = {}
-COMPONENT_MESSAGE_TYPES = {}
+MESSAGE_TYPES = Registry()
+COMPONENT_MESSAGE_TYPES = Registry()
 
 
 def register_message(msg_type):
@@ -58,6 +59,8 @@ class MessageMetaClass(type):
 class BaseMessage(metaclass=MessageMetaClass):
     """Base class for all messages and events"""
 
+    __slots__ = ("_data", "_cache")
+
     type = "unknown"
     id = IntegerField("MsgId", 0)
     source = StringField("FromUserName")
@@ -67,6 +70,8 @@ class BaseMessage(metaclass=MessageMetaClass):
 
     def __init__(self, message):
         self._data = message
+        # converted field values
+        self._cache = {}
 
     def __repr__(self):
         return f"{self.__class__.__name__}({repr(self._data)})"
@@ -80,6 +85,7 @@ class TextMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "text"
     content = StringField("Content")
 
@@ -92,6 +98,7 @@ class ImageMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "image"
     media_id = StringField("MediaId")
     image = StringField("PicUrl")
@@ -105,6 +112,7 @@ class VoiceMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "voice"
     media_id = StringField("MediaId")
     format = StringField("Format")
@@ -119,6 +127,7 @@ class ShortVideoMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "shortvideo"
     media_id = StringField("MediaId")
     thumb_media_id = StringField("ThumbMediaId")
@@ -132,6 +141,7 @@ class VideoMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "video"
     media_id = StringField("MediaId")
     thumb_media_id = StringField("ThumbMediaId")
@@ -145,6 +155,7 @@ class LocationMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "location"
     location_x = StringField("Location_X")
     location_y = StringField("Location_Y")
@@ -164,6 +175,7 @@ class LinkMessage(BaseMessage):
     https://developers.weixin.qq.com/doc/offiaccount/Message_Management/Receiving_standard_messages.html
     """
 
+    __slots__ = ()
     type = "link"
     title = StringField("Title")
     description = StringField("Description")
@@ -178,6 +190,7 @@ class MiniProgramPageMessage(BaseMessage):
     https://developers.weixin.qq.com/miniprogram/dev/framework/open-ability/customer-message/receive.html#小程序卡片消息
     """
 
+    __slots__ = ()
     type = "miniprogrampage"
     app_id = StringField("AppId")
     title = StringField("Title")
@@ -189,18 +202,22 @@ class MiniProgramPageMessage(BaseMessage):
 class UnknownMessage(BaseMessage):
     """未知消息类型"""
 
-    pass
+    __slots__ = ()
 
 
 class BaseComponentMessage(metaclass=MessageMetaClass):
     """Base class for all component messages and events"""
 
+    __slots__ = ("_data", "_cache")
+
     type = "unknown"
     appid = StringField("AppId")
     create_time = DateTimeField("CreateTime")
 
     def __init__(self, message):
         self._data = message
+        # converted field values
+        self._cache = {}
 
     def __repr__(self):
         return f"{self.__class__.__name__}({repr(self._data)})"
@@ -212,6 +229,7 @@ class ComponentVerifyTicketMessage(BaseComponentMessage):
     component_verify_ticket协议
     """
 
+    __slots__ = ()
     type = "component_verify_ticket"
     verify_ticket = StringField("ComponentVerifyTicket")
 
@@ -222,6 +240,7 @@ class ComponentUnauthorizedMessage(BaseComponentMessage):
     取消授权通知
     """
 
+    __slots__ = ()
     type = "unauthorized"
     authorizer_appid = StringField("AuthorizerAppid")
 
@@ -232,6 +251,7 @@ class ComponentAuthorizedMessage(BaseComponentMessage):
     新增授权通知
     """
 
+    __slots__ = ("query_auth_result",)
     type = "authorized"
     authorizer_appid = StringField("AuthorizerAppid")
     authorization_code = StringField("AuthorizationCode")
@@ -245,6 +265,7 @@ class ComponentUpdateAuthorizedMessage(BaseComponentMessage):
     更新授权通知
     """
 
+    __slots__ = ("query_auth_result",)
     type = "updateauthorized"
     authorizer_appid = StringField("AuthorizerAppid")
     authorization_code = StringField("AuthorizationCode")
@@ -257,4 +278,5 @@ class ComponentUnknownMessage(BaseComponentMessage):
     未知通知
     """
 
+    __slots__ = ()
     type = "unknown"
@@ -8,12 +8,13 @@
     :copyright: (c) 2014 by messense.
     :license: MIT, see LICENSE for more details.
 """
-import json
 from urllib.parse import quote
 
 import httpx
 
+from aiowechatpy.codec import default_codec
 from aiowechatpy.exceptions import WeChatOAuthException
+from aiowechatpy.transport import get_transport_manager
 
 
 class WeChatOAuth:
@@ -25,8 +26,10 @@ class WeChatOAuth:
 
     API_BASE_URL = "https://api.weixin.qq.com/"
     OAUTH_BASE_URL = "https://open.weixin.qq.com/connect/"
+    # codec of JSON request and response bodies
+    json_codec = default_codec
 
-    def __init__(self, app_id, secret, redirect_uri, scope="snsapi_base", state=""):
+    def __init__(self, app_id, secret, redirect_uri, scope="snsapi_base", state="", transport=None):
         """
 
         :param app_id: 微信公众号 app_id
@@ -34,13 +37,15 @@ class WeChatOAuth:
         :param redirect_uri: OAuth2 redirect URI
         :param scope: 可选，微信公众号 OAuth2 scope，默认为 ``snsapi_base``
         :param state: 可选，微信公众号 OAuth2 state
+        :param transport: 可选，连接池管理器，默认使用进程内共享的连接池
         """
         self.app_id = app_id
         self.secret = secret
         self.redirect_uri = redirect_uri
         self.scope = scope
         self.state = state
-        self._http = httpx.AsyncClient()
+        self._owns_transport = transport is not None and transport is not get_transport_manager()
+        self._http = transport or get_transport_manager()
 
     async def _request(self, method, url_or_endpoint, **kwargs):
         if not url_or_endpoint.startswith(("http://", "https://")):
@@ -49,9 +54,7 @@ class WeChatOAuth:
             url = url_or_endpoint
 
         if isinstance(kwargs.get("data", ""), dict):
-            body = json.dumps(kwargs["data"], ensure_ascii=False)
-            body = body.encode("utf-8")
-            kwargs["data"] = body
+            kwargs["content"] = self.json_codec.dumps(kwargs.pop("data"))
 
         res = await self._http.request(method=method, url=url, **kwargs)
         try:
@@ -64,7 +67,7 @@ class WeChatOAuth:
                 request=reqe.request,
                 response=res,
             )
-        result = json.loads(res.content.decode("utf-8", "ignore"), strict=False)
+        result = self.json_codec.loads(res.content)
 
         if "errcode" in result and result["errcode"] != 0:
             errcode = result["errcode"]
@@ -76,6 +79,17 @@ class WeChatOAuth:
     async def _get(self, url, **kwargs):
         return await self._request(method="get", url_or_endpoint=url, **kwargs)
 
+    async def aclose(self):
+        """关闭通过 ``transport`` 参数指定的连接池管理器，进程内默认的连接池需通过 ``TransportManager.aclose()`` 关闭"""
+        if self._owns_transport:
+            await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
     @property
     def authorize_url(self):
         """获取授权跳转地址
@@ -7,11 +7,39 @@
     :copyright: (c) 2014 by messense.
     :license: MIT, see LICENSE for more details.
 """
-import xmltodict
-
+from aiowechatpy.dispatch import MessageDispatcher
 from aiowechatpy.messages import MESSAGE_TYPES, UnknownMessage
 from aiowechatpy.events import EVENT_TYPES
-from aiowechatpy.utils import to_text
+from aiowechatpy.xmlparser import parse_xml
+
+
+def _normalize(message_type, event):
+    message_type = (message_type or "").lower()
+    if message_type == "event":
+        return "event", event.lower() if event else None
+    if message_type.startswith("device_"):
+        # special event type for device_event
+        return "event", f"device_{event.lower()}" if event else message_type
+    return "message", message_type
+
+
+def _subscribe_hook(message):
+    event_key = message.get("EventKey")
+    if not event_key:
+        return None
+    if event_key.startswith(("scanbarcode|", "scanimage|")):
+        message["Event"] = "subscribe_scan_product"
+        return message["Event"]
+    if event_key.startswith("qrscene_"):
+        # Scan to subscribe with scene id event
+        message["Event"] = "subscribe_scan"
+        message["EventKey"] = event_key[len("qrscene_") :]
+        return message["Event"]
+    return None
+
+
+dispatcher = MessageDispatcher(_normalize, {"message": MESSAGE_TYPES, "event": EVENT_TYPES}, UnknownMessage)
+dispatcher.add_hook("event", "subscribe", _subscribe_hook)
 
 
 def parse_message(xml):
@@ -23,29 +51,4 @@ def parse_message(xml):
     """
     if not xml:
         return
-    message = xmltodict.parse(to_text(xml))["xml"]
-    message_type = message["MsgType"].lower()
-    event_type = None
-    if message_type == "event" or message_type.startswith("device_"):
-        if "Event" in message:
-            event_type = message["Event"].lower()
-        # special event type for device_event
-        if event_type is None and message_type.startswith("device_"):
-            event_type = message_type
-        elif message_type.startswith("device_"):
-            event_type = f"device_{event_type}"
-
-        if event_type == "subscribe" and message.get("EventKey"):
-            event_key = message["EventKey"]
-            if event_key.startswith(("scanbarcode|", "scanimage|")):
-                event_type = "subscribe_scan_product"
-                message["Event"] = event_type
-            elif event_key.startswith("qrscene_"):
-                # Scan to subscribe with scene id event
-                event_type = "subscribe_scan"
-                message["Event"] = event_type
-                message["EventKey"] = event_key[len("qrscene_") :]
-        message_class = EVENT_TYPES.get(event_type, UnknownMessage)
-    else:
-        message_class = MESSAGE_TYPES.get(message_type, UnknownMessage)
-    return message_class(message)
+    return dispatcher.dispatch(parse_xml(xml).get("xml"))
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-import inspect
 import logging
 
 import requests
@@ -17,16 +16,11 @@ from aiowechatpy.pay.utils import (
     _check_signature,
     dict_to_xml,
 )
-from aiowechatpy.pay.api.base import BaseWeChatPayAPI
 from aiowechatpy.pay import api
 
 logger = logging.getLogger(__name__)
 
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseWeChatPayAPI)
-
-
 class WeChatPay:
     """
     微信支付接口
@@ -67,15 +61,6 @@ class WeChatPay:
 
     API_BASE_URL = "https://api.mch.weixin.qq.com/"
 
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, _api in api_endpoints:
-            api_cls = type(_api)
-            _api = api_cls(self)
-            setattr(self, name, _api)
-        return self
-
     def __init__(
         self,
         appid,
@@ -205,6 +190,25 @@ class WeChatPay:
     def post(self, url, **kwargs):
         return self._request(method="post", url_or_endpoint=url, **kwargs)
 
+    def close(self):
+        """关闭 HTTP 连接池"""
+        self._http.close()
+
+    async def aclose(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def check_signature(self, params):
         return _check_signature(params, self.api_key if not self.sandbox else self.sandbox_api_key)
 
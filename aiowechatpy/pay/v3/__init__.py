@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import datetime
-import inspect
 import json
 import logging
 import os
@@ -13,7 +12,6 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.x509 import load_pem_x509_certificate
 
 from aiowechatpy.exceptions import InvalidSignatureException, WeChatPayV3Exception
-from aiowechatpy.pay.v3.api.base import BaseWeChatPayAPI
 from aiowechatpy.pay.utils import (
     calculate_signature_rsa,
     check_rsa_signature,
@@ -28,10 +26,6 @@ from aiowechatpy.pay.v3 import api
 logger = logging.getLogger(__name__)
 
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseWeChatPayAPI)
-
-
 class WeChatPay:
     """
     微信支付接口
@@ -60,15 +54,6 @@ class WeChatPay:
 
     API_BASE_URL = "https://api.mch.weixin.qq.com/v3/"
 
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, _api in api_endpoints:
-            api_cls = type(_api)
-            _api = api_cls(self)
-            setattr(self, name, _api)
-        return self
-
     def __init__(
         self,
         appid,
@@ -218,6 +203,25 @@ class WeChatPay:
     def post(self, url, **kwargs):
         return self._request(method="post", url_or_endpoint=url, **kwargs)
 
+    def close(self):
+        """关闭 HTTP 连接池"""
+        self._http.close()
+
+    async def aclose(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def update_certificates(self, skip_check_signature=False):
         """
         获取证书，该接口需要定期执行
@@ -21,12 +21,17 @@ from aiowechatpy.fields import (
     ArticlesField,
     Base64EncodeField,
     HardwareField,
+    cdata,
 )
 from aiowechatpy.messages import BaseMessage, MessageMetaClass
 
 
 REPLY_TYPES = {}
 
+# converters that give the same value when applied again, so the render plan
+# skips the conversion FieldDescriptor does before to_xml
+_IDEMPOTENT_CONVERTERS = {StringField.converter, int, float}
+
 
 def register_reply(reply_type):
     def register(cls):
@@ -36,7 +41,34 @@ def register_reply(reply_type):
     return register
 
 
-class BaseReply(metaclass=MessageMetaClass):
+def _compile_render_plan(cls):
+    """
+    Compile the XML of a reply class into steps of (literal, key, default,
+    converter, render_value) and the tail literal, adjacent constant parts of
+    the fields are merged into a single literal
+    """
+    steps = []
+    literal = f"<xml>\n<MsgType><![CDATA[{cdata(cls.type)}]]></MsgType>\n"
+    for field in cls._fields.values():
+        prefix, suffix = field.xml_template()
+        converter = field.converter
+        if type(field).converter in _IDEMPOTENT_CONVERTERS or not callable(converter):
+            converter = None
+        steps.append((literal + prefix, field.name, field.default, converter, field.render_value))
+        literal = suffix + "\n"
+    return tuple(steps), literal + "</xml>"
+
+
+class ReplyMetaClass(MessageMetaClass):
+    """Metaclass for all replies, compiles the render plan once the fields are known"""
+
+    def __new__(mcs, name, bases, attrs):
+        cls = super().__new__(mcs, name, bases, attrs)
+        cls._render_plan = _compile_render_plan(cls)
+        return cls
+
+
+class BaseReply(metaclass=ReplyMetaClass):
     """Base class for all replies"""
 
     source = StringField("FromUserName")
@@ -65,15 +97,20 @@ class BaseReply(metaclass=MessageMetaClass):
 
     def render(self):
         """Render reply from Python object to XML string"""
-        nodes = []
-        msg_type = f"<MsgType><![CDATA[{self.type}]]></MsgType>"
-        nodes.append(msg_type)
-        for name, field in self._fields.items():
-            value = getattr(self, name, field.default)
-            node_xml = field.to_xml(value)
-            nodes.append(node_xml)
-        data = "\n".join(nodes)
-        return f"<xml>\n{data}\n</xml>"
+        data = self._data
+        steps, tail = self._render_plan
+        parts = []
+        for literal, key, default, converter, render_value in steps:
+            value = data.get(key)
+            if value is None:
+                value = default
+            # what FieldDescriptor does before to_xml
+            if converter is not None and value and not isinstance(value, (dict, list, tuple)):
+                value = converter(value)
+            parts.append(literal)
+            parts.append(render_value(value))
+        parts.append(tail)
+        return "".join(parts)
 
     def __str__(self):
         return self.render()
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.router
+    ~~~~~~~~~~~~~~~~~~
+
+    This module routes parsed messages and events to async handlers
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import asyncio
+import functools
+import re
+
+from aiowechatpy import replies
+
+
+class _Routes:
+    """Handlers registered for one (type, event, agent)"""
+
+    def __init__(self):
+        self.handler = None
+        self.keys = {}
+        self.prefixes = {}
+        # distinct prefix lengths, longest first
+        self.prefix_lengths = []
+        self.patterns = []
+
+    def add(self, handler, key=None, key_prefix=None, key_regex=None):
+        if key is not None:
+            self.keys[key] = handler
+        elif key_prefix is not None:
+            self.prefixes[key_prefix] = handler
+            self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes}, reverse=True)
+        elif key_regex is not None:
+            self.patterns.append((re.compile(key_regex), handler))
+        else:
+            self.handler = handler
+
+    def match(self, key):
+        if key is not None:
+            handler = self.keys.get(key)
+            if handler is not None:
+                return handler
+            for length in self.prefix_lengths:
+                handler = self.prefixes.get(key[:length])
+                if handler is not None:
+                    return handler
+            for pattern, handler in self.patterns:
+                if pattern.match(key):
+                    return handler
+        return self.handler
+
+
+def _ensure_async(handler):
+    if asyncio.iscoroutinefunction(handler):
+        return handler
+
+    @functools.wraps(handler)
+    async def wrapper(*args):
+        return handler(*args)
+
+    return wrapper
+
+
+class MessageRouter:
+    """
+    消息路由
+
+    按消息类型、事件类型、EventKey 和企业微信应用 AgentID 注册异步处理函数，处理函数返回的回复经
+    ``create_reply`` 转换为 ``BaseReply``，返回 None 时回复 ``EmptyReply``。
+
+    处理函数按 (消息类型, 事件类型, AgentID) 建立索引，查找时依次尝试 EventKey 完全匹配、最长前缀匹配和正则表达式，
+    耗时与注册的处理函数数量无关，只有同一事件下的正则表达式需要逐个匹配。匹配优先级为：
+
+    1. 指定了 AgentID 的处理函数优先于未指定的
+    2. 指定了事件类型的处理函数优先于只指定 ``event`` 消息类型的
+    3. EventKey 完全匹配、前缀匹配、正则表达式、不限 EventKey 依次降低
+    4. 都不匹配时使用 ``default`` 注册的处理函数
+
+    .. code-block:: python
+
+        router = MessageRouter()
+
+        @router.message("text")
+        async def echo(message):
+            return message.content
+
+        @router.event("click", key_prefix="order_")
+        async def order(message):
+            return TextReply(content="...", message=message)
+
+        reply = await router.dispatch(parse_message(xml))
+
+    :param create_reply: 可选，把处理函数的返回值转换为回复，企业微信使用 ``aiowechatpy.work.create_reply``
+    """
+
+    def __init__(self, create_reply=replies.create_reply):
+        self.create_reply = create_reply
+        # (type, event, agent) -> _Routes
+        self._index = {}
+        self._default = None
+        self._middlewares = []
+        self._call = self._handle
+
+    def add_handler(self, handler, msg_type, event=None, key=None, key_prefix=None, key_regex=None, agent=None):
+        """
+        注册处理函数
+
+        :param handler: 处理函数，参数为消息对象，可以是普通函数或 async 函数
+        :param msg_type: 消息类型，如 ``text``、``event``
+        :param event: 可选，事件类型，如 ``click``、``subscribe``
+        :param key: 可选，EventKey 完全匹配
+        :param key_prefix: 可选，EventKey 前缀
+        :param key_regex: 可选，匹配 EventKey 开头的正则表达式
+        :param agent: 可选，企业微信应用的 AgentID
+        """
+        index_key = (msg_type.lower(), event.lower() if event else None, agent)
+        routes = self._index.get(index_key)
+        if routes is None:
+            routes = self._index[index_key] = _Routes()
+        routes.add(_ensure_async(handler), key, key_prefix, key_regex)
+
+    def message(self, msg_type, agent=None):
+        """
+        注册消息处理函数的装饰器
+
+        :param msg_type: 消息类型，如 ``text``、``image``
+        :param agent: 可选，企业微信应用的 AgentID
+        """
+
+        def register(handler):
+            self.add_handler(handler, msg_type, agent=agent)
+            return handler
+
+        return register
+
+    def event(self, event, key=None, key_prefix=None, key_regex=None, agent=None):
+        """
+        注册事件处理函数的装饰器
+
+        :param event: 事件类型，如 ``click``、``subscribe``
+        :param key: 可选，EventKey 完全匹配
+        :param key_prefix: 可选，EventKey 前缀
+        :param key_regex: 可选，匹配 EventKey 开头的正则表达式
+        :param agent: 可选，企业微信应用的 AgentID
+        """
+
+        def register(handler):
+            self.add_handler(handler, "event", event, key, key_prefix, key_regex, agent)
+            return handler
+
+        return register
+
+    def default(self, handler):
+        """注册没有匹配的处理函数时使用的处理函数的装饰器"""
+        self._default = _ensure_async(handler)
+        return handler
+
+    def use(self, middleware):
+        """
+        注册中间件，先注册的在外层
+
+        中间件的参数为消息对象和 ``call_next``，``await call_next(message)`` 执行后续的中间件和处理函数并返回回复，
+        中间件可以修改或直接返回回复，可用于日志、去重、计时等
+
+        :param middleware: async 函数 ``middleware(message, call_next)``
+        """
+        self._middlewares.append(middleware)
+        # compose once, so dispatch does not walk the list
+        call = self._handle
+        for outer in reversed(self._middlewares):
+            call = functools.partial(outer, call_next=call)
+        self._call = call
+        return middleware
+
+    def resolve(self, message):
+        """
+        查找消息对应的处理函数
+
+        :param message: 消息对象
+        :return: 处理函数，没有匹配时返回 ``default`` 注册的处理函数或 None
+        """
+        msg_type = message.type
+        event = getattr(message, "event", None)
+        agent = getattr(message, "agent", None)
+        # events expose EventKey under different names, read it from the XML
+        key = message._data.get("EventKey") if event else None
+        if event:
+            candidates = (
+                (msg_type, event, agent),
+                (msg_type, event, None),
+                (msg_type, None, agent),
+                (msg_type, None, None),
+            )
+        else:
+            candidates = ((msg_type, None, agent), (msg_type, None, None))
+        index = self._index
+        for index_key in candidates:
+            routes = index.get(index_key)
+            if routes is not None:
+                handler = routes.match(key)
+                if handler is not None:
+                    return handler
+        return self._default
+
+    async def _handle(self, message):
+        handler = self.resolve(message)
+        result = await handler(message) if handler is not None else None
+        if result is None:
+            return replies.EmptyReply()
+        return self.create_reply(result, message)
+
+    async def dispatch(self, message):
+        """
+        处理消息
+
+        :param message: ``parse_message`` 返回的消息对象
+        :return: 回复对象
+        """
+        return await self._call(message)
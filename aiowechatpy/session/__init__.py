@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from aiowechatpy.utils import random_string
 
 
 class SessionStorage:
@@ -11,6 +12,75 @@ class SessionStorage:
     async def delete(self, key):
         raise NotImplementedError()
 
+    async def get_many(self, keys, default=None):
+        """
+        批量获取
+
+        :param keys: key 列表
+        :return: 与 ``keys`` 顺序一致的值列表，不存在的 key 对应 ``default``
+        """
+        return [await self.get(key, default) for key in keys]
+
+    async def set_many(self, mapping, ttl=None):
+        """
+        批量设置，按 ``mapping`` 的顺序写入
+
+        :param mapping: key 到值的字典
+        :param ttl: 可选，所有 key 的有效期，单位秒
+        """
+        for key, value in mapping.items():
+            await self.set(key, value, ttl)
+
+    async def delete_many(self, keys):
+        """
+        批量删除
+
+        :param keys: key 列表
+        """
+        for key in keys:
+            await self.delete(key)
+
+    async def discard_local(self, keys):
+        """
+        丢弃进程内缓存的 key，之后的读取直接访问共享存储，没有进程内缓存的存储不做任何操作
+
+        :param keys: key 列表
+        """
+
+    async def get_with_ttl(self, key, default=None):
+        """
+        获取 ``key`` 的值及剩余有效期
+
+        :return: ``(value, ttl)``，ttl 单位秒，无法获取或永不过期时为 None
+        """
+        return await self.get(key, default), None
+
+    async def acquire_lease(self, key, ttl):
+        """
+        尝试获取 ``key`` 对应的租约，用于保证同一时间只有一个节点刷新 token
+
+        默认实现基于 get/set，不是原子操作，共享存储应当覆盖该方法
+
+        :param key: 租约 key
+        :param ttl: 租约有效期，单位秒，持有者异常退出时租约自动过期
+        :return: 获取成功返回租约标识，否则返回 None
+        """
+        if await self.get(key) is not None:
+            return None
+        lease = random_string(16)
+        await self.set(key, lease, ttl)
+        return lease
+
+    async def release_lease(self, key, lease):
+        """
+        释放租约，租约已过期并被他人获取时不做任何操作
+
+        :param key: 租约 key
+        :param lease: ``acquire_lease`` 返回的租约标识
+        """
+        if await self.get(key) == lease:
+            await self.delete(key)
+
     def __getitem__(self, key):
         self.get(key)
 
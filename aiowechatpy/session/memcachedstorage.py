@@ -1,16 +1,16 @@
 # -*- coding: utf-8 -*-
-import json
-
 from aiowechatpy.session import SessionStorage
-from aiowechatpy.utils import to_text
+from aiowechatpy.session.serializer import JSONSerializer, Serializer
+from aiowechatpy.utils import random_string, to_text
 
 
 class MemcachedStorage(SessionStorage):
-    def __init__(self, mc, prefix="wechatpy"):
+    def __init__(self, mc, prefix="wechatpy", serializer: Serializer = None):
         for method_name in ("get", "set", "delete"):
             assert hasattr(mc, method_name)
         self.mc = mc
         self.prefix = prefix
+        self.serializer = serializer or JSONSerializer()
 
     def key_name(self, key):
         return f"{self.prefix}:{key}"
@@ -20,15 +20,46 @@ class MemcachedStorage(SessionStorage):
         value = await self.mc.get(key)
         if value is None:
             return default
-        return json.loads(to_text(value))
+        return self.serializer.loads(value)
 
     async def set(self, key, value, ttl=0):
         if value is None:
             return
         key = self.key_name(key)
-        value = json.dumps(value)
+        value = self.serializer.dumps(value)
         await self.mc.set(key, value, ttl)
 
     async def delete(self, key):
         key = self.key_name(key)
         await self.mc.delete(key)
+
+    async def get_many(self, keys, default=None):
+        if not keys:
+            return []
+        names = [self.key_name(key) for key in keys]
+        values = await self.mc.get_many(names)
+        return [default if values.get(name) is None else self.serializer.loads(values[name]) for name in names]
+
+    async def set_many(self, mapping, ttl=0):
+        values = {
+            self.key_name(key): self.serializer.dumps(value) for key, value in mapping.items() if value is not None
+        }
+        if values:
+            await self.mc.set_many(values, ttl or 0)
+
+    async def delete_many(self, keys):
+        if keys:
+            await self.mc.delete_many([self.key_name(key) for key in keys])
+
+    async def acquire_lease(self, key, ttl):
+        # memcached ``add`` only stores the key if it does not exist yet
+        key = self.key_name(key)
+        lease = random_string(16)
+        if await self.mc.add(key, lease, ttl):
+            return lease
+        return None
+
+    async def release_lease(self, key, lease):
+        key = self.key_name(key)
+        if to_text(await self.mc.get(key)) == lease:
+            await self.mc.delete(key)
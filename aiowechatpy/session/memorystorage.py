@@ -1,19 +1,81 @@
 # -*- coding: utf-8 -*-
+import time
+from collections import OrderedDict
 
 from aiowechatpy.session import SessionStorage
 
 
 class MemoryStorage(SessionStorage):
-    def __init__(self):
-        self._data = {}
+    """
+    进程内存储
+
+    过期的 key 在读取时删除，并在写入时每隔 ``sweep_interval`` 秒批量清理一次。
+
+    :param max_entries: 可选，最多保存的 key 数量，超出时淘汰最久未使用的 key，默认不限制
+    :param sweep_interval: 可选，批量清理过期 key 的间隔，单位秒
+    """
+
+    def __init__(self, max_entries=None, sweep_interval=60):
+        # key -> (value, expires_at), least recently used first
+        self._data = OrderedDict()
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic() + sweep_interval
+        # 命中次数
+        self.hits = 0
+        # 未命中次数，包括已过期的 key
+        self.misses = 0
+        # 因超出 max_entries 淘汰的 key 数量
+        self.evictions = 0
+        # 过期删除的 key 数量
+        self.expirations = 0
 
     async def get(self, key, default=None):
-        return self._data.get(key, default)
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+            del self._data[key]
+            self.expirations += 1
+        self.misses += 1
+        return default
+
+    async def get_with_ttl(self, key, default=None):
+        value = await self.get(key, default)
+        entry = self._data.get(key)
+        if entry is None or entry[1] is None:
+            return value, None
+        return value, max(0.0, entry[1] - time.monotonic())
 
     async def set(self, key, value, ttl=None):
         if value is None:
             return
-        self._data[key] = value
+        now = time.monotonic()
+        self._data[key] = (value, now + ttl if ttl else None)
+        self._data.move_to_end(key)
+        if now >= self._next_sweep:
+            self.sweep()
+        if self.max_entries is not None:
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
 
     async def delete(self, key):
         self._data.pop(key, None)
+
+    def clear(self):
+        """删除所有 key"""
+        self._data.clear()
+
+    def sweep(self):
+        """删除所有过期的 key，返回删除的数量"""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        self.expirations += len(expired)
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
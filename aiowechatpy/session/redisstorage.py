@@ -1,18 +1,26 @@
 # -*- coding: utf-8 -*-
-import json
-
 from redis.asyncio import Redis
 
 from aiowechatpy.session import SessionStorage
-from aiowechatpy.utils import to_text
+from aiowechatpy.session.serializer import JSONSerializer, Serializer
+from aiowechatpy.utils import random_string
 
 
 class RedisStorage(SessionStorage):
-    def __init__(self, redis: Redis, prefix="wechatpy"):
+    # delete the lease only if it is still ours
+    _RELEASE_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, redis: Redis, prefix="wechatpy", serializer: Serializer = None):
         for method_name in ("get", "set", "delete"):
             assert hasattr(redis, method_name)
         self.redis: Redis = redis
         self.prefix = prefix
+        self.serializer = serializer or JSONSerializer()
 
     def key_name(self, key):
         return f"{self.prefix}:{key}"
@@ -22,15 +30,55 @@ class RedisStorage(SessionStorage):
         value = await self.redis.get(key)
         if value is None:
             return default
-        return json.loads(to_text(value))
+        return self.serializer.loads(value)
+
+    async def get_with_ttl(self, key, default=None):
+        key = self.key_name(key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            value, pttl = await pipe.execute()
+        if value is None:
+            return default, None
+        # pttl is -1 for keys without expiry
+        return self.serializer.loads(value), pttl / 1000 if pttl > 0 else None
 
     async def set(self, key, value, ttl=None):
         if value is None:
             return
         key = self.key_name(key)
-        value = json.dumps(value)
+        value = self.serializer.dumps(value)
         await self.redis.set(key, value, ex=ttl)
 
     async def delete(self, key):
         key = self.key_name(key)
         await self.redis.delete(key)
+
+    async def get_many(self, keys, default=None):
+        if not keys:
+            return []
+        values = await self.redis.mget([self.key_name(key) for key in keys])
+        return [default if value is None else self.serializer.loads(value) for value in values]
+
+    async def set_many(self, mapping, ttl=None):
+        # MSET can not set an expiry, pipeline the SETs instead
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                if value is not None:
+                    pipe.set(self.key_name(key), self.serializer.dumps(value), ex=ttl)
+            await pipe.execute()
+
+    async def delete_many(self, keys):
+        if keys:
+            await self.redis.delete(*[self.key_name(key) for key in keys])
+
+    async def acquire_lease(self, key, ttl):
+        key = self.key_name(key)
+        lease = random_string(16)
+        if await self.redis.set(key, lease, ex=ttl, nx=True):
+            return lease
+        return None
+
+    async def release_lease(self, key, lease):
+        key = self.key_name(key)
+        await self.redis.eval(self._RELEASE_LEASE_SCRIPT, 1, key, lease)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from aiowechatpy.codec import default_codec
+from aiowechatpy.utils import to_binary
+
+
+class Serializer:
+    """
+    session 值的序列化方式
+
+    ``dumps`` 返回 bytes，``loads`` 接受存储返回的 bytes 或 str
+    """
+
+    def dumps(self, value) -> bytes:
+        raise NotImplementedError()
+
+    def loads(self, data):
+        raise NotImplementedError()
+
+
+class JSONSerializer(Serializer):
+    """
+    JSON 序列化，与旧版本写入的数据兼容
+
+    :param codec: 可选，JSON 编解码器，默认在安装了 orjson 时使用 orjson
+    """
+
+    def __init__(self, codec=None):
+        self.codec = codec or default_codec
+
+    def dumps(self, value) -> bytes:
+        return self.codec.dumps(value)
+
+    def loads(self, data):
+        return self.codec.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """MessagePack 序列化，需要安装 ``msgpack``，不能读取以 JSON 写入的数据"""
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def dumps(self, value) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data):
+        return self._msgpack.unpackb(to_binary(data), raw=False)
+
+
+class StringSerializer(Serializer):
+    """
+    字符串原样存储，读取时只需 UTF-8 解码，适合 token、ticket 等字符串值
+
+    其他类型的值交给 ``fallback`` 序列化，默认为 JSON，因此可以读取以 JSON 写入的旧数据。
+    写入的值不是合法的 UTF-8，Redis 客户端不能开启 ``decode_responses``
+
+    :param fallback: 可选，非字符串值的序列化方式
+    """
+
+    # prefix of strings stored as is, never used by MessagePack and invalid in UTF-8 JSON
+    MARKER = b"\xc1"
+
+    def __init__(self, fallback: Serializer = None):
+        self.fallback = fallback or JSONSerializer()
+
+    def dumps(self, value) -> bytes:
+        if isinstance(value, str):
+            return self.MARKER + value.encode("utf-8")
+        return self.fallback.dumps(value)
+
+    def loads(self, data):
+        data = to_binary(data)
+        if data[:1] == self.MARKER:
+            return data[1:].decode("utf-8")
+        return self.fallback.loads(data)
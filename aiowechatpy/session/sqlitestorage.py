@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+import asyncio
+import sqlite3
+from contextlib import contextmanager
+
+from aiowechatpy.session import SessionStorage
+from aiowechatpy.session.serializer import JSONSerializer, Serializer
+from aiowechatpy.utils import random_string
+
+
+class SQLiteStorage(SessionStorage):
+    """
+    基于 SQLite 的本机共享存储
+
+    同一主机上的多个进程（如 gunicorn / uvicorn 的多个 worker）使用同一个数据库文件即可共享 access token，
+    每台主机只需一个进程获取 token，不需要部署 Redis。数据库以 WAL 模式打开，读取不会被写入阻塞。
+
+    读写直接在事件循环中执行，数据库被其他进程锁定时不阻塞等待，而是让出事件循环后重试，
+    最长等待 ``timeout`` 秒后抛出 ``sqlite3.OperationalError``。
+
+    :param path: 数据库文件路径，需要共享的进程应使用同一路径
+    :param serializer: 可选，值的序列化方式，默认为 JSON
+    :param timeout: 可选，等待其他进程释放写锁的最长时间，单位秒
+    :param sweep_interval: 可选，批量清理过期 key 的间隔，单位秒
+    """
+
+    def __init__(self, path, serializer: Serializer = None, timeout=5.0, sweep_interval=60):
+        self.path = path
+        self.serializer = serializer or JSONSerializer()
+        self.timeout = timeout
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0
+        self._conn = None
+        self._pid = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # a connection must not be used across fork, workers open their own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            # once set up, fail at once when locked, _retry waits without blocking the event loop
+            conn.execute("PRAGMA busy_timeout=0")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _executemany(self, sql, rows):
+        with self._transaction() as conn:
+            conn.executemany(sql, rows)
+
+    async def _retry(self, func, *args):
+        """Call ``func`` until the database is not locked by another process or ``timeout`` runs out"""
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                return func(*args)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or time.monotonic() >= deadline:
+                    raise
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    async def get(self, key, default=None):
+        value, _ = await self.get_with_ttl(key, default)
+        return value
+
+    async def get_with_ttl(self, key, default=None):
+        now = time.time()
+        cursor = await self._retry(
+            self.conn.execute,
+            "SELECT value, expires_at FROM session WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, now),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return default, None
+        value, expires_at = row
+        return self.serializer.loads(value), expires_at - now if expires_at else None
+
+    async def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        await self.set_many({key: value}, ttl)
+
+    async def delete(self, key):
+        await self._retry(self.conn.execute, "DELETE FROM session WHERE key = ?", (key,))
+
+    async def get_many(self, keys, default=None):
+        values = {}
+        now = time.time()
+        # stay below the limit of host parameters in a statement
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            rows = await self._retry(
+                self.conn.execute,
+                f"SELECT key, value FROM session WHERE key IN ({', '.join('?' * len(chunk))}) "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now),
+            )
+            values.update((key, self.serializer.loads(value)) for key, value in rows)
+        return [values.get(key, default) for key in keys]
+
+    async def set_many(self, mapping, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        rows = [(key, self.serializer.dumps(value), expires_at) for key, value in mapping.items() if value is not None]
+        await self._retry(
+            self._executemany, "INSERT OR REPLACE INTO session (key, value, expires_at) VALUES (?, ?, ?)", rows
+        )
+        if time.time() >= self._next_sweep:
+            await self._retry(self.sweep)
+
+    async def delete_many(self, keys):
+        await self._retry(self._executemany, "DELETE FROM session WHERE key = ?", [(key,) for key in keys])
+
+    async def acquire_lease(self, key, ttl):
+        # one statement, so the check and the write are atomic across processes
+        lease = random_string(16)
+        now = time.time()
+        cursor = await self._retry(
+            self.conn.execute,
+            "INSERT INTO session (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE session.expires_at IS NOT NULL AND session.expires_at <= ?",
+            (key, self.serializer.dumps(lease), now + ttl, now),
+        )
+        return lease if cursor.rowcount == 1 else None
+
+    async def release_lease(self, key, lease):
+        await self._retry(
+            self.conn.execute, "DELETE FROM session WHERE key = ? AND value = ?", (key, self.serializer.dumps(lease))
+        )
+
+    def sweep(self):
+        """删除所有过期的 key，返回删除的数量"""
+        now = time.time()
+        cursor = self.conn.execute("DELETE FROM session WHERE expires_at <= ?", (now,))
+        self._next_sweep = now + self.sweep_interval
+        return cursor.rowcount
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import logging
+
+from aiowechatpy.session import SessionStorage
+from aiowechatpy.session.memorystorage import MemoryStorage
+from aiowechatpy.utils import random_string, to_text
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TieredStorage(SessionStorage):
+    """
+    两级存储：进程内缓存 + 共享存储
+
+    读取时优先使用进程内缓存，未命中时从共享存储读取并缓存 ``local_ttl`` 秒，
+    共享存储中剩余的有效期更短时以其为准。写入和删除同时作用于两级存储。
+
+    共享存储为 RedisStorage 时，调用 ``start()`` 后各节点通过 Redis pub/sub 互相通知失效的 key，
+    其他节点刷新 token 后本地缓存立即失效；否则本地缓存最多比共享存储滞后 ``local_ttl`` 秒。
+
+    :param storage: 共享存储，如 RedisStorage、MemcachedStorage
+    :param local_ttl: 可选，进程内缓存的最长时间，单位秒
+    :param max_entries: 可选，进程内缓存的最大 key 数量
+    :param channel: 可选，失效通知的 Redis 频道，默认为 ``{prefix}:invalidate``
+    """
+
+    def __init__(self, storage: SessionStorage, local_ttl=5, max_entries=1024, channel=None):
+        self.storage = storage
+        self.local = MemoryStorage(max_entries=max_entries)
+        self.local_ttl = local_ttl
+        self.redis = getattr(storage, "redis", None)
+        self.channel = channel or f"{getattr(storage, 'prefix', 'wechatpy')}:invalidate"
+        # tells our own notifications apart from those of other nodes
+        self.node_id = random_string(16)
+        # key -> marker of the latest read from the shared storage in flight,
+        # dropped when the key changes so that read does not cache what it got
+        self._reads = {}
+        self._task = None
+
+    def _local_ttl(self, ttl):
+        return min(ttl, self.local_ttl) if ttl else self.local_ttl
+
+    def _start_read(self, keys):
+        marker = object()
+        for key in keys:
+            self._reads[key] = marker
+        return marker
+
+    def _finish_read(self, key, marker):
+        """Whether the value read for ``key`` since ``_start_read`` may be cached"""
+        if self._reads.get(key) is not marker:
+            return False
+        del self._reads[key]
+        return True
+
+    async def _forget(self, keys):
+        for key in keys:
+            self._reads.pop(key, None)
+            await self.local.delete(key)
+
+    async def get(self, key, default=None):
+        value = await self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        marker = self._start_read([key])
+        value, ttl = await self.storage.get_with_ttl(key)
+        if self._finish_read(key, marker) and value is not None:
+            await self.local.set(key, value, self._local_ttl(ttl))
+        return default if value is None else value
+
+    async def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        await self.storage.set(key, value, ttl)
+        self._reads.pop(key, None)
+        await self.local.set(key, value, self._local_ttl(ttl))
+        await self._publish(key)
+
+    async def delete(self, key):
+        await self.storage.delete(key)
+        await self._forget([key])
+        await self._publish(key)
+
+    async def get_many(self, keys, default=None):
+        values = [await self.local.get(key, _MISSING) for key in keys]
+        missing = [key for key, value in zip(keys, values) if value is _MISSING]
+        if missing:
+            marker = self._start_read(missing)
+            # the remaining TTLs are not read in batch, so cache for local_ttl
+            fetched = dict(zip(missing, await self.storage.get_many(missing)))
+            for key, value in fetched.items():
+                if self._finish_read(key, marker) and value is not None:
+                    await self.local.set(key, value, self.local_ttl)
+            values = [fetched[key] if value is _MISSING else value for key, value in zip(keys, values)]
+        return [default if value is None else value for value in values]
+
+    async def set_many(self, mapping, ttl=None):
+        await self.storage.set_many(mapping, ttl)
+        for key, value in mapping.items():
+            self._reads.pop(key, None)
+            await self.local.set(key, value, self._local_ttl(ttl))
+        await self._publish(*mapping)
+
+    async def delete_many(self, keys):
+        await self.storage.delete_many(keys)
+        await self._forget(keys)
+        await self._publish(*keys)
+
+    async def discard_local(self, keys):
+        await self._forget(keys)
+
+    async def acquire_lease(self, key, ttl):
+        return await self.storage.acquire_lease(key, ttl)
+
+    async def release_lease(self, key, lease):
+        await self.storage.release_lease(key, lease)
+
+    async def _publish(self, *keys):
+        if self.redis is not None and keys:
+            await self.redis.publish(self.channel, json.dumps([self.node_id, *keys]))
+
+    async def _invalidate(self, message):
+        node_id, *keys = json.loads(to_text(message))
+        if node_id != self.node_id:
+            await self._forget(keys)
+
+    async def _listen(self):
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # notifications may have been missed while not subscribed
+                    self._reads.clear()
+                    self.local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await self._invalidate(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Lost invalidation channel %s, resubscribe", self.channel, exc_info=True)
+                self._reads.clear()
+                self.local.clear()
+                await asyncio.sleep(1)
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """订阅失效通知，需在事件循环中调用，共享存储不是 RedisStorage 时不做任何操作"""
+        if self.redis is not None and not self.running:
+            self._task = asyncio.ensure_future(self._listen())
+
+    async def stop(self):
+        """取消订阅失效通知"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.transport
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    This module provides a process-wide, pooled HTTP transport shared by
+    every client, OAuth helper and component.
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+def _http2_available():
+    try:
+        import h2  # NOQA
+    except ImportError:
+        return False
+    return True
+
+
+class TransportManager:
+    """
+    HTTP 连接池管理器
+
+    每个上游主机（scheme + host + port）共享一个 ``httpx.AsyncClient`` 连接池，
+    同一进程内的所有客户端默认使用同一个管理器，从而复用 TCP/TLS 连接并限制 socket 数量。
+
+    :param http2: 可选，是否启用 HTTP/2 多路复用，需要安装 ``h2``，默认为 False
+    :param max_connections: 可选，每个主机的最大连接数
+    :param max_keepalive_connections: 可选，每个主机保持的最大空闲连接数
+    :param keepalive_expiry: 可选，空闲连接保持时间，单位秒
+    :param timeout: 可选，默认请求超时时间，可以是秒数或 ``httpx.Timeout``
+    :param client_kwargs: 可选，创建 ``httpx.AsyncClient`` 时的其他参数，如 ``proxy``、``verify``
+    """
+
+    def __init__(
+        self,
+        http2=False,
+        max_connections=DEFAULT_LIMITS.max_connections,
+        max_keepalive_connections=DEFAULT_LIMITS.max_keepalive_connections,
+        keepalive_expiry=DEFAULT_LIMITS.keepalive_expiry,
+        timeout=DEFAULT_TIMEOUT,
+        **client_kwargs,
+    ):
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requires the h2 package, fall back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.client_kwargs = client_kwargs
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _origin(url):
+        url = httpx.URL(url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        return f"{url.scheme}://{url.host}:{port}"
+
+    def get_client(self, url) -> httpx.AsyncClient:
+        """获取 url 所在主机的连接池"""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                **self.client_kwargs,
+            )
+            self._clients[origin] = client
+        return client
+
+    async def request(self, method, url, **kwargs) -> httpx.Response:
+        return await self.get_client(url).request(method=method, url=url, **kwargs)
+
+    async def get(self, url, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """关闭所有连接池，之后的请求会重新建立连接池"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+_default_manager: Optional[TransportManager] = None
+
+
+def get_transport_manager() -> TransportManager:
+    """获取进程内默认的连接池管理器，首次调用时创建"""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = TransportManager()
+    return _default_manager
+
+
+def set_transport_manager(manager: TransportManager):
+    """替换进程内默认的连接池管理器，仅影响之后创建的客户端"""
+    global _default_manager
+    _default_manager = manager
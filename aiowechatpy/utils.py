@@ -11,6 +11,7 @@
 
 import string
 import random
+import asyncio
 import hashlib
 
 
@@ -46,6 +47,38 @@ class WeChatSigner:
         return hashlib.sha1(str_to_sign).hexdigest()
 
 
+class SingleFlight:
+    """Coalesce concurrent calls sharing the same key into one in-flight call
+
+    The first caller of ``do`` for a key starts the call, all other callers
+    with the same key await its result (or exception) instead of starting
+    their own. The key is released as soon as the call finishes.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def _release(self, key, future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # mark the exception as retrieved, waiters may all have gone
+            future.exception()
+
+    def in_flight(self, key):
+        """Whether a call for ``key`` is in progress"""
+        return key in self._calls
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        # a cancelled waiter must not cancel the call shared with others
+        return await asyncio.shield(future)
+
+
 def check_signature(token, signature, timestamp, nonce):
     """Check WeChat callback signature, raises InvalidSignatureException
     if check failed.
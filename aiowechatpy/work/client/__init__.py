@@ -41,10 +41,13 @@ class WeChatClient(BaseWeChatClient):
         session=None,
         timeout=None,
         auto_retry=True,
+        transport=None,
+        rate_limiter=None,
+        retry_policy=None,
     ):
         self.corp_id = corp_id
         self.secret = secret
-        super().__init__(corp_id, session, timeout, auto_retry)
+        super().__init__(corp_id, session, timeout, auto_retry, transport, rate_limiter, retry_policy)
 
     @property
     def access_token_key(self):
@@ -12,7 +12,7 @@ class WeChatJSAPI(BaseWeChatAPI):
     https://work.weixin.qq.com/api/doc#90001/90144/90539
     """
 
-    def get_ticket(self):
+    async def get_ticket(self):
         """
         获取企业的jsapi_ticket
 
@@ -20,7 +20,7 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: 返回的 JSON 数据包
         """
-        return self._get("get_jsapi_ticket")
+        return await self._get("get_jsapi_ticket")
 
     def get_jsapi_signature(self, noncestr, ticket, timestamp, url):
         """
@@ -44,7 +44,7 @@ class WeChatJSAPI(BaseWeChatAPI):
         signer.add_data(*data)
         return signer.signature
 
-    def get_agent_ticket(self):
+    async def get_agent_ticket(self):
         """
         获取应用的jsapi_ticket
 
@@ -52,9 +52,44 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: 返回的 JSON 数据包
         """
-        return self._get("ticket/get", params={"type": "agent_config"})
+        return await self._get("ticket/get", params={"type": "agent_config"})
 
-    def get_jsapi_ticket(self):
+    async def get_ticket_expires_at(self, name):
+        """
+        获取 session 中缓存的 ticket 过期时间
+
+        :param name: ticket 名称，``jsapi`` 或 ``agent_jsapi``
+        :return: 过期时间戳，未缓存时返回 0
+        """
+        return await self.session.get(f"{self._client.corp_id}_{name}_ticket_expires_at") or 0
+
+    async def refresh_ticket(self, name):
+        """
+        重新获取 ticket 并缓存到 session 中
+
+        :param name: ticket 名称，``jsapi`` 或 ``agent_jsapi``
+        :return: ticket
+        """
+        res = await (self.get_agent_ticket() if name == "agent_jsapi" else self.get_ticket())
+        ticket = res["ticket"]
+        expires_in = int(res["expires_in"])
+        corp_id = self._client.corp_id
+        await self.session.set_many(
+            {f"{corp_id}_{name}_ticket": ticket, f"{corp_id}_{name}_ticket_expires_at": int(time.time()) + expires_in},
+            expires_in,
+        )
+        return ticket
+
+    async def _get_cached_ticket(self, name):
+        corp_id = self._client.corp_id
+        ticket, expires_at = await self.session.get_many(
+            [f"{corp_id}_{name}_ticket", f"{corp_id}_{name}_ticket_expires_at"]
+        )
+        if not ticket or int(expires_at or 0) < int(time.time()):
+            ticket = await self.refresh_ticket(name)
+        return ticket
+
+    async def get_jsapi_ticket(self):
         """
         获取微信 JS-SDK ticket
 
@@ -62,19 +97,9 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: ticket
         """
-        ticket_key = f"{self._client.corp_id}_jsapi_ticket"
-        expires_at_key = f"{self._client.corp_id}_jsapi_ticket_expires_at"
-        ticket = self.session.get(ticket_key)
-        expires_at = self.session.get(expires_at_key) or 0
-        if not ticket or expires_at < int(time.time()):
-            jsapi_ticket = self.get_ticket()
-            ticket = jsapi_ticket["ticket"]
-            expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
-            self.session.set(ticket_key, ticket)
-            self.session.set(expires_at_key, expires_at)
-        return ticket
+        return await self._get_cached_ticket("jsapi")
 
-    def get_agent_jsapi_ticket(self):
+    async def get_agent_jsapi_ticket(self):
         """
         获取应用的jsapi_ticket
 
@@ -82,14 +107,4 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: ticket
         """
-        ticket_key = f"{self._client.corp_id}_agent_jsapi_ticket"
-        expires_at_key = f"{self._client.corp_id}_agent_jsapi_ticket_expires_at"
-        ticket = self.session.get(ticket_key)
-        expires_at = self.session.get(expires_at_key) or 0
-        if not ticket or expires_at < int(time.time()):
-            jsapi_ticket = self.get_agent_ticket()
-            ticket = jsapi_ticket["ticket"]
-            expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
-            self.session.set(ticket_key, ticket)
-            self.session.set(expires_at_key, expires_at)
-        return ticket
+        return await self._get_cached_ticket("agent_jsapi")
@@ -83,4 +83,4 @@ class WeChatMedia(BaseWeChatAPI):
         :param media_id: 媒体文件id
         :return: requests 的 Response 实例
         """
-        return await self._get(await self.get_url(media_id))
+        return await self._get("media/get", params={"media_id": media_id}, binary=True)
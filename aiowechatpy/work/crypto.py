@@ -9,6 +9,12 @@ class PrpCrypto(BasePrpCrypto):
     def decrypt(self, text, corp_id):
         return self._decrypt(text, corp_id, InvalidCorpIdException)
 
+    def decrypt_bytes(self, text, corp_id):
+        return self._decrypt_bytes(text, corp_id, InvalidCorpIdException)
+
+    def decrypt_many_bytes(self, texts, corp_id):
+        return self._decrypt_many_bytes(texts, corp_id, InvalidCorpIdException)
+
 
 class WeChatCrypto(BaseWeChatCrypto):
     def __init__(self, token, encoding_aes_key, corp_id):
@@ -21,5 +27,71 @@ class WeChatCrypto(BaseWeChatCrypto):
     def encrypt_message(self, msg, nonce, timestamp=None):
         return self._encrypt_message(msg, nonce, timestamp, PrpCrypto)
 
+    def encrypt_message_bytes(self, msg, nonce, timestamp=None):
+        """
+        加密回复并返回加密后 XML 的 bytes，可以直接作为响应内容
+
+        与 ``encrypt_message`` 的结果相同，但从回复到加密后的 XML 都使用 bytes，不经过中间的字符串。
+
+        :param msg: 回复对象或回复的 XML
+        :param nonce: 随机数
+        :param timestamp: 可选，时间戳，默认为当前时间
+        :return: 加密后的 XML bytes
+        """
+        return self._encrypt_message_bytes(msg, nonce, timestamp, PrpCrypto)
+
     def decrypt_message(self, msg, signature, timestamp, nonce):
         return self._decrypt_message(msg, signature, timestamp, nonce, PrpCrypto)
+
+    def decrypt_message_bytes(self, msg, signature, timestamp, nonce):
+        """
+        解密消息并返回解密后 XML 的 bytes，可以直接交给 ``parse_message`` 解析
+
+        与 ``decrypt_message`` 的结果相同，但不解码为字符串。
+
+        :param msg: 加密的 XML 消息
+        :param signature: 消息签名 msg_signature
+        :param timestamp: 时间戳
+        :param nonce: 随机数
+        :return: 解密后的 XML bytes
+        """
+        return self._decrypt_message_bytes(msg, signature, timestamp, nonce, PrpCrypto)
+
+    def encrypt_many(self, msgs, nonce, timestamp=None):
+        """
+        批量加密回复，结果与逐个调用 ``encrypt_message`` 相同
+
+        :param msgs: 回复对象或回复 XML 的列表
+        :param nonce: 随机数
+        :param timestamp: 可选，时间戳，默认为当前时间
+        :return: 加密后 XML 的列表
+        """
+        return self._encrypt_many(msgs, nonce, timestamp, PrpCrypto)
+
+    def decrypt_many(self, messages):
+        """
+        批量解密消息，结果与逐个调用 ``decrypt_message`` 相同
+
+        先逐个校验签名，再一次解密全部消息，适合处理积压或存档的加密消息。
+
+        :param messages: ``(msg, signature, timestamp, nonce)`` 的列表
+        :return: 解密后 XML 的列表
+        """
+        return self._decrypt_many(messages, PrpCrypto)
+
+    def parse_message(self, msg, signature, timestamp, nonce):
+        """
+        解密并解析企业微信推送的加密消息
+
+        等同于 ``parse_message(crypto.decrypt_message(...))``，但只从外层 XML 中查找 Encrypt，
+        解密得到的 bytes 直接解析，不经过中间的字符串。
+
+        :param msg: 加密的 XML 消息
+        :param signature: 消息签名 msg_signature
+        :param timestamp: 时间戳
+        :param nonce: 随机数
+        :return: 对应的消息或事件
+        """
+        from aiowechatpy.work.parser import parse_message
+
+        return parse_message(self.decrypt_message_bytes(msg, signature, timestamp, nonce))
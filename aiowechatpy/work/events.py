@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
+from aiowechatpy.dispatch import Registry
 from aiowechatpy.fields import BaseField, FloatField, IntegerField, StringField
 from aiowechatpy.messages import BaseMessage
 
-EVENT_TYPES = {}
+EVENT_TYPES = Registry()
 
 
 class BaseEvent(BaseMessage):
     """Base class for Wechat Work events"""
 
+    __slots__ = ()
     type = "event"
     event = ""
 
@@ -26,6 +28,7 @@ class SubscribeEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E6%88%90%E5%91%98%E5%85%B3%E6%B3%A8%E5%8F%8A%E5%8F%96%E6%B6%88%E5%85%B3%E6%B3%A8%E4%BA%8B%E4%BB%B6
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     key = StringField("EventKey", "")
     event = "subscribe"
@@ -39,6 +42,7 @@ class UnsubscribeEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E6%88%90%E5%91%98%E5%85%B3%E6%B3%A8%E5%8F%8A%E5%8F%96%E6%B6%88%E5%85%B3%E6%B3%A8%E4%BA%8B%E4%BB%B6
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "unsubscribe"
 
@@ -51,6 +55,7 @@ class ClickEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E7%82%B9%E5%87%BB%E8%8F%9C%E5%8D%95%E6%8B%89%E5%8F%96%E6%B6%88%E6%81%AF%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     key = StringField("EventKey")
     event = "click"
@@ -64,6 +69,7 @@ class ViewEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E7%82%B9%E5%87%BB%E8%8F%9C%E5%8D%95%E8%B7%B3%E8%BD%AC%E9%93%BE%E6%8E%A5%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     url = StringField("EventKey")
     event = "view"
@@ -77,6 +83,7 @@ class LocationEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E4%B8%8A%E6%8A%A5%E5%9C%B0%E7%90%86%E4%BD%8D%E7%BD%AE
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     latitude = FloatField("Latitude", 0.0)
     longitude = FloatField("Longitude", 0.0)
@@ -85,6 +92,7 @@ class LocationEvent(BaseEvent):
 
 
 class BaseScanCodeEvent(BaseEvent):
+    __slots__ = ()
     key = StringField("EventKey")
     scan_code_info = BaseField("ScanCodeInfo", {})
 
@@ -105,6 +113,7 @@ class ScanCodePushEvent(BaseScanCodeEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E6%89%AB%E7%A0%81%E6%8E%A8%E4%BA%8B%E4%BB%B6%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "scancode_push"
 
@@ -117,11 +126,13 @@ class ScanCodeWaitMsgEvent(BaseScanCodeEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E6%89%AB%E7%A0%81%E6%8E%A8%E4%BA%8B%E4%BB%B6%E4%B8%94%E5%BC%B9%E5%87%BA%E2%80%9C%E6%B6%88%E6%81%AF%E6%8E%A5%E6%94%B6%E4%B8%AD%E2%80%9D%E6%8F%90%E7%A4%BA%E6%A1%86%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "scancode_waitmsg"
 
 
 class BasePictureEvent(BaseEvent):
+    __slots__ = ()
     key = StringField("EventKey")
     pictures_info = BaseField("SendPicsInfo", {})
 
@@ -147,6 +158,7 @@ class PicSysPhotoEvent(BasePictureEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E5%BC%B9%E5%87%BA%E7%B3%BB%E7%BB%9F%E6%8B%8D%E7%85%A7%E5%8F%91%E5%9B%BE%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "pic_sysphoto"
 
@@ -159,6 +171,7 @@ class PicPhotoOrAlbumEvent(BasePictureEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E5%BC%B9%E5%87%BA%E6%8B%8D%E7%85%A7%E6%88%96%E8%80%85%E7%9B%B8%E5%86%8C%E5%8F%91%E5%9B%BE%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "pic_photo_or_album"
 
@@ -171,6 +184,7 @@ class PicWeChatEvent(BasePictureEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E5%BC%B9%E5%87%BA%E5%BE%AE%E4%BF%A1%E7%9B%B8%E5%86%8C%E5%8F%91%E5%9B%BE%E5%99%A8%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "pic_weixin"
 
@@ -183,6 +197,7 @@ class LocationSelectEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E5%BC%B9%E5%87%BA%E5%9C%B0%E7%90%86%E4%BD%8D%E7%BD%AE%E9%80%89%E6%8B%A9%E5%99%A8%E7%9A%84%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     key = StringField("EventKey")
     location_info = BaseField("SendLocationInfo", {})
     agent = IntegerField("AgentID", 0)
@@ -221,6 +236,7 @@ class EnterAgentEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E8%BF%9B%E5%85%A5%E5%BA%94%E7%94%A8
     """
 
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     event = "enter_agent"
 
@@ -233,6 +249,7 @@ class BatchJobResultEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E5%BC%82%E6%AD%A5%E4%BB%BB%E5%8A%A1%E5%AE%8C%E6%88%90%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     event = "batch_job_result"
     batch_job = BaseField("BatchJob")
 
@@ -261,6 +278,7 @@ class OpenApprovalChangeEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E5%AE%A1%E6%89%B9%E7%8A%B6%E6%80%81%E9%80%9A%E7%9F%A5%E4%BA%8B%E4%BB%B6
     """
 
+    __slots__ = ()
     event = "open_approval_change"
     agent = IntegerField("AgentID", 0)
     approval_info = BaseField("ApprovalInfo")
@@ -322,6 +340,7 @@ class TaskCardClickEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/90240#%E4%BB%BB%E5%8A%A1%E5%8D%A1%E7%89%87%E4%BA%8B%E4%BB%B6%E6%8E%A8%E9%80%81
     """
 
+    __slots__ = ()
     event = "taskcard_click"
     event_key = StringField("EventKey")
     agent = IntegerField("AgentID", 0)
@@ -336,6 +355,7 @@ class ChangeExternalContactEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/92130#%E6%B7%BB%E5%8A%A0%E5%A4%96%E9%83%A8%E8%81%94%E7%B3%BB%E4%BA%BA%E4%BA%8B%E4%BB%B6
     """
 
+    __slots__ = ()
     event = "change_external_contact"
     change_type = StringField("ChangeType")
     welcome_code = StringField("WelcomeCode")
@@ -354,6 +374,7 @@ class ChangeExternalChatEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/92130#%E6%B7%BB%E5%8A%A0%E5%A4%96%E9%83%A8%E8%81%94%E7%B3%BB%E4%BA%BA%E4%BA%8B%E4%BB%B6
     """
 
+    __slots__ = ()
     event = "change_external_chat"
     change_type = StringField("ChangeType")
     update_detail = StringField("UpdateDetail")
@@ -372,6 +393,7 @@ class ChangeExternalTagEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/92130#%E6%B7%BB%E5%8A%A0%E5%A4%96%E9%83%A8%E8%81%94%E7%B3%BB%E4%BA%BA%E4%BA%8B%E4%BB%B6
     """
 
+    __slots__ = ()
     event = "change_external_tag"
     change_type = StringField("ChangeType")
 
@@ -387,6 +409,7 @@ class SysApprovalChangeEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/91815
     """
 
+    __slots__ = ()
     event = "sys_approval_change"
     agent = IntegerField("AgentID", 0)
     approval_info = BaseField("ApprovalInfo")
@@ -444,6 +467,7 @@ class KFMsgOrEventEvent(BaseEvent):
     https://work.weixin.qq.com/api/doc/90000/90135/94670
     """
 
+    __slots__ = ()
     event = "kf_msg_or_event"
     token = StringField("Token")
 
@@ -456,6 +480,7 @@ class ModifyCalendarEvent(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/93651
     """
 
+    __slots__ = ()
     event = "modify_calendar"
     calendar_id = StringField("CalId")
 
@@ -468,6 +493,7 @@ class DeleteCalendarEvent(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/93651
     """
 
+    __slots__ = ()
     event = "delete_calendar"
     calendar_id = StringField("CalId")
 
@@ -480,6 +506,7 @@ class AddScheduleEvent(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/93651
     """
 
+    __slots__ = ()
     event = "add_schedule"
     calendar_id = StringField("CalId")
     schedule_id = StringField("ScheduleId")
@@ -493,6 +520,7 @@ class ModifyScheduleEvent(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/93651
     """
 
+    __slots__ = ()
     event = "modify_schedule"
     calendar_id = StringField("CalId")
     schedule_id = StringField("ScheduleId")
@@ -506,6 +534,7 @@ class DeleteScheduleEvent(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/93651
     """
 
+    __slots__ = ()
     event = "delete_schedule"
     calendar_id = StringField("CalId")
     schedule_id = StringField("ScheduleId")
@@ -519,6 +548,7 @@ class ExportEvent(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/94946
     """
 
+    __slots__ = ()
     event = "batch_job_result"
     batch_job = BaseField("BatchJob")
 
@@ -537,6 +567,7 @@ class BookMeetingRoom(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/95333
     """
 
+    __slots__ = ()
     event = "book_meeting_room"
     meeting_room_id = IntegerField("MeetingRoomId")
     meeting_id = StringField("MeetingId")
@@ -548,6 +579,7 @@ class CancelMeetingRoom(BaseEvent):
     https://developer.work.weixin.qq.com/document/path/95333
     """
 
+    __slots__ = ()
     event = "cancel_meeting_room"
     meeting_room_id = IntegerField("MeetingRoomId")
     meeting_id = StringField("MeetingId")
@@ -2,9 +2,10 @@
 
 
 from aiowechatpy import messages
+from aiowechatpy.dispatch import Registry
 from aiowechatpy.fields import IntegerField, StringField
 
-MESSAGE_TYPES = {}
+MESSAGE_TYPES = Registry()
 
 
 def register_message(msg_type):
@@ -17,35 +18,42 @@ def register_message(msg_type):
 
 @register_message("text")
 class TextMessage(messages.TextMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
 
 
 @register_message("image")
 class ImageMessage(messages.ImageMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
 
 
 @register_message("voice")
 class VoiceMessage(messages.VoiceMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
 
 
 @register_message("shortvideo")
 class ShortVideoMessage(messages.ShortVideoMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
 
 
 @register_message("video")
 class VideoMessage(messages.VideoMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
 
 
 @register_message("location")
 class LocationMessage(messages.LocationMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
 
 
 @register_message("link")
 class LinkMessage(messages.LinkMessage):
+    __slots__ = ()
     agent = IntegerField("AgentID", 0)
     pic_url = StringField("PicUrl")
@@ -1,6 +1,4 @@
 # -*- coding: utf-8 -*-
-import json
-import time
 import logging
 import httpx
 
@@ -17,6 +15,7 @@ class WeChatServiceClient(BaseWeChatClient):
     """
 
     API_BASE_URL = "https://qyapi.weixin.qq.com/cgi-bin/"
+    ACCESS_TOKEN_PARAM = "suite_access_token"
 
     auth = api.WeChatAuth()
     miniprogram = api.WeChatMiniProgram()
@@ -30,12 +29,15 @@ class WeChatServiceClient(BaseWeChatClient):
         session=None,
         timeout=None,
         auto_retry=True,
+        transport=None,
+        rate_limiter=None,
+        retry_policy=None,
     ):
         self.corp_id = corp_id
         self.suite_id = suite_id
         self.suite_secret = suite_secret
         self.suite_ticket = suite_ticket
-        super().__init__(corp_id, session, timeout, auto_retry)
+        super().__init__(corp_id, session, timeout, auto_retry, transport, rate_limiter, retry_policy)
 
     @property
     def access_token_key(self):
@@ -68,42 +70,9 @@ class WeChatServiceClient(BaseWeChatClient):
         expires_in = 7200
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        await self.session.set(self.access_token_key, result["suite_access_token"], expires_in)
-        self.expires_at = int(time.time()) + expires_in
+        await self._store_access_token(result["suite_access_token"], expires_in)
         return result
 
-    async def _request(self, method, url_or_endpoint, **kwargs):
-        if not url_or_endpoint.startswith(("http://", "https://")):
-            api_base_url = kwargs.pop("api_base_url", self.API_BASE_URL)
-            url = f"{api_base_url}{url_or_endpoint}"
-        else:
-            url = url_or_endpoint
-
-        if "params" not in kwargs:
-            kwargs["params"] = {}
-        if isinstance(kwargs["params"], dict) and "suite_access_token" not in kwargs["params"]:
-            kwargs["params"]["suite_access_token"] = self.access_token
-        if isinstance(kwargs.get("data", ""), dict):
-            body = json.dumps(kwargs["data"], ensure_ascii=False)
-            body = body.encode("utf-8")
-            kwargs["data"] = body
-
-        kwargs["timeout"] = kwargs.get("timeout", self.timeout)
-        result_processor = kwargs.pop("result_processor", None)
-        res = await self._http.request(method=method, url=url, **kwargs)
-        try:
-            res.raise_for_status()
-        except httpx.HTTPError as reqe:
-            raise WeChatClientException(
-                errcode=None,
-                errmsg=None,
-                client=self,
-                request=reqe.request,
-                response=res,
-            )
-
-        return self._handle_result(res, method, url, result_processor, **kwargs)
-
     async def fetch_access_token(self):
         """Fetch access token"""
         return await self._fetch_access_token(
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+    aiowechatpy.xmlparser
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    This module provides a fast parser for the XML pushed by WeChat
+    server, falling back to xmltodict for documents it does not handle.
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import re
+from xml.parsers import expat
+
+import xmltodict
+
+from aiowechatpy.utils import to_text
+
+# a leaf element holding one CDATA section or plain text without entities
+_LEAF = r"<(?P<tag>[A-Za-z_][\w.-]*)>(?:<!\[CDATA\[([^\]]*(?:\](?!\]>)[^\]]*)*)\]\]>|([^<&]*))</(?P=tag)>"
+_LEAF_RE = re.compile(_LEAF)
+# a document whose root only holds leaf elements, as most messages and events
+_FLAT_RE = re.compile(
+    r"\s*(?:<\?xml[^>]*\?>\s*)?<(?P<root>[A-Za-z_][\w.-]*)>((?:\s*%s)*)\s*</(?P=root)>\s*"
+    % _LEAF.replace("tag", "leaf")
+)
+
+
+class _Unsupported(Exception):
+    """Raised for XML features left to xmltodict"""
+
+
+def _reject_doctype(*args):
+    raise ValueError("DOCTYPE and ENTITY declarations are not allowed")
+
+
+def _parse_flat(xml):
+    match = _FLAT_RE.fullmatch(xml)
+    if match is None:
+        return None
+    root, body = match.group("root", 2)
+    data = {}
+    for tag, cdata, text in _LEAF_RE.findall(body):
+        if "]]>" in text:
+            # not allowed in character data, leave the error to expat
+            return None
+        value = (cdata or text).strip() or None
+        if tag not in data:
+            data[tag] = value
+        elif isinstance(data[tag], list):
+            data[tag].append(value)
+        else:
+            data[tag] = [data[tag], value]
+    return {root: data or None}
+
+
+def _parse(xml):
+    # children of the open elements, None until the first child is seen
+    children = [None]
+    texts = [[]]
+
+    def start(name, attrs):
+        if attrs:
+            raise _Unsupported()
+        children.append(None)
+        texts.append([])
+
+    def end(name):
+        text = "".join(texts.pop()).strip() or None
+        value = children.pop()
+        if value is None:
+            value = text
+        elif text is not None:
+            value["#text"] = text
+        parent = children[-1]
+        if parent is None:
+            parent = children[-1] = {}
+        if name not in parent:
+            parent[name] = value
+        elif isinstance(parent[name], list):
+            parent[name].append(value)
+        else:
+            parent[name] = [parent[name], value]
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = lambda data: texts[-1].append(data)
+    # WeChat never sends a DTD, refuse entity expansion attacks up front
+    parser.StartDoctypeDeclHandler = _reject_doctype
+    parser.EntityDeclHandler = _reject_doctype
+    parser.DefaultHandler = lambda data: None
+    parser.ExternalEntityRefHandler = lambda *args: 1
+    parser.Parse(xml, True)
+    return children[0]
+
+
+def parse_xml(xml):
+    """
+    解析微信服务器推送的 XML
+
+    结果与 ``xmltodict.parse(xml)`` 一致：文本节点去除首尾空白，空节点为 None，
+    嵌套节点为字典，同名节点为列表。只有一层节点的消息用正则表达式直接解析，
+    嵌套的消息用 expat 解析，带属性的 XML 交给 xmltodict 解析。
+
+    包含 DOCTYPE 或 ENTITY 声明的 XML 抛出 ValueError，格式错误的 XML 抛出 ``ExpatError``。
+
+    :param xml: XML 字符串或 bytes
+    :return: 字典
+    """
+    xml = to_text(xml)
+    result = _parse_flat(xml)
+    if result is not None:
+        return result
+    try:
+        return _parse(xml)
+    except _Unsupported:
+        return xmltodict.parse(xml)
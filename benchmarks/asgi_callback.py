@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of the ASGI callback application on encrypted text messages,
+calling the application in process, without an HTTP server.
+
+    PYTHONPATH=. python benchmarks/asgi_callback.py [requests]
+"""
+
+import asyncio
+import sys
+import time
+from urllib.parse import urlencode
+
+import xmltodict
+
+from aiowechatpy import MessageRouter
+from aiowechatpy.asgi import WeChatCallbackApp
+from aiowechatpy.crypto import WeChatCrypto
+from aiowechatpy.utils import WeChatSigner
+
+TOKEN = "123456"
+ENCODING_AES_KEY = "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR"
+APP_ID = "wx49f0ab532d5d035a"
+
+TEXT = """<xml>
+<ToUserName><![CDATA[gh_7f083739789a]]></ToUserName>
+<FromUserName><![CDATA[oia2TjuEGTNoeX76QEjQNrcURxG8]]></FromUserName>
+<CreateTime>1411525903</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[查询订单 20231108000001]]></Content>
+<MsgId>1234567890123456</MsgId>
+</xml>"""
+
+
+def request():
+    timestamp, nonce = "1411525903", "461056294"
+    signer = WeChatSigner()
+    signer.add_data(TOKEN, timestamp, nonce)
+    envelope = WeChatCrypto(TOKEN, ENCODING_AES_KEY, APP_ID).encrypt_message(TEXT, nonce, timestamp)
+    params = {
+        "signature": signer.signature,
+        "timestamp": timestamp,
+        "nonce": nonce,
+        "encrypt_type": "aes",
+        "msg_signature": xmltodict.parse(envelope)["xml"]["MsgSignature"],
+    }
+    scope = {"type": "http", "method": "POST", "query_string": urlencode(params).encode()}
+    return scope, {"type": "http.request", "body": envelope.encode(), "more_body": False}
+
+
+async def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    router = MessageRouter()
+
+    @router.message("text")
+    async def echo(message):
+        return message.content
+
+    app = WeChatCallbackApp(router, TOKEN, ENCODING_AES_KEY, APP_ID)
+    scope, body = request()
+
+    async def receive():
+        return body
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    start = time.perf_counter()
+    for _ in range(number):
+        await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    print(f"{number / elapsed:.0f} requests/s, {elapsed / number * 1e6:.1f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Construction cost of clients, as when a component creates one client
+per authorizer.
+
+    PYTHONPATH=. python benchmarks/client_construction.py [count]
+
+"eager" binds every API group right after construction, which is what
+creating a client used to cost.
+"""
+import sys
+import time
+
+from aiowechatpy import WeChatClient
+from aiowechatpy.client.api.base import BaseWeChatAPI
+from aiowechatpy.session.memorystorage import MemoryStorage
+
+API_NAMES = [name for name, value in vars(WeChatClient).items() if isinstance(value, BaseWeChatAPI)]
+
+
+def construct(count, session):
+    return [WeChatClient(f"appid{i}", "secret", session=session) for i in range(count)]
+
+
+def construct_and_use(count, session):
+    clients = construct(count, session)
+    for client in clients:
+        client.message
+    return clients
+
+
+def construct_eager(count, session):
+    clients = construct(count, session)
+    for client in clients:
+        for name in API_NAMES:
+            getattr(client, name)
+    return clients
+
+
+def bench(name, func, count):
+    session = MemoryStorage()
+    start = time.perf_counter()
+    func(count, session)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20}{count} clients in {elapsed * 1000:8.1f} ms, {elapsed / count * 1e6:6.2f} us/client")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    bench("lazy", construct, count)
+    bench("lazy + 1 API group", construct_and_use, count)
+    bench(f"eager ({len(API_NAMES)} groups)", construct_eager, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Encrypting and decrypting 10k callback messages: one at a time with a new
+PrpCrypto (and cipher) and WeChatSigner per call as before, one at a time with
+the cipher kept by WeChatCrypto, and in one batch with encrypt_many and
+decrypt_many. The legacy encryption still uses the current BasePrpCrypto.
+
+    PYTHONPATH=. python benchmarks/crypto_batch.py [messages]
+"""
+
+import sys
+import time
+
+import xmltodict
+
+from aiowechatpy.crypto import PrpCrypto, RefundCrypto, WeChatCrypto, WeChatRefundCrypto
+from aiowechatpy.utils import WeChatSigner, to_text
+
+TOKEN = "123456"
+ENCODING_AES_KEY = "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR"
+APP_ID = "wx49f0ab532d5d035a"
+NONCE = "461056294"
+TIMESTAMP = "1411525903"
+
+TEXT = """<xml>
+<ToUserName><![CDATA[gh_7f083739789a]]></ToUserName>
+<FromUserName><![CDATA[oia2TjuEGTNoeX76QEjQNrcURxG8]]></FromUserName>
+<CreateTime>1411525903</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[查询订单 {}]]></Content>
+<MsgId>{}</MsgId>
+</xml>"""
+
+LEGACY_ENVELOPE = """<xml>
+<Encrypt><![CDATA[{encrypt}]]></Encrypt>
+<MsgSignature><![CDATA[{signature}]]></MsgSignature>
+<TimeStamp>{timestamp}</TimeStamp>
+<Nonce><![CDATA[{nonce}]]></Nonce>
+</xml>"""
+
+
+def legacy_signature(*args):
+    signer = WeChatSigner()
+    signer.add_data(*args)
+    return signer.signature
+
+
+def legacy_encrypt(crypto, msg):
+    # encrypt_message before the cipher was kept, a PrpCrypto per message
+    encrypt = to_text(PrpCrypto(crypto.key).encrypt(msg, APP_ID))
+    signature = legacy_signature(TOKEN, TIMESTAMP, NONCE, encrypt)
+    return LEGACY_ENVELOPE.format(encrypt=encrypt, signature=signature, timestamp=TIMESTAMP, nonce=NONCE)
+
+
+def legacy_decrypt(crypto, msg, signature, timestamp, nonce):
+    encrypt = crypto.get_encrypt(msg)
+    if legacy_signature(TOKEN, timestamp, nonce, encrypt) != signature:
+        raise ValueError()
+    return PrpCrypto(crypto.key).decrypt(encrypt, APP_ID)
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def report(name, seconds, number):
+    print(f"    {name:<36}{seconds * 1000:8.1f} ms    {seconds / number * 1e6:6.2f} us/msg")
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    crypto = WeChatCrypto(TOKEN, ENCODING_AES_KEY, APP_ID)
+    messages = [TEXT.format(20231108000000 + i, 1234567890123456 + i) for i in range(number)]
+    print(f"{number} messages")
+
+    print("encrypt")
+    _, seconds = timed(lambda: [legacy_encrypt(crypto, msg) for msg in messages])
+    report("new PrpCrypto per message", seconds, number)
+    _, seconds = timed(lambda: [crypto.encrypt_message(msg, NONCE, TIMESTAMP) for msg in messages])
+    report("encrypt_message", seconds, number)
+    encrypted, seconds = timed(lambda: crypto.encrypt_many(messages, NONCE, TIMESTAMP))
+    report("encrypt_many", seconds, number)
+
+    signed = [(xml, xmltodict.parse(xml)["xml"]["MsgSignature"], TIMESTAMP, NONCE) for xml in encrypted]
+
+    print("decrypt")
+    legacy, seconds = timed(lambda: [legacy_decrypt(crypto, *args) for args in signed])
+    report("new PrpCrypto per message", seconds, number)
+    one_by_one, seconds = timed(lambda: [crypto.decrypt_message(*args) for args in signed])
+    report("decrypt_message", seconds, number)
+    batch, seconds = timed(lambda: crypto.decrypt_many(signed))
+    report("decrypt_many", seconds, number)
+    assert legacy == one_by_one == batch == messages
+
+    print("refund notify")
+    api_key = "OF4Ne3znh8KqL0V4NqmALQa0uXMYKcEk"
+    refund = WeChatRefundCrypto(api_key)
+    req_infos = RefundCrypto(refund.key).encrypt_many(
+        [f"<root><out_refund_no>{i}</out_refund_no></root>" for i in range(number)]
+    )
+    notifies = [{"appid": APP_ID, "mch_id": "12345678", "req_info": req_info} for req_info in req_infos]
+    _, seconds = timed(lambda: [WeChatRefundCrypto(api_key).decrypt_message(n, APP_ID, "12345678") for n in notifies])
+    report("new WeChatRefundCrypto per notify", seconds, number)
+    _, seconds = timed(lambda: [refund.decrypt_message(n, APP_ID, "12345678") for n in notifies])
+    report("decrypt_message", seconds, number)
+    _, seconds = timed(lambda: refund.decrypt_many(notifies, APP_ID, "12345678"))
+    report("decrypt_many", seconds, number)
+
+
+if __name__ == "__main__":
+    main()
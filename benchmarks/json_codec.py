@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Encoding and decoding cost of typical API payloads with each JSON codec.
+
+    PYTHONPATH=. python benchmarks/json_codec.py [iterations]
+"""
+import sys
+import timeit
+
+from aiowechatpy.codec import JSONCodec, OrjsonCodec, orjson
+
+# message/template/send request
+TEMPLATE_MESSAGE = {
+    "touser": "oLVPpjqs9BhvzwPj5A-vTYAX3GLc",
+    "template_id": "ngqIpbwh8bUfcSsECmogfXcV14J0tQlEpBO27izEYtY",
+    "url": "https://example.com/orders/20231108000001",
+    "miniprogram": {"appid": "wx1234567890abcdef", "pagepath": "pages/order/detail?id=20231108000001"},
+    "data": {
+        "first": {"value": "您好，您的订单已发货", "color": "#173177"},
+        "keyword1": {"value": "20231108000001", "color": "#173177"},
+        "keyword2": {"value": "顺丰速运 SF1234567890", "color": "#173177"},
+        "keyword3": {"value": "2023年11月08日 18:30", "color": "#173177"},
+        "remark": {"value": "点击查看物流详情，如有疑问请联系客服。", "color": "#173177"},
+    },
+}
+
+# user/info/batchget response for 100 users
+USER_BATCH = {
+    "user_info_list": [
+        {
+            "subscribe": 1,
+            "openid": f"otvxTs4dckWG7imySrJd6jSi0CW{i:03d}",
+            "language": "zh_CN",
+            "subscribe_time": 1434093047,
+            "unionid": f"oR5GjjgEhCMJFyzaVZdrxZ2zR{i:03d}",
+            "remark": "",
+            "groupid": 0,
+            "tagid_list": [128, 2],
+            "subscribe_scene": "ADD_SCENE_QR_CODE",
+            "qr_scene": 98765,
+            "qr_scene_str": "",
+        }
+        for i in range(100)
+    ]
+}
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    codecs = [("json", JSONCodec())]
+    if orjson is not None:
+        codecs.append(("orjson", OrjsonCodec()))
+    else:
+        print("orjson is not installed, only json is measured")
+
+    for name, payload in (("template message", TEMPLATE_MESSAGE), ("user batch (100)", USER_BATCH)):
+        body = JSONCodec().dumps(payload)
+        print(f"{name}, {len(body)} bytes")
+        for codec_name, codec in codecs:
+            dumps = timeit.timeit(lambda: codec.dumps(payload), number=number) / number * 1e6
+            loads = timeit.timeit(lambda: codec.loads(body), number=number) / number * 1e6
+            print(f"    {codec_name:<8}dumps {dumps:8.2f} us    loads {loads:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Cost of handler code reading message fields many times, with and without
+the per-message cache of converted field values.
+
+    PYTHONPATH=. python benchmarks/message_fields.py [iterations]
+"""
+
+import sys
+import timeit
+
+from aiowechatpy.events import ScanCodePushEvent
+from aiowechatpy.messages import TextMessage
+
+TEXT = {
+    "ToUserName": "gh_7f083739789a",
+    "FromUserName": "oia2TjuEGTNoeX76QEjQNrcURxG8",
+    "CreateTime": "1348831860",
+    "MsgType": "text",
+    "Content": "查询订单 20231108000001",
+    "MsgId": "1234567890123456",
+}
+
+SCAN = {
+    "ToUserName": "gh_7f083739789a",
+    "FromUserName": "oia2TjuEGTNoeX76QEjQNrcURxG8",
+    "CreateTime": "1408090502",
+    "MsgType": "event",
+    "Event": "scancode_push",
+    "EventKey": "6",
+    "ScanCodeInfo": {"ScanType": "qrcode", "ScanResult": "1"},
+}
+
+
+def handle_text(msg):
+    # logging, deduplication, routing and reply, as a typical handler does
+    key = f"{msg.source}:{msg.id}"
+    if msg.content.startswith("查询"):
+        text = f"{msg.create_time.date()} {msg.content[2:]}"
+    else:
+        text = msg.content
+    return key, text, msg.source, msg.target, msg.time, msg.create_time.hour
+
+
+def handle_scan(msg):
+    return msg.source, msg.key, msg.scan_type, msg.scan_result, msg.scan_code_info, msg.create_time, msg.target
+
+
+def run(message_class, data, handler, cached):
+    msg = message_class(dict(data))
+    if not cached:
+        msg._cache = None
+    return handler(msg)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for name, message_class, data, handler in (
+        ("text message", TextMessage, TEXT, handle_text),
+        ("scancode event", ScanCodePushEvent, SCAN, handle_scan),
+    ):
+        print(name)
+        for label, cached in (("uncached", False), ("cached", True)):
+            seconds = timeit.timeit(lambda: run(message_class, data, handler, cached), number=number)
+            print(f"    {label:<10}{seconds / number * 1e6:8.2f} us/msg")
+
+
+if __name__ == "__main__":
+    main()
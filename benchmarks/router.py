@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Routing cost with hundreds of registered routes, compared with checking the
+routes one by one as an if/elif chain over msg.type/msg.event does.
+
+    PYTHONPATH=. python benchmarks/router.py [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from aiowechatpy import MessageRouter
+from aiowechatpy.events import ClickEvent, SubscribeEvent, ViewEvent
+from aiowechatpy.messages import TextMessage
+
+ROUTES = 500
+
+
+def build():
+    router = MessageRouter()
+    chain = []
+
+    def handler(message):
+        return "ok"
+
+    for i in range(ROUTES // 2):
+        router.add_handler(handler, "event", "click", key=f"menu_{i}")
+        chain.append((lambda m, k=f"menu_{i}": m.type == "event" and m.event == "click" and m.key == k, handler))
+    for i in range(ROUTES // 2):
+        router.add_handler(handler, "event", "view", key_prefix=f"https://example.com/{i}/")
+        prefix = f"https://example.com/{i}/"
+        chain.append((lambda m, p=prefix: m.type == "event" and m.event == "view" and m.url.startswith(p), handler))
+    router.add_handler(handler, "event", "subscribe")
+    chain.append((lambda m: m.type == "event" and m.event == "subscribe", handler))
+    router.add_handler(handler, "text")
+    chain.append((lambda m: m.type == "text", handler))
+    return router, chain
+
+
+def messages():
+    last = ROUTES // 2 - 1
+    return [
+        ClickEvent({"Event": "CLICK", "EventKey": f"menu_{last}"}),
+        ViewEvent({"Event": "VIEW", "EventKey": f"https://example.com/{last}/page?a=1"}),
+        SubscribeEvent({"Event": "subscribe"}),
+        TextMessage({"Content": "hello"}),
+    ]
+
+
+def chain_resolve(chain, message):
+    for matches, handler in chain:
+        if matches(message):
+            return handler
+
+
+async def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    router, chain = build()
+    print(f"{ROUTES + 2} routes")
+    for message in messages():
+        # warm the field caches, only routing is measured
+        router.resolve(message)
+        name = f"{message.type} {getattr(message, 'event', '')}".strip()
+        start = time.perf_counter()
+        for _ in range(number):
+            chain_resolve(chain, message)
+        linear = (time.perf_counter() - start) / number * 1e6
+        start = time.perf_counter()
+        for _ in range(number):
+            router.resolve(message)
+        indexed = (time.perf_counter() - start) / number * 1e6
+        print(f"    {name:<16}chain {linear:9.2f} us    router {indexed:6.2f} us")
+
+    message = messages()[0]
+    start = time.perf_counter()
+    for _ in range(number):
+        await router.dispatch(message)
+    print(f"dispatch with reply {(time.perf_counter() - start) / number * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
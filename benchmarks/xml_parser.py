@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of parsing inbound messages, over the XML messages and events
+used in tests/.
+
+    PYTHONPATH=. python benchmarks/xml_parser.py [rounds]
+"""
+
+import ast
+import glob
+import os
+import sys
+import time
+
+import xmltodict
+
+from aiowechatpy.xmlparser import parse_xml
+
+TESTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests")
+
+
+def load_fixtures():
+    docs = []
+    for path in sorted(glob.glob(os.path.join(TESTS_PATH, "test_*parser.py"))) + [
+        os.path.join(TESTS_PATH, "test_events.py")
+    ]:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Constant)
+                and isinstance(node.value, str)
+                and node.value.strip().startswith("<xml>")
+            ):
+                docs.append(node.value.encode("utf-8"))
+    return docs
+
+
+def bench(name, parse, docs, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for doc in docs:
+            parse(doc)
+    elapsed = time.perf_counter() - start
+    count = rounds * len(docs)
+    print(f"{name:<12}{count / elapsed:10.0f} msg/s  {elapsed / count * 1e6:6.2f} us/msg")
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    docs = load_fixtures()
+    print(f"{len(docs)} fixtures, {sum(map(len, docs)) // len(docs)} bytes on average")
+    bench("xmltodict", xmltodict.parse, docs, rounds)
+    bench("parse_xml", parse_xml, docs, rounds)
+
+
+if __name__ == "__main__":
+    main()
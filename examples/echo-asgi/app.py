@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import os
+
+from aiowechatpy import MessageRouter, WeChatClient
+from aiowechatpy.asgi import WeChatCallbackApp
+
+# set token or get from environments
+TOKEN = os.getenv("WECHAT_TOKEN", "123456")
+EncodingAESKey = os.getenv("WECHAT_ENCODING_AES_KEY", "")
+AppId = os.getenv("WECHAT_APP_ID", "")
+AppSecret = os.getenv("WECHAT_APP_SECRET", "")
+
+router = MessageRouter()
+
+
+@router.message("text")
+async def echo(message):
+    return message.content
+
+
+@router.default
+async def fallback(message):
+    return "Sorry, can not handle this for now"
+
+
+# late replies are sent as customer service messages
+client = WeChatClient(AppId, AppSecret) if AppSecret else None
+app = WeChatCallbackApp(router, TOKEN, EncodingAESKey or None, AppId or None, client=client)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="127.0.0.1", port=5001)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import httpx
+
+from aiowechatpy.transport import TransportManager
+
+
+class TokenServer:
+    """Fake token endpoint counting how many tokens were issued"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.issued = 0
+        self.tickets = 0
+
+    async def __call__(self, request):
+        path = request.url.path
+        if path.endswith(("/token", "/gettoken", "/api_component_token")):
+            await asyncio.sleep(self.delay)
+            self.issued += 1
+            key = "component_access_token" if "component" in path else "access_token"
+            return httpx.Response(200, json={key: f"token{self.issued}", "expires_in": 7200})
+        token = request.url.params.get("access_token") or request.url.params.get("component_access_token")
+        if token != f"token{self.issued}":
+            return httpx.Response(200, json={"errcode": 42001, "errmsg": "access_token expired"})
+        if path.endswith(("/getticket", "/get_jsapi_ticket", "/ticket/get")):
+            self.tickets += 1
+            return httpx.Response(200, json={"errcode": 0, "ticket": f"ticket{self.tickets}", "expires_in": 7200})
+        body = json.loads(request.content) if request.content else {}
+        return httpx.Response(200, json={"errcode": 0, "token": token, "body": body})
+
+    def transport(self):
+        return TransportManager(transport=httpx.MockTransport(self))
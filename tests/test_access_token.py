@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from aiowechatpy import WeChatClient
+from aiowechatpy.exceptions import WeChatClientException
+from aiowechatpy.component import WeChatComponent
+from aiowechatpy.transport import TransportManager
+from aiowechatpy.work import WeChatClient as WeChatWorkClient
+
+from helpers import TokenServer
+
+
+class SingleFlightTokenTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_access_token(self):
+        server = TokenServer()
+        client = WeChatClient("123456", "123456", transport=server.transport())
+        tokens = await asyncio.gather(*[client.access_token() for _ in range(50)])
+        self.assertEqual(1, server.issued)
+        self.assertEqual({"token1"}, set(tokens))
+
+    async def test_concurrent_expired_token_retry(self):
+        server = TokenServer()
+        client = WeChatClient("123456", "123456", transport=server.transport())
+        await client.session.set(client.access_token_key, "stale")
+        results = await asyncio.gather(*[client.get("getcallbackip") for _ in range(50)])
+        self.assertEqual(1, server.issued)
+        self.assertEqual({"token1"}, {res["token"] for res in results})
+
+    async def test_clients_sharing_session(self):
+        server = TokenServer()
+        transport = server.transport()
+        client1 = WeChatWorkClient("corp", "secret", transport=transport)
+        client2 = WeChatWorkClient("corp", "secret", session=client1.session, transport=transport)
+        await asyncio.gather(*[c.access_token() for c in (client1, client2) * 10])
+        self.assertEqual(1, server.issued)
+
+    async def test_failed_fetch_propagates_to_all_waiters(self):
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"errcode": 40013, "errmsg": "invalid appid"})
+
+        client = WeChatClient("123456", "123456", transport=TransportManager(transport=httpx.MockTransport(handler)))
+        results = await asyncio.gather(*[client.access_token() for _ in range(5)], return_exceptions=True)
+        self.assertTrue(all(isinstance(r, Exception) for r in results))
+        self.assertFalse(client._token_flight.in_flight(client.access_token_key))
+
+    async def test_flights_keyed_by_session(self):
+        import gc
+
+        from aiowechatpy.client.base import _token_flights
+
+        gc.collect()
+        before = len(_token_flights)
+        server = TokenServer()
+        client = WeChatClient("123456", "123456", transport=server.transport())
+        await client.access_token()
+        self.assertIs(client._token_flight, WeChatClient("123456", "123456", session=client.session)._token_flight)
+        self.assertIsNot(client._token_flight, WeChatClient("123456", "123456")._token_flight)
+        # the flights of a collected session go with it, instead of being found by a reused id()
+        session = client.session
+        del client, session
+        gc.collect()
+        self.assertLessEqual(len(_token_flights), before)
+
+    async def test_component_access_token(self):
+        server = TokenServer()
+        component = WeChatComponent("123456", "123456", "token", "a" * 43, transport=server.transport())
+        tokens = await asyncio.gather(*[component.access_token() for _ in range(20)])
+        self.assertEqual(1, server.issued)
+        self.assertEqual({"token1"}, set(tokens))
+
+
+class SharedTokenTestCase(unittest.IsolatedAsyncioTestCase):
+    def nodes(self, count, transport):
+        # separate storages over the same data stand in for processes sharing Redis
+        nodes = [WeChatClient("123456", "123456", transport=transport) for _ in range(count)]
+        for node in nodes[1:]:
+            node.session._data = nodes[0].session._data
+        return nodes
+
+    async def test_one_node_refreshes(self):
+        server = TokenServer(delay=0.2)
+        nodes = self.nodes(3, server.transport())
+        tokens = await asyncio.gather(*[node.access_token() for node in nodes * 5])
+        self.assertEqual(1, server.issued)
+        self.assertEqual({"token1"}, set(tokens))
+        self.assertEqual({nodes[0].expires_at}, {node.expires_at for node in nodes})
+
+    async def test_new_node_reads_shared_expiry(self):
+        server = TokenServer()
+        node1, node2 = self.nodes(2, server.transport())
+        await node1.access_token()
+        self.assertEqual("token1", await node2.access_token())
+        self.assertEqual(node1.expires_at, node2.expires_at)
+        self.assertEqual(node1.expires_at, await node2.get_expires_at())
+        self.assertEqual(1, server.issued)
+
+    async def test_expired_on_one_node(self):
+        server = TokenServer()
+        node1, node2 = self.nodes(2, server.transport())
+        await node1.access_token()
+        await node2.access_token()
+        # node2 refreshed the token, node1 still remembers the old expiry
+        node2.expires_at = 0
+        await node2._refresh_access_token(stale_token="token1")
+        node1.expires_at = int(time.time())
+        self.assertEqual("token2", await node1.access_token())
+        self.assertEqual(2, server.issued)
+
+    async def test_rejected_token_cached_locally(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        server = TokenServer()
+        remote = MemoryStorage()
+        node1, node2 = [
+            WeChatClient("123456", "123456", session=TieredStorage(remote, local_ttl=60), transport=server.transport())
+            for _ in range(2)
+        ]
+        await node1.access_token()
+        self.assertEqual("token1", await node2.access_token())
+        # node1 refreshed after a rejection, node2 still has token1 in its local tier
+        await node1._refresh_access_token(stale_token="token1")
+        await node2._refresh_access_token(stale_token="token1")
+        self.assertEqual(2, server.issued)
+        self.assertEqual("token2", await node2.access_token())
+
+    async def test_lease_won_after_publish(self):
+        server = TokenServer()
+        node1, node2 = self.nodes(2, server.transport())
+        read_shared = node2._read_shared_access_token
+        reads = []
+
+        async def first_read_then_publish(*args):
+            result = await read_shared(*args)
+            if not reads:
+                # node1 refreshes, publishes and releases the lease right after node2's first read
+                await node1._refresh_access_token()
+            reads.append(result)
+            return result
+
+        node2._read_shared_access_token = first_read_then_publish
+        await node2._refresh_access_token()
+        self.assertEqual(1, server.issued)
+        self.assertEqual("token1", await node2.access_token())
+        # node2 won the lease and took node1's token instead of fetching
+        self.assertIsNone(reads[0])
+        self.assertEqual("token1", reads[1]["access_token"])
+
+    async def test_lease(self):
+        session = WeChatClient("123456", "123456").session
+        lease = await session.acquire_lease("lease", 10)
+        self.assertTrue(lease)
+        self.assertIsNone(await session.acquire_lease("lease", 10))
+        await session.release_lease("lease", "not mine")
+        self.assertIsNone(await session.acquire_lease("lease", 10))
+        await session.release_lease("lease", lease)
+        self.assertTrue(await session.acquire_lease("lease", 10))
+
+
+class TokenRefresherTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_refresh_missing(self):
+        server = TokenServer()
+        client = WeChatClient("123456", "123456", transport=server.transport())
+        refresher = client.start_refresher(tickets=("jsapi", "jsapi_card"))
+        await refresher.stop()
+        await refresher.refresh_due()
+        self.assertEqual(1, server.issued)
+        self.assertEqual(2, server.tickets)
+        self.assertEqual("ticket1", await client.jsapi.get_jsapi_ticket())
+        self.assertEqual("ticket2", await client.jsapi.get_jsapi_card_ticket())
+        self.assertEqual(1, refresher.stats["access_token"].refreshes)
+        self.assertIsNotNone(refresher.stats["jsapi_ticket"].last_refresh_at)
+
+    async def test_refresh_ahead_of_expiry(self):
+        server = TokenServer()
+        client = WeChatClient("123456", "123456", transport=server.transport())
+        refresher = client.start_refresher(ahead=300, jitter=10)
+        await refresher.stop()
+        await client.access_token()
+        await refresher.refresh_due()
+        self.assertEqual(1, server.issued)
+
+        await client.set_expires_at(int(time.time()) + 200)
+        await refresher.refresh_due()
+        self.assertEqual(2, server.issued)
+        self.assertEqual("token2", await client.access_token())
+
+    async def test_user_provided_token_skipped(self):
+        server = TokenServer()
+        client = WeChatClient("123456", "123456", transport=server.transport())
+        await client.session.set(client.access_token_key, "provided")
+        refresher = client.start_refresher()
+        await refresher.stop()
+        await refresher.refresh_due()
+        self.assertEqual(0, server.issued)
+
+    async def test_background_task(self):
+        server = TokenServer()
+        client = WeChatWorkClient("corp", "secret", transport=server.transport())
+        refresher = client.start_refresher(tickets=("jsapi", "agent_jsapi"), interval=0.01)
+        self.assertTrue(refresher.running)
+        await asyncio.sleep(0.2)
+        await client.stop_refresher()
+        self.assertFalse(refresher.running)
+        self.assertEqual(1, server.issued)
+        self.assertEqual(2, server.tickets)
+        self.assertEqual("ticket2", await client.jsapi.get_agent_jsapi_ticket())
+
+    async def test_failures(self):
+        async def handler(request):
+            return httpx.Response(200, json={"errcode": 40013, "errmsg": "invalid appid"})
+
+        client = WeChatClient("123456", "123456", transport=TransportManager(transport=httpx.MockTransport(handler)))
+        refresher = client.start_refresher()
+        await refresher.stop()
+        await refresher.refresh_due()
+        await refresher.refresh_due()
+        stats = refresher.stats["access_token"]
+        self.assertEqual(2, stats.failures)
+        self.assertEqual(2, stats.consecutive_failures)
+        self.assertIsInstance(stats.last_error, WeChatClientException)
+        self.assertIsNone(stats.last_refresh_at)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+from urllib.parse import urlencode
+
+import xmltodict
+
+from aiowechatpy import MessageDeduplicator, MessageRouter, WeChatComponent
+from aiowechatpy.asgi import ComponentCallbackApp, WeChatCallbackApp, WorkCallbackApp
+from aiowechatpy.crypto import WeChatCrypto
+from aiowechatpy.exceptions import WeChatClientException
+from aiowechatpy.session.memorystorage import MemoryStorage
+from aiowechatpy.utils import WeChatSigner
+
+TOKEN = "123456"
+ENCODING_AES_KEY = "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR"
+APP_ID = "wx49f0ab532d5d035a"
+
+TEXT = """<xml>
+<ToUserName><![CDATA[gh_7f083739789a]]></ToUserName>
+<FromUserName><![CDATA[user]]></FromUserName>
+<CreateTime>1411525903</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[{content}]]></Content>
+<MsgId>1234567890123456</MsgId>
+</xml>"""
+
+
+def sign(*args):
+    signer = WeChatSigner()
+    signer.add_data(*args)
+    return signer.signature
+
+
+async def call(app, method, params, body=b""):
+    scope = {"type": "http", "method": method, "query_string": urlencode(params).encode()}
+    # the body arrives in two chunks
+    messages = [
+        {"type": "http.request", "body": body[:10], "more_body": True},
+        {"type": "http.request", "body": body[10:], "more_body": False},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"], sent[1]["body"]
+
+
+class CallbackAppTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.router = MessageRouter()
+
+        @self.router.message("text")
+        async def echo(message):
+            if message.content == "slow":
+                await asyncio.sleep(0.2)
+            return message.content
+
+        self.params = {"timestamp": "1411525903", "nonce": "461056294"}
+        self.params["signature"] = sign(TOKEN, self.params["timestamp"], self.params["nonce"])
+
+    async def test_verify(self):
+        app = WeChatCallbackApp(self.router, TOKEN)
+        self.assertEqual((200, b"echo"), await call(app, "GET", dict(self.params, echostr="echo")))
+        self.assertEqual(403, (await call(app, "GET", dict(self.params, signature="0", echostr="echo")))[0])
+
+    async def test_plaintext_message(self):
+        app = WeChatCallbackApp(self.router, TOKEN)
+        status, body = await call(app, "POST", self.params, TEXT.format(content="你好").encode())
+        self.assertEqual(200, status)
+        reply = xmltodict.parse(body)["xml"]
+        self.assertEqual("你好", reply["Content"])
+        self.assertEqual("user", reply["ToUserName"])
+        self.assertEqual(400, (await call(app, "POST", self.params, b"<xml>"))[0])
+        # well-formed, but not a message
+        self.assertEqual(400, (await call(app, "POST", self.params, b"<xml></xml>"))[0])
+        self.assertEqual(400, (await call(app, "POST", self.params, b"<root/>"))[0])
+        self.assertEqual(
+            400, (await call(app, "POST", self.params, b"<xml><MsgType>a</MsgType><MsgType>b</MsgType></xml>"))[0]
+        )
+
+    async def test_unexpected_error(self):
+        class BrokenStorage(MemoryStorage):
+            async def get(self, key, default=None):
+                raise ConnectionError()
+
+        app = WeChatCallbackApp(self.router, TOKEN, dedupe=MessageDeduplicator(session=BrokenStorage()))
+        with self.assertLogs("aiowechatpy.asgi", "ERROR"):
+            status, body = await call(app, "POST", self.params, TEXT.format(content="hello").encode())
+        self.assertEqual((500, b""), (status, body))
+
+        class BuggyStorage(MemoryStorage):
+            async def get(self, key, default=None):
+                raise TypeError()
+
+        # a bug in the server is not reported as a bad request
+        app = WeChatCallbackApp(self.router, TOKEN, dedupe=MessageDeduplicator(session=BuggyStorage()))
+        with self.assertLogs("aiowechatpy.asgi", "ERROR"):
+            status, body = await call(app, "POST", self.params, TEXT.format(content="hello").encode())
+        self.assertEqual((500, b""), (status, body))
+
+    async def test_encrypted_message(self):
+        app = WeChatCallbackApp(self.router, TOKEN, ENCODING_AES_KEY, APP_ID)
+        crypto = WeChatCrypto(TOKEN, ENCODING_AES_KEY, APP_ID)
+        envelope = crypto.encrypt_message(TEXT.format(content="hello"), self.params["nonce"], self.params["timestamp"])
+        params = dict(self.params, encrypt_type="aes", msg_signature=xmltodict.parse(envelope)["xml"]["MsgSignature"])
+
+        status, body = await call(app, "POST", params, envelope.encode())
+        self.assertEqual(200, status)
+        encrypted = xmltodict.parse(body)["xml"]
+        reply = crypto.decrypt_message(body, encrypted["MsgSignature"], encrypted["TimeStamp"], encrypted["Nonce"])
+        self.assertEqual("hello", xmltodict.parse(reply)["xml"]["Content"])
+
+        params["msg_signature"] = "0"
+        self.assertEqual(403, (await call(app, "POST", params, envelope.encode()))[0])
+        self.assertEqual(400, (await call(app, "POST", params, b"<xml></xml>"))[0])
+
+    async def test_dedupe(self):
+        calls = []
+
+        @self.router.message("text")
+        async def count(message):
+            calls.append(message.content)
+            await asyncio.sleep(0.05)
+            return message.content
+
+        app = WeChatCallbackApp(self.router, TOKEN, ENCODING_AES_KEY, APP_ID, dedupe=MessageDeduplicator())
+        crypto = WeChatCrypto(TOKEN, ENCODING_AES_KEY, APP_ID)
+        envelope = crypto.encrypt_message(TEXT.format(content="hello"), self.params["nonce"], self.params["timestamp"])
+        params = dict(self.params, encrypt_type="aes", msg_signature=xmltodict.parse(envelope)["xml"]["MsgSignature"])
+
+        # the retry arrives while the first request is in flight, and once more after it
+        responses = await asyncio.gather(*(call(app, "POST", params, envelope.encode()) for _ in range(2)))
+        responses.append(await call(app, "POST", params, envelope.encode()))
+        for status, body in responses:
+            self.assertEqual(200, status)
+            encrypted = xmltodict.parse(body)["xml"]
+            reply = crypto.decrypt_message(body, encrypted["MsgSignature"], encrypted["TimeStamp"], encrypted["Nonce"])
+            self.assertEqual("hello", xmltodict.parse(reply)["xml"]["Content"])
+        self.assertEqual(["hello"], calls)
+
+        # duplicates are only answered to signed requests
+        params["msg_signature"] = "0"
+        self.assertEqual(403, (await call(app, "POST", params, envelope.encode()))[0])
+
+        # plaintext retries are found by MsgId
+        app = WeChatCallbackApp(self.router, TOKEN, dedupe=MessageDeduplicator())
+        for _ in range(2):
+            status, body = await call(app, "POST", self.params, TEXT.format(content="plain").encode())
+            self.assertEqual("plain", xmltodict.parse(body)["xml"]["Content"])
+        self.assertEqual(["hello", "plain"], calls)
+        # an empty body is answered with an empty reply
+        self.assertEqual((200, b""), await call(app, "POST", self.params, b""))
+
+    async def test_deadline(self):
+        late = []
+
+        async def on_timeout(message, reply):
+            late.append((message.content, reply.content))
+
+        app = WeChatCallbackApp(self.router, TOKEN, deadline=0.05, on_timeout=on_timeout)
+        self.assertEqual((200, b""), await call(app, "POST", self.params, TEXT.format(content="slow").encode()))
+        self.assertEqual([], late)
+        await app.aclose()
+        self.assertEqual([("slow", "slow")], late)
+
+    async def test_work_verify(self):
+        app = WorkCallbackApp(self.router, TOKEN, ENCODING_AES_KEY, APP_ID)
+        params = {
+            "msg_signature": "dd6b9c95b495b3f7e2901bfbc76c664930ffdb96",
+            "timestamp": "1411443780",
+            "nonce": "437374425",
+            "echostr": "4ByGGj+sVCYcvGeQYhaKIk1o0pQRNbRjxybjTGblXrBaXlTXeOo1+bXFXDQQb1o6co6Yh9Bv41n7hOchLF6p+Q==",
+        }
+        status, body = await call(app, "GET", params)
+        self.assertEqual(200, status)
+        self.assertTrue(body)
+
+    async def test_component_verify_ticket(self):
+        component = WeChatComponent(APP_ID, "secret", TOKEN, ENCODING_AES_KEY)
+        app = ComponentCallbackApp(component)
+        ticket = f"""<xml>
+<AppId><![CDATA[{APP_ID}]]></AppId>
+<CreateTime>1413192605</CreateTime>
+<InfoType><![CDATA[component_verify_ticket]]></InfoType>
+<ComponentVerifyTicket><![CDATA[ticket@@@xyz]]></ComponentVerifyTicket>
+</xml>"""
+        envelope = component.crypto.encrypt_message(ticket, self.params["nonce"], self.params["timestamp"])
+        params = dict(self.params, msg_signature=xmltodict.parse(envelope)["xml"]["MsgSignature"])
+
+        self.assertEqual((200, b"success"), await call(app, "POST", params, envelope.encode()))
+        self.assertEqual("ticket@@@xyz", await component.component_verify_ticket())
+
+    async def test_component_query_auth_failed(self):
+        component = WeChatComponent(APP_ID, "secret", TOKEN, ENCODING_AES_KEY)
+
+        async def query_auth(authorization_code):
+            raise WeChatClientException(61010, "code is expired")
+
+        component.query_auth = query_auth
+        app = ComponentCallbackApp(component)
+        authorized = f"""<xml>
+<AppId><![CDATA[{APP_ID}]]></AppId>
+<CreateTime>1413192605</CreateTime>
+<InfoType><![CDATA[authorized]]></InfoType>
+<AuthorizerAppid><![CDATA[wx123]]></AuthorizerAppid>
+<AuthorizationCode><![CDATA[code]]></AuthorizationCode>
+</xml>"""
+        envelope = component.crypto.encrypt_message(authorized, self.params["nonce"], self.params["timestamp"])
+        params = dict(self.params, msg_signature=xmltodict.parse(envelope)["xml"]["MsgSignature"])
+
+        # logged and answered so that WeChat server does not retry
+        with self.assertLogs("aiowechatpy.asgi", "ERROR"):
+            self.assertEqual((200, b"success"), await call(app, "POST", params, envelope.encode()))
@@ -7,11 +7,13 @@ import time
 import unittest
 from datetime import datetime
 
+import httpx
 from httmock import HTTMock, response, urlmatch
 
 from aiowechatpy import WeChatClient
 from aiowechatpy.exceptions import WeChatClientException
 from aiowechatpy.schemes import JsApiCardExt
+from aiowechatpy.transport import TransportManager
 
 _TESTS_PATH = os.path.abspath(os.path.dirname(__file__))
 _FIXTURE_PATH = os.path.join(_TESTS_PATH, "fixtures")
@@ -59,6 +61,13 @@ class WeChatClientTestCase(unittest.TestCase):
         client = TestClient("12345", "123456", "123456789")
         self.assertEqual(client, client.user._client)
 
+    def test_api_bound_lazily(self):
+        client = WeChatClient("12345", "123456")
+        self.assertNotIn("user", vars(client))
+        self.assertIs(client.user, client.user)
+        self.assertIs(client, client.user._client)
+        self.assertIsNone(WeChatClient.user._client)
+
     def test_fetch_access_token_is_method(self):
         self.assertTrue(inspect.ismethod(self.client.fetch_access_token))
 
@@ -856,3 +865,34 @@ class WeChatClientTestCase(unittest.TestCase):
         expires_at = time.time() + 7200
         client1.expires_at = expires_at
         assert client1.expires_at == client2.expires_at == expires_at
+
+
+class DecodeResultTestCase(unittest.IsolatedAsyncioTestCase):
+    async def client(self, handler):
+        client = WeChatClient("123456", "123456", transport=TransportManager(transport=httpx.MockTransport(handler)))
+        await client.session.set(client.access_token_key, "token")
+        return client
+
+    async def test_binary_response(self):
+        image = b"\x89PNG" + b"{" * 1024
+        client = await self.client(
+            lambda request: httpx.Response(200, content=image, headers={"Content-Type": "image/png"})
+        )
+        res = await client.media.download("media_id")
+        self.assertIsInstance(res, httpx.Response)
+        self.assertEqual(image, res.content)
+
+    async def test_binary_endpoint_error(self):
+        body = b'{"errcode": 40007, "errmsg": "invalid media_id"}'
+        client = await self.client(
+            lambda request: httpx.Response(200, content=body, headers={"Content-Type": "text/plain"})
+        )
+        with self.assertRaises(WeChatClientException) as cm:
+            await client.media.download("media_id")
+        self.assertEqual(40007, cm.exception.errcode)
+
+    async def test_missing_content_type(self):
+        client = await self.client(lambda request: httpx.Response(200, content=b'{"errcode": 0, "ip_list": []}'))
+        self.assertEqual([], (await client.get("getcallbackip"))["ip_list"])
+        res = await client.wxa.get_wxa_code("pages/index")
+        self.assertIsInstance(res, httpx.Response)
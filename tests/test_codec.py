@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from aiowechatpy.codec import JSONCodec, OrjsonCodec, get_default_codec, orjson
+
+
+class JSONCodecTestCase(unittest.TestCase):
+    codec = JSONCodec()
+
+    def test_dumps_returns_utf8_bytes(self):
+        body = self.codec.dumps({"content": "你好"})
+        self.assertIsInstance(body, bytes)
+        self.assertIn("你好".encode("utf-8"), body)
+        self.assertEqual({"content": "你好"}, self.codec.loads(body))
+
+    def test_loads_control_characters(self):
+        self.assertEqual({"nickname": "a\tb"}, self.codec.loads(b'{"nickname": "a\tb"}'))
+
+    def test_loads_invalid(self):
+        self.assertRaises(ValueError, self.codec.loads, b"\x89PNG")
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class OrjsonCodecTestCase(JSONCodecTestCase):
+    codec = OrjsonCodec()
+
+    def test_default_codec(self):
+        self.assertIsInstance(get_default_codec(), OrjsonCodec)
+
+    def test_dumps_fallback(self):
+        # non-str keys and integers over 64 bits are not supported by orjson
+        self.assertEqual({"1": 2**64}, self.codec.loads(self.codec.dumps({1: 2**64})))
@@ -74,6 +74,29 @@ class CryptoTestCase(unittest.TestCase):
 
         self.assertEqual(expected, encrypted)
 
+    def test_encrypt_message_bytes(self):
+        from aiowechatpy.work.replies import TextReply
+
+        nonce = "461056294"
+        timestamp = "1411525903"
+        reply = TextReply(source=self.corp_id, target="messense", content="你好", agent=1, time=1411525903)
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+
+        encrypted = crypto.encrypt_message_bytes(reply, nonce, timestamp)
+        self.assertIsInstance(encrypted, bytes)
+        envelope = xmltodict.parse(encrypted)["xml"]
+        self.assertEqual(timestamp, envelope["TimeStamp"])
+        self.assertEqual(nonce, envelope["Nonce"])
+        decrypted = crypto.decrypt_message(encrypted, envelope["MsgSignature"], timestamp, nonce)
+        self.assertEqual(reply.render(), decrypted)
+
+        # every padding length
+        for length in range(40):
+            xml = "<xml>" + "a" * length + "</xml>"
+            encrypted = crypto.encrypt_message_bytes(xml.encode(), nonce, timestamp)
+            signature = xmltodict.parse(encrypted)["xml"]["MsgSignature"]
+            self.assertEqual(xml, crypto.decrypt_message(encrypted, signature, timestamp, nonce))
+
     def test_decrypt_message(self):
         xml = """<xml><ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
 <Encrypt><![CDATA[RgqEoJj5A4EMYlLvWO1F86ioRjZfaex/gePD0gOXTxpsq5Yj4GNglrBb8I2BAJVODGajiFnXBu7mCPatfjsu6IHCrsTyeDXzF6Bv283dGymzxh6ydJRvZsryDyZbLTE7rhnus50qGPMfp2wASFlzEgMW9z1ef/RD8XzaFYgm7iTdaXpXaG4+BiYyolBug/gYNx410cvkKR2/nPwBiT+P4hIiOAQqGp/TywZBtDh1yCF2KOd0gpiMZ5jSw3e29mTvmUHzkVQiMS6td7vXUaWOMZnYZlF3So2SjHnwh4jYFxdgpkHHqIrH/54SNdshoQgWYEvccTKe7FS709/5t6NMxuGhcUGAPOQipvWTT4dShyqio7mlsl5noTrb++x6En749zCpQVhDpbV6GDnTbcX2e8K9QaNWHp91eBdCRxthuL0=]]></Encrypt>
@@ -106,6 +129,103 @@ class CryptoTestCase(unittest.TestCase):
         self.assertEqual("test", msg_dict["Content"])
         self.assertEqual("messense", msg_dict["FromUserName"])
 
+    def test_decrypt_message_bytes(self):
+        from aiowechatpy.exceptions import InvalidSignatureException
+
+        xml = """<xml><ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
+<Encrypt><![CDATA[RgqEoJj5A4EMYlLvWO1F86ioRjZfaex/gePD0gOXTxpsq5Yj4GNglrBb8I2BAJVODGajiFnXBu7mCPatfjsu6IHCrsTyeDXzF6Bv283dGymzxh6ydJRvZsryDyZbLTE7rhnus50qGPMfp2wASFlzEgMW9z1ef/RD8XzaFYgm7iTdaXpXaG4+BiYyolBug/gYNx410cvkKR2/nPwBiT+P4hIiOAQqGp/TywZBtDh1yCF2KOd0gpiMZ5jSw3e29mTvmUHzkVQiMS6td7vXUaWOMZnYZlF3So2SjHnwh4jYFxdgpkHHqIrH/54SNdshoQgWYEvccTKe7FS709/5t6NMxuGhcUGAPOQipvWTT4dShyqio7mlsl5noTrb++x6En749zCpQVhDpbV6GDnTbcX2e8K9QaNWHp91eBdCRxthuL0=]]></Encrypt>
+<AgentID><![CDATA[1]]></AgentID>
+</xml>"""
+
+        signature = "74d92dfeb87ba7c714f89d98870ae5eb62dff26d"
+        timestamp = "1411525903"
+        nonce = "461056294"
+
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+        encrypt = crypto.get_encrypt(xml)
+        self.assertTrue(encrypt.startswith(b"RgqEoJj5"))
+        crypto.check_encrypt(encrypt, signature, timestamp, nonce)
+        self.assertRaises(InvalidSignatureException, crypto.check_encrypt, encrypt, "0" * 40, timestamp, nonce)
+
+        msg = crypto.decrypt_message_bytes(xml, signature, timestamp, nonce)
+        self.assertIsInstance(msg, bytes)
+        self.assertEqual(crypto.decrypt_message(xml, signature, timestamp, nonce), msg.decode())
+
+    def test_parse_message(self):
+        from aiowechatpy.work.messages import TextMessage
+
+        xml = b"""<xml><ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
+<Encrypt><![CDATA[RgqEoJj5A4EMYlLvWO1F86ioRjZfaex/gePD0gOXTxpsq5Yj4GNglrBb8I2BAJVODGajiFnXBu7mCPatfjsu6IHCrsTyeDXzF6Bv283dGymzxh6ydJRvZsryDyZbLTE7rhnus50qGPMfp2wASFlzEgMW9z1ef/RD8XzaFYgm7iTdaXpXaG4+BiYyolBug/gYNx410cvkKR2/nPwBiT+P4hIiOAQqGp/TywZBtDh1yCF2KOd0gpiMZ5jSw3e29mTvmUHzkVQiMS6td7vXUaWOMZnYZlF3So2SjHnwh4jYFxdgpkHHqIrH/54SNdshoQgWYEvccTKe7FS709/5t6NMxuGhcUGAPOQipvWTT4dShyqio7mlsl5noTrb++x6En749zCpQVhDpbV6GDnTbcX2e8K9QaNWHp91eBdCRxthuL0=]]></Encrypt>
+<AgentID><![CDATA[1]]></AgentID>
+</xml>"""
+
+        signature = "74d92dfeb87ba7c714f89d98870ae5eb62dff26d"
+        timestamp = "1411525903"
+        nonce = "461056294"
+
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+        for message in (xml, xml.decode("utf-8"), xmltodict.parse(xml)["xml"]):
+            msg = crypto.parse_message(message, signature, timestamp, nonce)
+            self.assertIsInstance(msg, TextMessage)
+            self.assertEqual("test", msg.content)
+            self.assertEqual("messense", msg.source)
+
+    def test_mp_parse_message(self):
+        from aiowechatpy.crypto import WeChatCrypto as MPWeChatCrypto
+        from aiowechatpy.exceptions import InvalidAppIdException, InvalidSignatureException
+        from aiowechatpy.messages import TextMessage
+
+        nonce = "461056294"
+        timestamp = "1411525903"
+        message = """<xml>
+<ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
+<FromUserName><![CDATA[messense]]></FromUserName>
+<CreateTime>1411525903</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[你好]]></Content>
+<MsgId>1234567890123456</MsgId>
+</xml>"""
+        crypto = MPWeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+        encrypted = crypto.encrypt_message(message, nonce, timestamp).encode("utf-8")
+        signature = xmltodict.parse(encrypted)["xml"]["MsgSignature"]
+
+        msg = crypto.parse_message(encrypted, signature, timestamp, nonce)
+        self.assertIsInstance(msg, TextMessage)
+        self.assertEqual("你好", msg.content)
+        self.assertEqual(message, crypto.decrypt_message(encrypted, signature, timestamp, nonce))
+
+        self.assertRaises(InvalidSignatureException, crypto.parse_message, encrypted, "0" * 40, timestamp, nonce)
+        other = MPWeChatCrypto(self.token, self.encoding_aes_key, "wx0000000000000000")
+        self.assertRaises(InvalidAppIdException, other.parse_message, encrypted, signature, timestamp, nonce)
+
+    def test_encrypt_decrypt_many(self):
+        from aiowechatpy.crypto.base import AesEcbCipher, WeChatCipher
+        from aiowechatpy.exceptions import InvalidSignatureException
+        from aiowechatpy.work.exceptions import InvalidCorpIdException
+
+        nonce = "461056294"
+        timestamp = "1411525903"
+        messages = [f"<xml><Content><![CDATA[{'消息' * i}]]></Content></xml>" for i in range(50)]
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+
+        encrypted = crypto.encrypt_many(messages, nonce, timestamp)
+        signed = [(xml, xmltodict.parse(xml)["xml"]["MsgSignature"], timestamp, nonce) for xml in encrypted]
+        self.assertEqual([crypto.decrypt_message(*args) for args in signed], crypto.decrypt_many(signed))
+        self.assertEqual(messages, crypto.decrypt_many(signed))
+        self.assertEqual([], crypto.decrypt_many([]))
+
+        signed[3] = (encrypted[3], "0" * 40, timestamp, nonce)
+        self.assertRaises(InvalidSignatureException, crypto.decrypt_many, signed)
+        other = WeChatCrypto(self.token, self.encoding_aes_key, "wx0000000000000000")
+        self.assertRaises(InvalidCorpIdException, other.decrypt_many, signed[:3])
+
+        for cipher in (WeChatCipher(crypto.key), AesEcbCipher(crypto.key)):
+            plaintexts = [bytes(range(16)) * i for i in range(1, 10)]
+            ciphertexts = cipher.encrypt_many(plaintexts)
+            self.assertEqual([cipher.encrypt(plaintext) for plaintext in plaintexts], ciphertexts)
+            self.assertEqual(plaintexts, cipher.decrypt_many(ciphertexts))
+            self.assertRaises(ValueError, cipher.decrypt_many, [b"0" * 15])
+
     def test_wxa_decrypt_message(self):
         from aiowechatpy.crypto import WeChatWxaCrypto
 
@@ -142,6 +262,7 @@ class CryptoTestCase(unittest.TestCase):
 </xml>"""
         refund_crypto = WeChatRefundCrypto(api_key)
         data = refund_crypto.decrypt_message(xml, appid, mch_id)
+        self.assertEqual([data, data], refund_crypto.decrypt_many([xml, xml], appid, mch_id))
         self.assertEqual("1234", data["out_refund_no"])
         self.assertEqual("2020010418301551404339261814", data["out_trade_no"])
         self.assertEqual("4200000483202001042069747825", data["transaction_id"])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from aiowechatpy.dedupe import MessageDeduplicator, message_key
+from aiowechatpy.events import SubscribeEvent
+from aiowechatpy.messages import TextMessage
+from aiowechatpy.session.memorystorage import MemoryStorage
+
+
+class MessageDeduplicatorTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_message_key(self):
+        self.assertEqual("msg:123", message_key(TextMessage({"MsgId": "123", "CreateTime": "1"})))
+        event = SubscribeEvent({"FromUserName": "user", "CreateTime": "1", "Event": "subscribe"})
+        self.assertEqual("event:user:1:subscribe", message_key(event))
+        info = {"AppId": "wx", "CreateTime": "1", "InfoType": "component_verify_ticket"}
+        self.assertEqual("info:wx:1:component_verify_ticket", message_key(info))
+
+    async def test_run_once(self):
+        dedupe = MessageDeduplicator()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "reply"
+
+        # the in-flight duplicates wait for the first call
+        results = await asyncio.gather(*(dedupe.run("msg:1", compute, ("alias",)) for _ in range(3)))
+        self.assertEqual(["reply"] * 3, results)
+        self.assertEqual("reply", await dedupe.run("msg:1", compute))
+        self.assertEqual("reply", await dedupe.get("alias"))
+        self.assertEqual(1, len(calls))
+
+    async def test_run_failed(self):
+        dedupe = MessageDeduplicator()
+
+        async def fail():
+            raise ValueError()
+
+        async def compute():
+            return "reply"
+
+        with self.assertRaises(ValueError):
+            await dedupe.run("msg:1", fail)
+        self.assertEqual("reply", await dedupe.run("msg:1", compute))
+
+    async def test_shared_session(self):
+        session = MemoryStorage()
+        first, second = MessageDeduplicator(session=session), MessageDeduplicator(session=session)
+        started, finish = asyncio.Event(), asyncio.Event()
+
+        async def slow():
+            started.set()
+            await finish.wait()
+            return "reply"
+
+        async def compute():
+            return "other"
+
+        task = asyncio.ensure_future(first.run("msg:1", slow))
+        await started.wait()
+        # the other node is still handling it
+        self.assertIsNone(await second.run("msg:1", compute))
+        finish.set()
+        self.assertEqual("reply", await task)
+        self.assertEqual("reply", await second.run("msg:1", compute))
@@ -149,6 +149,20 @@ class FieldsTestCase(unittest.TestCase):
         expected = "<ExpiredTime>1442401156</ExpiredTime>"
         self.assertEqual(expected, field.to_xml(content))
 
+    def test_multi_node_fields_render_whole_nodes(self):
+        from aiowechatpy.fields import ArticlesField, HardwareField
+
+        articles = ArticlesField("Articles")
+        self.assertEqual(("", ""), articles.xml_template())
+        xml = xmltodict.parse(f"<xml>{articles.render_value([{'title': 'test'}])}</xml>")["xml"]
+        self.assertEqual("1", xml["ArticleCount"])
+        self.assertEqual("test", xml["Articles"]["item"]["Title"])
+
+        hardware = HardwareField("HardWare")
+        self.assertEqual(("", ""), hardware.xml_template())
+        xml = xmltodict.parse(hardware.render_value({"view": "a", "action": "b"}))["HardWare"]
+        self.assertEqual({"MessageView": "a", "MessageAction": "b"}, xml)
+
     def assertXMLEqual(self, expected, xml):
         expected = xmltodict.unparse(xmltodict.parse(expected))
         xml = xmltodict.unparse(xmltodict.parse(xml))
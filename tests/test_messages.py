@@ -128,3 +128,39 @@ class MessagesTestCase(unittest.TestCase):
         self.assertEqual("path", msg.page_path)
         self.assertEqual("thumburl", msg.thumb_url)
         self.assertEqual("thumbmediaid", msg.thumb_media_id)
+
+    def test_user_subclass_keeps_dict(self):
+        from aiowechatpy.events import EVENT_TYPES
+        from aiowechatpy.messages import COMPONENT_MESSAGE_TYPES, MESSAGE_TYPES, TextMessage
+        from aiowechatpy.work.events import EVENT_TYPES as WORK_EVENT_TYPES
+
+        for registry in (MESSAGE_TYPES, EVENT_TYPES, COMPONENT_MESSAGE_TYPES, WORK_EVENT_TYPES):
+            for message_class in registry.values():
+                self.assertFalse(hasattr(message_class({}), "__dict__"), message_class)
+
+        class TaggedMessage(TextMessage):
+            pass
+
+        msg = TaggedMessage({"Content": "hello"})
+        msg.extra = "tag"
+        self.assertEqual("tag", msg.extra)
+        self.assertEqual("hello", msg.content)
+
+    def test_message_fields_converted_once(self):
+        from aiowechatpy.events import ScanCodePushEvent
+        from aiowechatpy.messages import TextMessage
+
+        msg = TextMessage({"FromUserName": "user1", "CreateTime": 1482048670})
+        self.assertFalse(hasattr(msg, "__dict__"))
+        self.assertIs(msg.create_time, msg.create_time)
+        self.assertEqual(1482048670, msg.time)
+
+        msg.time = 1482048671
+        self.assertEqual(1482048671, msg.time)
+        self.assertEqual(1482048671, msg.create_time.timestamp())
+
+        # mutable defaults are not shared between messages
+        first, second = ScanCodePushEvent({}), ScanCodePushEvent({})
+        first.scan_code_info["ScanType"] = "qrcode"
+        self.assertIs(first.scan_code_info, first.scan_code_info)
+        self.assertEqual({}, second.scan_code_info)
@@ -379,3 +379,150 @@ class ParseMessageTestCase(unittest.TestCase):
         self.assertEqual("123", msg.content)
         self.assertEqual("123", msg.device_type)
         self.assertEqual("123", msg.device_id)
+
+
+class ParseXMLTestCase(unittest.TestCase):
+    def assertParsedAsXmltodict(self, xml):
+        import xmltodict
+
+        from aiowechatpy.xmlparser import parse_xml
+
+        self.assertEqual(xmltodict.parse(xml), parse_xml(xml))
+        self.assertEqual(xmltodict.parse(xml), parse_xml(xml.encode("utf-8")))
+
+    def test_parse_flat_xml(self):
+        self.assertParsedAsXmltodict(
+            """<?xml version="1.0" encoding="utf-8"?>
+        <xml>
+        <ToUserName><![CDATA[toUser]]></ToUserName>
+        <CreateTime>1348831860</CreateTime>
+        <Content><![CDATA[  你好 <a>]] ]]></Content>
+        <Empty></Empty>
+        <EmptyCDATA><![CDATA[]]></EmptyCDATA>
+        <Escaped>a &amp; b</Escaped>
+        <Item>1</Item>
+        <Item>2</Item>
+        </xml>"""
+        )
+
+    def test_parse_nested_xml(self):
+        self.assertParsedAsXmltodict(
+            """<xml>
+        <MsgType><![CDATA[event]]></MsgType>
+        <SendPicsInfo><Count>2</Count>
+        <PicList>
+        <item><PicMd5Sum><![CDATA[1b5f7c23b5bf75682a53e7b6d163e185]]></PicMd5Sum></item>
+        <item><PicMd5Sum><![CDATA[7b5f7c23b5bf75682a53e7b6d163e185]]></PicMd5Sum></item>
+        </PicList>
+        </SendPicsInfo>
+        <Single><Item>text<Inner>1</Inner></Item></Single>
+        </xml>"""
+        )
+
+    def test_parse_xml_with_attributes(self):
+        self.assertParsedAsXmltodict('<xml><Content lang="zh">hello</Content></xml>')
+
+    def test_reject_doctype(self):
+        from aiowechatpy.xmlparser import parse_xml
+
+        for xml in (
+            "<!DOCTYPE xml><xml><Content>hello</Content></xml>",
+            '<!DOCTYPE xml [<!ENTITY e "boom">]><xml><Content>&e;</Content></xml>',
+            '<!DOCTYPE xml [<!ENTITY e "boom">]><xml><A><B>&e;</B></A></xml>',
+            '<?xml version="1.0"?><!DOCTYPE xml SYSTEM "http://example.com/x.dtd"><xml><A lang="zh">1</A></xml>',
+        ):
+            with self.assertRaises(ValueError):
+                parse_xml(xml)
+
+    def test_reject_cdata_end_in_text(self):
+        from xml.parsers.expat import ExpatError
+
+        from aiowechatpy.xmlparser import parse_xml
+
+        for xml in ("<xml><Content>a]]>b</Content></xml>", "<xml><A><B>a]]>b</B></A></xml>"):
+            with self.assertRaises(ExpatError):
+                parse_xml(xml)
+        self.assertParsedAsXmltodict("<xml><Content>a]]b ]>c</Content></xml>")
+
+
+class MessageDispatcherTestCase(unittest.TestCase):
+    def test_custom_event_registered_after_dispatch(self):
+        from aiowechatpy.events import EVENT_TYPES, BaseEvent, ClickEvent
+        from aiowechatpy.parser import dispatcher
+
+        message = {"MsgType": "event", "Event": "CLICK"}
+        self.assertIs(ClickEvent, dispatcher.resolve(message))
+        self.assertIs(ClickEvent, dispatcher.resolve({"MsgType": "EVENT", "Event": "click"}))
+
+        class CustomClickEvent(BaseEvent):
+            event = "click"
+
+        try:
+            self.assertIs(CustomClickEvent, dispatcher.resolve(message))
+        finally:
+            EVENT_TYPES["click"] = ClickEvent
+        self.assertIs(ClickEvent, dispatcher.resolve(message))
+
+    def test_unknown_types_not_cached(self):
+        from aiowechatpy.messages import UnknownMessage
+        from aiowechatpy.parser import dispatcher
+
+        for i in range(10):
+            self.assertIs(UnknownMessage, dispatcher.resolve({"MsgType": f"unknown{i}"}))
+        self.assertNotIn(("unknown0", None), dispatcher._table)
+
+    def test_registry_changes_clear_table(self):
+        from aiowechatpy.dispatch import MessageDispatcher, Registry
+        from aiowechatpy.messages import TextMessage, UnknownMessage, VoiceMessage
+
+        registry = Registry()
+        dispatcher = MessageDispatcher(lambda t, _: ("message", t), {"message": registry}, UnknownMessage)
+
+        def resolve():
+            return dispatcher.resolve({"MsgType": "text"})
+
+        changes = [
+            (lambda: registry.__setitem__("text", TextMessage), TextMessage),
+            (lambda: registry.clear(), UnknownMessage),
+            (lambda: registry.setdefault("text", VoiceMessage), VoiceMessage),
+            (lambda: registry.pop("text"), UnknownMessage),
+            (lambda: registry.update(text=TextMessage), TextMessage),
+            (lambda: registry.__ior__({"text": VoiceMessage}), VoiceMessage),
+            (lambda: registry.popitem(), UnknownMessage),
+            (lambda: registry.__setitem__("text", TextMessage), TextMessage),
+            (lambda: registry.__delitem__("text"), UnknownMessage),
+        ]
+        self.assertIs(UnknownMessage, resolve())
+        for change, message_class in changes:
+            change()
+            self.assertIs(message_class, resolve())
+        registry["text"] = TextMessage
+        self.assertIs(TextMessage, resolve())
+        registry |= {"text": VoiceMessage}
+        self.assertIs(VoiceMessage, resolve())
+
+    def test_hook(self):
+        from aiowechatpy.dispatch import MessageDispatcher, Registry
+        from aiowechatpy.messages import TextMessage, UnknownMessage, VoiceMessage
+
+        registry = Registry(text=TextMessage, voice=VoiceMessage)
+        dispatcher = MessageDispatcher(lambda t, _: ("message", t.lower()), {"message": registry}, UnknownMessage)
+        dispatcher.add_hook("message", "text", lambda message: "voice" if message.get("Recognition") else None)
+
+        self.assertIs(TextMessage, dispatcher.resolve({"MsgType": "text"}))
+        self.assertIsInstance(dispatcher.dispatch({"MsgType": "text", "Recognition": "hi"}), VoiceMessage)
+        del registry["voice"]
+        self.assertIs(UnknownMessage, dispatcher.resolve({"MsgType": "text", "Recognition": "hi"}))
+
+    def test_not_a_message(self):
+        from aiowechatpy.work.parser import parse_message as parse_work_message
+
+        for xml in (
+            "<xml></xml>",
+            "<xml>text</xml>",
+            "<root><MsgType>text</MsgType></root>",
+            "<xml><MsgType>text</MsgType><MsgType>image</MsgType></xml>",
+            "<xml><MsgType><Type>text</Type></MsgType></xml>",
+        ):
+            self.assertRaises(ValueError, parse_message, xml)
+            self.assertRaises(ValueError, parse_work_message, xml)
@@ -42,3 +42,12 @@ class WeChatPayTestCase(unittest.TestCase):
         )
         xml = dict_to_xml(params, sign)
         self.assertEqual(expected, xml)
+
+    def test_close(self):
+        from aiowechatpy.pay import WeChatPay
+
+        with WeChatPay(appid="abc1234", api_key="test123", mch_id="1192221") as pay:
+            adapter = pay._http.get_adapter("https://api.mch.weixin.qq.com/")
+            adapter.poolmanager.connection_from_url("https://api.mch.weixin.qq.com/")
+            self.assertEqual(1, len(adapter.poolmanager.pools))
+        self.assertEqual(0, len(adapter.poolmanager.pools))
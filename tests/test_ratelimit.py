@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from aiowechatpy import WeChatClient
+from aiowechatpy.client.ratelimit import RateLimiter, TokenBucket, normalize_endpoint
+from aiowechatpy.exceptions import APILimitedException
+from aiowechatpy.transport import TransportManager
+
+
+class RateLimiterTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_normalize_endpoint(self):
+        self.assertEqual("message/custom/send", normalize_endpoint("message/custom/send"))
+        self.assertEqual(
+            "message/custom/send",
+            normalize_endpoint("https://api.weixin.qq.com/cgi-bin/message/custom/send?access_token=1"),
+        )
+        self.assertEqual("sns/userinfo", normalize_endpoint("https://api.weixin.qq.com/sns/userinfo"))
+
+    async def test_token_bucket(self):
+        bucket = TokenBucket(100, burst=5)
+        start = time.monotonic()
+        await asyncio.gather(*[bucket.acquire() for _ in range(15)])
+        # 5 burst tokens, the other 10 at 100/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_slow_down_and_recover(self):
+        bucket = TokenBucket(100)
+        bucket.slow_down(0.5)
+        self.assertEqual(50, bucket.rate)
+        self.assertLessEqual(bucket.tokens, 0)
+        for _ in range(10):
+            bucket.slow_down(0.5)
+        self.assertEqual(bucket.min_rate, bucket.rate)
+        for _ in range(100):
+            bucket.speed_up(10)
+        self.assertEqual(100, bucket.rate)
+
+    def test_buckets_per_appid_and_endpoint(self):
+        limiter = RateLimiter(quotas={"message/custom/send": 10}, default_rate=None)
+        bucket = limiter.get_bucket("app1", "https://api.weixin.qq.com/cgi-bin/message/custom/send")
+        self.assertEqual(10, bucket.rate)
+        self.assertIs(bucket, limiter.get_bucket("app1", "message/custom/send"))
+        self.assertIsNot(bucket, limiter.get_bucket("app2", "message/custom/send"))
+        self.assertIsNone(limiter.get_bucket("app1", "user/info"))
+        limiter.default_rate = 20
+        self.assertEqual(20, limiter.get_bucket("app1", "user/info").rate)
+
+    async def test_client_feedback(self):
+        async def handler(request):
+            if request.url.path.endswith("/token"):
+                return httpx.Response(200, json={"access_token": "1234567890", "expires_in": 7200})
+            return httpx.Response(200, json={"errcode": 45009, "errmsg": "api freq out of limit"})
+
+        limiter = RateLimiter(quotas={"message/custom/send": 100})
+        transport = TransportManager(transport=httpx.MockTransport(handler))
+        client = WeChatClient("123456", "123456", transport=transport, rate_limiter=limiter)
+        with self.assertRaises(APILimitedException):
+            await client.post("message/custom/send", data={})
+        self.assertEqual(50, limiter.get_bucket("123456", "message/custom/send").rate)
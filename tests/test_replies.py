@@ -27,6 +27,27 @@ class ReplyTestCase(unittest.TestCase):
         create_time = f"<CreateTime>{timestamp}</CreateTime>"
         self.assertTrue(create_time in r)
 
+    def test_reply_render_cdata(self):
+        import xmltodict
+
+        content = "a]]>b<![CDATA[c]]>"
+        reply = TextReply(source="user1", target="user2", content=content)
+        self.assertEqual(content, xmltodict.parse(reply.render())["xml"]["Content"])
+
+    def test_reply_render_plan(self):
+        from aiowechatpy.replies import ArticlesReply, VideoReply
+
+        articles = [{"title": "test", "url": "http://www.qq.com"}]
+        for reply in (
+            TextReply(source="user1", target="user2", time=1, content="test"),
+            VideoReply(source="user1", target="user2", time=1, media_id="123456", title="test"),
+            ArticlesReply(source="user1", target="user2", time=1, articles=articles),
+        ):
+            # the compiled plan renders what the fields render one by one
+            nodes = [f"<MsgType><![CDATA[{reply.type}]]></MsgType>"]
+            nodes += [field.to_xml(getattr(reply, name)) for name, field in reply._fields.items()]
+            self.assertEqual("<xml>\n{}\n</xml>".format("\n".join(nodes)), reply.render())
+
     def test_image_reply_properties(self):
         from aiowechatpy.replies import ImageReply
 
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import httpx
+
+from aiowechatpy import WeChatClient
+from aiowechatpy.client.retry import NO_RETRY, RetryPolicy
+from aiowechatpy.exceptions import WeChatClientException
+from aiowechatpy.transport import TransportManager
+
+
+class FlakyServer:
+    """Fake API answering with the queued failures before succeeding"""
+
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.calls = 0
+        self.tokens = 0
+
+    def __call__(self, request):
+        if request.url.path.endswith("/token"):
+            self.tokens += 1
+            return httpx.Response(200, json={"access_token": f"token{self.tokens}", "expires_in": 7200})
+        self.calls += 1
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            if isinstance(failure, int) and 500 <= failure < 600:
+                return httpx.Response(failure)
+            return httpx.Response(200, json={"errcode": failure, "errmsg": "failed"})
+        return httpx.Response(200, json={"errcode": 0, "errmsg": "ok"})
+
+    def client(self, retry_policy=None):
+        transport = TransportManager(transport=httpx.MockTransport(self))
+        policy = retry_policy or RetryPolicy(backoff_base=0)
+        return WeChatClient("123456", "123456", transport=transport, retry_policy=policy)
+
+
+class RetryPolicyTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_retry_idempotent_server_error(self):
+        server = FlakyServer(503, 502)
+        result = await server.client().get("getcallbackip")
+        self.assertEqual(0, result["errcode"])
+        self.assertEqual(3, server.calls)
+
+    async def test_no_duplicate_non_idempotent(self):
+        server = FlakyServer(503)
+        with self.assertRaises(WeChatClientException):
+            await server.client().post("message/custom/send", data={})
+        self.assertEqual(1, server.calls)
+
+        server = FlakyServer(httpx.ReadTimeout("timeout"))
+        with self.assertRaises(httpx.ReadTimeout):
+            await server.client().post("message/custom/send", data={})
+        self.assertEqual(1, server.calls)
+
+        # system busy does not mean the message was not sent
+        server = FlakyServer(-1)
+        with self.assertRaises(WeChatClientException) as cm:
+            await server.client().post("message/custom/send", data={})
+        self.assertEqual(-1, cm.exception.errcode)
+        self.assertEqual(1, server.calls)
+
+    async def test_retry_non_idempotent_not_sent(self):
+        server = FlakyServer(httpx.ConnectError("refused"), httpx.ConnectTimeout("timeout"))
+        result = await server.client().post("message/custom/send", data={})
+        self.assertEqual(0, result["errcode"])
+        self.assertEqual(3, server.calls)
+
+    async def test_idempotent_endpoints(self):
+        server = FlakyServer(503)
+        policy = RetryPolicy(backoff_base=0, idempotent_endpoints=("user/info/batchget",))
+        await server.client(policy).post("user/info/batchget", data={})
+        self.assertEqual(2, server.calls)
+
+        server = FlakyServer(503)
+        await server.client().post("user/info/batchget", data={}, idempotent=True)
+        self.assertEqual(2, server.calls)
+
+    async def test_max_attempts(self):
+        server = FlakyServer(-1, -1, -1, -1)
+        with self.assertRaises(WeChatClientException) as cm:
+            await server.client().get("getcallbackip")
+        self.assertEqual(-1, cm.exception.errcode)
+        self.assertEqual(3, server.calls)
+
+    async def test_per_call_override(self):
+        server = FlakyServer(-1)
+        with self.assertRaises(WeChatClientException):
+            await server.client().get("getcallbackip", retry_policy=NO_RETRY)
+        self.assertEqual(1, server.calls)
+
+    async def test_token_retry_is_bounded(self):
+        server = FlakyServer(40001, 40001, 40001)
+        with self.assertRaises(WeChatClientException) as cm:
+            await server.client(NO_RETRY).get("getcallbackip")
+        self.assertEqual(40001, cm.exception.errcode)
+        self.assertEqual(2, server.calls)
+        self.assertEqual(2, server.tokens)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+        self.assertEqual([1, 2, 4, 5], [policy.backoff(attempt) for attempt in range(1, 5)])
+        policy.jitter = True
+        self.assertTrue(0 <= policy.backoff(3) <= 4)
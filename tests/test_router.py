@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from aiowechatpy import MessageRouter
+from aiowechatpy.events import ClickEvent, SubscribeScanEvent
+from aiowechatpy.messages import ImageMessage, TextMessage
+from aiowechatpy.replies import EmptyReply, TextReply
+
+
+def click(key, agent=None):
+    message = {"MsgType": "event", "Event": "CLICK", "EventKey": key, "FromUserName": "user", "ToUserName": "app"}
+    if agent is not None:
+        from aiowechatpy.work.events import ClickEvent as WorkClickEvent
+
+        return WorkClickEvent(dict(message, AgentID=agent))
+    return ClickEvent(message)
+
+
+class MessageRouterTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_route_by_type(self):
+        router = MessageRouter()
+
+        @router.message("text")
+        async def echo(message):
+            return message.content
+
+        @router.message("event")
+        def any_event(message):
+            return "event"
+
+        reply = await router.dispatch(TextMessage({"Content": "hello", "FromUserName": "user", "ToUserName": "app"}))
+        self.assertIsInstance(reply, TextReply)
+        self.assertEqual("hello", reply.content)
+        self.assertEqual("user", reply.target)
+        self.assertEqual("event", (await router.dispatch(click("menu"))).content)
+        self.assertIsInstance(await router.dispatch(ImageMessage({})), EmptyReply)
+
+    async def test_route_by_event_key(self):
+        router = MessageRouter()
+        for name, kwargs in (
+            ("exact", {"key": "order_1"}),
+            ("prefix", {"key_prefix": "order_"}),
+            ("longer prefix", {"key_prefix": "order_vip_"}),
+            ("regex", {"key_regex": r"\d+$"}),
+            ("any", {}),
+        ):
+            router.add_handler(lambda message, name=name: name, "event", "click", **kwargs)
+
+        for key, expected in (
+            ("order_1", "exact"),
+            ("order_2", "prefix"),
+            ("order_vip_2", "longer prefix"),
+            ("42", "regex"),
+            ("menu", "any"),
+        ):
+            self.assertEqual(expected, (await router.dispatch(click(key))).content)
+        self.assertIsNone(router.resolve(SubscribeScanEvent({})))
+
+    async def test_route_by_agent(self):
+        router = MessageRouter()
+        router.add_handler(lambda message: "agent 1", "event", "click", key="menu", agent=1)
+        router.add_handler(lambda message: "any agent", "event", "click", key="menu")
+        router.default(lambda message: "default")
+
+        self.assertEqual("agent 1", (await router.dispatch(click("menu", agent="1"))).content)
+        self.assertEqual("any agent", (await router.dispatch(click("menu", agent="2"))).content)
+        self.assertEqual("default", (await router.dispatch(click("other", agent="1"))).content)
+
+    async def test_middleware(self):
+        router = MessageRouter()
+        calls = []
+
+        @router.message("text")
+        async def echo(message):
+            calls.append("handler")
+            return message.content
+
+        @router.use
+        async def outer(message, call_next):
+            calls.append("outer")
+            return await call_next(message)
+
+        @router.use
+        async def inner(message, call_next):
+            calls.append("inner")
+            if message.content == "skip":
+                return EmptyReply()
+            return await call_next(message)
+
+        self.assertEqual("hi", (await router.dispatch(TextMessage({"Content": "hi"}))).content)
+        self.assertEqual(["outer", "inner", "handler"], calls)
+        self.assertIsInstance(await router.dispatch(TextMessage({"Content": "skip"})), EmptyReply)
+        self.assertEqual(["outer", "inner", "handler", "outer", "inner"], calls)
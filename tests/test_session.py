@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 import os
 import json
+import asyncio
+import importlib.util
 import platform
+import time
 import unittest
 
 from httmock import urlmatch, HTTMock, response
@@ -102,3 +105,496 @@ class WeChatSessionTestCase(unittest.TestCase):
             self.assertEqual("1234567890", token["access_token"])
             self.assertEqual(7200, token["expires_in"])
             self.assertEqual("1234567890", client.access_token)
+
+
+class MemoryStorageTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_ttl(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+
+        session = MemoryStorage()
+        await session.set("token", "abc", ttl=0.01)
+        await session.set("forever", "xyz")
+        self.assertEqual("abc", await session.get("token"))
+        await asyncio.sleep(0.02)
+        self.assertIsNone(await session.get("token"))
+        self.assertEqual("xyz", await session.get("forever"))
+        self.assertEqual((2, 1, 1), (session.hits, session.misses, session.expirations))
+
+    async def test_sweep(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+
+        session = MemoryStorage(sweep_interval=0.01)
+        for i in range(10):
+            await session.set(f"key{i}", i, ttl=0.01)
+        await asyncio.sleep(0.02)
+        # the sweep is triggered by writes
+        await session.set("key", "value")
+        self.assertEqual(["key"], list(session._data))
+        self.assertEqual(10, session.expirations)
+
+    async def test_lru_eviction(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+
+        session = MemoryStorage(max_entries=2)
+        await session.set("a", 1)
+        await session.set("b", 2)
+        await session.get("a")
+        await session.set("c", 3)
+        self.assertIsNone(await session.get("b"))
+        self.assertEqual(1, await session.get("a"))
+        self.assertEqual(3, await session.get("c"))
+        self.assertEqual(1, session.evictions)
+
+    async def test_lease_expires(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+
+        session = MemoryStorage()
+        self.assertTrue(await session.acquire_lease("lease", 0.01))
+        self.assertIsNone(await session.acquire_lease("lease", 0.01))
+        await asyncio.sleep(0.02)
+        self.assertTrue(await session.acquire_lease("lease", 0.01))
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client, shared by several nodes"""
+
+    class Pipeline:
+        def __init__(self, redis):
+            self.redis = redis
+            self.commands = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+        async def execute(self):
+            return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+    class PubSub:
+        def __init__(self, redis):
+            self.redis = redis
+            self.queue = asyncio.Queue()
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.redis.subscribers.remove(self.queue)
+
+        async def subscribe(self, channel):
+            self.redis.subscribers.append(self.queue)
+
+        async def listen(self):
+            while True:
+                yield await self.queue.get()
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = []
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key, (None,))[0]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = (value if isinstance(value, bytes) else value.encode(), ex)
+        return True
+
+    async def mget(self, keys):
+        self.gets += 1
+        return [self.data.get(key, (None,))[0] for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def pttl(self, key):
+        ex = self.data.get(key, (None, None))[1]
+        return ex * 1000 if ex else -1
+
+    def pipeline(self, transaction=True):
+        return self.Pipeline(self)
+
+    def pubsub(self):
+        return self.PubSub(self)
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers:
+            queue.put_nowait({"type": "message", "data": message.encode()})
+
+
+class FakeMemcached:
+    """In-memory stand-in for an async memcached client, shared by several nodes"""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    def _get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    async def get(self, key):
+        self.gets += 1
+        return self._get(key)
+
+    async def set(self, key, value, expire=0):
+        expires_at = time.time() + expire if expire else None
+        self.data[key] = (value if isinstance(value, bytes) else value.encode(), expires_at)
+        return True
+
+    async def add(self, key, value, expire=0):
+        if self._get(key) is not None:
+            return False
+        return await self.set(key, value, expire)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def get_many(self, keys):
+        self.gets += 1
+        values = {key: self._get(key) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+
+    async def set_many(self, values, expire=0):
+        for key, value in values.items():
+            await self.set(key, value, expire)
+
+    async def delete_many(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class MemcachedStorageTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_lease(self):
+        from aiowechatpy.session.memcachedstorage import MemcachedStorage
+
+        memcached = FakeMemcached()
+        node1, node2 = MemcachedStorage(memcached), MemcachedStorage(memcached)
+        lease = await node1.acquire_lease("lease", 10)
+        self.assertTrue(lease)
+        self.assertIsNone(await node2.acquire_lease("lease", 10))
+        await node2.release_lease("lease", "not mine")
+        self.assertIsNone(await node2.acquire_lease("lease", 10))
+        await node1.release_lease("lease", lease)
+        self.assertTrue(await node2.acquire_lease("lease", 10))
+
+    async def test_lease_expires(self):
+        from aiowechatpy.session.memcachedstorage import MemcachedStorage
+
+        session = MemcachedStorage(FakeMemcached())
+        lease = await session.acquire_lease("lease", 0.01)
+        self.assertTrue(lease)
+        await asyncio.sleep(0.02)
+        lease2 = await session.acquire_lease("lease", 10)
+        self.assertTrue(lease2)
+        # the expired holder does not release the new lease
+        await session.release_lease("lease", lease)
+        self.assertIsNone(await session.acquire_lease("lease", 10))
+
+
+class TieredStorageTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_local_cache(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        redis = FakeRedis()
+        session = TieredStorage(RedisStorage(redis))
+        await RedisStorage(redis).set("token", "abc", 7200)
+        for _ in range(10):
+            self.assertEqual("abc", await session.get("token"))
+        self.assertEqual(1, redis.gets)
+        self.assertIsNone(await session.get("missing"))
+        await session.set("token", "def", 7200)
+        self.assertEqual("def", await RedisStorage(redis).get("token"))
+        self.assertEqual("def", await session.get("token"))
+
+    async def test_remote_ttl(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        remote = MemoryStorage()
+        session = TieredStorage(remote, local_ttl=60)
+        await remote.set("token", "abc", 0.01)
+        self.assertEqual("abc", await session.get("token"))
+        await asyncio.sleep(0.02)
+        self.assertIsNone(await session.get("token"))
+
+    async def test_invalidation(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        redis = FakeRedis()
+        node1 = TieredStorage(RedisStorage(redis), local_ttl=60)
+        node2 = TieredStorage(RedisStorage(redis), local_ttl=60)
+        node2.start()
+        await asyncio.sleep(0)
+        await node1.set("token", "abc", 7200)
+        self.assertEqual("abc", await node2.get("token"))
+        await node1.set("token", "def", 7200)
+        await asyncio.sleep(0.01)
+        self.assertEqual("def", await node2.get("token"))
+        await node2.stop()
+        self.assertFalse(node2.running)
+
+    async def test_invalidated_during_read(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        class SlowStorage(MemoryStorage):
+            async def get_with_ttl(self, key, default=None):
+                value = await super().get_with_ttl(key, default)
+                await asyncio.sleep(0.01)
+                return value
+
+            async def get_many(self, keys, default=None):
+                values = await super().get_many(keys, default)
+                await asyncio.sleep(0.01)
+                return values
+
+        remote = SlowStorage()
+        session = TieredStorage(remote, local_ttl=60)
+        await remote.set("token", "abc", 7200)
+        for read in (session.get("token"), session.get_many(["token"])):
+            reading = asyncio.ensure_future(read)
+            await asyncio.sleep(0)
+            # another node refreshed the token while the old one was being read
+            await remote.set("token", "def", 7200)
+            await session._invalidate(json.dumps(["node", "token"]))
+            await reading
+            self.assertEqual("def", await session.get("token"))
+            await session.discard_local(["token"])
+            await remote.set("token", "abc", 7200)
+
+    async def test_invalidate_keys_with_spaces(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        redis = FakeRedis()
+        node1 = TieredStorage(RedisStorage(redis), local_ttl=60)
+        node2 = TieredStorage(RedisStorage(redis), local_ttl=60)
+        node2.start()
+        await asyncio.sleep(0)
+        await node1.set_many({"a key": "abc", "other": 1}, 7200)
+        self.assertEqual(["abc", 1], await node2.get_many(["a key", "other"]))
+        await node1.set("a key", "def", 7200)
+        await asyncio.sleep(0.01)
+        self.assertEqual("def", await node2.get("a key"))
+        await node2.stop()
+
+    async def test_lease_not_cached(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        redis = FakeRedis()
+        node1 = TieredStorage(RedisStorage(redis))
+        node2 = TieredStorage(RedisStorage(redis))
+        self.assertTrue(await node1.acquire_lease("lease", 10))
+        self.assertIsNone(await node2.acquire_lease("lease", 10))
+
+
+class BatchOperationTestCase(unittest.IsolatedAsyncioTestCase):
+    async def check_storage(self, session):
+        await session.set_many({"a": 1, "b": "2", "c": None}, ttl=60)
+        self.assertEqual([1, "2", None, None], await session.get_many(["a", "b", "c", "d"]))
+        self.assertEqual([1, 0], await session.get_many(["a", "d"], default=0))
+        await session.delete_many(["a", "b"])
+        self.assertEqual([None, None], await session.get_many(["a", "b"]))
+
+    async def test_memory_storage(self):
+        from aiowechatpy.session.memorystorage import MemoryStorage
+
+        await self.check_storage(MemoryStorage())
+
+    async def test_redis_storage(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+
+        redis = FakeRedis()
+        await self.check_storage(RedisStorage(redis))
+        self.assertEqual(3, redis.gets)
+
+    async def test_memcached_storage(self):
+        from aiowechatpy.session.memcachedstorage import MemcachedStorage
+
+        memcached = FakeMemcached()
+        await self.check_storage(MemcachedStorage(memcached))
+        self.assertEqual(3, memcached.gets)
+        self.assertEqual([], await MemcachedStorage(memcached).get_many([]))
+        await MemcachedStorage(memcached).set_many({"x": None})
+        self.assertEqual({}, memcached.data)
+
+    async def test_tiered_storage(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+        from aiowechatpy.session.tieredstorage import TieredStorage
+
+        redis = FakeRedis()
+        await self.check_storage(TieredStorage(RedisStorage(redis)))
+        session = TieredStorage(RedisStorage(redis))
+        await RedisStorage(redis).set_many({"x": 1, "y": 2})
+        redis.gets = 0
+        self.assertEqual([1, 2, None], await session.get_many(["x", "y", "z"]))
+        self.assertEqual([1, 2], await session.get_many(["x", "y"]))
+        self.assertEqual(1, redis.gets)
+
+
+class SerializerTestCase(unittest.IsolatedAsyncioTestCase):
+    values = ["token", "", "中文", 1, 1.5, None, True, {"a": [1, "b"]}, ["x"]]
+
+    def check_serializer(self, serializer):
+        for value in self.values:
+            self.assertEqual(value, serializer.loads(serializer.dumps(value)))
+
+    def test_json_serializer(self):
+        from aiowechatpy.session.serializer import JSONSerializer
+
+        self.check_serializer(JSONSerializer())
+        # values written by earlier versions
+        self.assertEqual({"a": 1}, JSONSerializer().loads('{"a": 1}'))
+
+    def test_string_serializer(self):
+        from aiowechatpy.session.serializer import JSONSerializer, StringSerializer
+
+        serializer = StringSerializer()
+        self.check_serializer(serializer)
+        self.assertEqual(b"\xc1token", serializer.dumps("token"))
+        self.assertEqual("token", serializer.loads(JSONSerializer().dumps("token")))
+
+    @unittest.skipIf(importlib.util.find_spec("msgpack") is None, "msgpack is not installed")
+    def test_msgpack_serializer(self):
+        from aiowechatpy.session.serializer import MsgpackSerializer, StringSerializer
+
+        self.check_serializer(MsgpackSerializer())
+        self.check_serializer(StringSerializer(MsgpackSerializer()))
+
+    async def test_redis_storage(self):
+        from aiowechatpy.session.redisstorage import RedisStorage
+        from aiowechatpy.session.serializer import StringSerializer
+
+        redis = FakeRedis()
+        session = RedisStorage(redis, serializer=StringSerializer())
+        await session.set("token", "abc")
+        await session.set("expires_at", 1700000000)
+        self.assertEqual(b"\xc1abc", redis.data["wechatpy:token"][0])
+        self.assertEqual(["abc", 1700000000], await session.get_many(["token", "expires_at"]))
+
+
+class SQLiteStorageTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        import tempfile
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "session.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def storage(self):
+        from aiowechatpy.session.sqlitestorage import SQLiteStorage
+
+        session = SQLiteStorage(self.path)
+        self.addCleanup(session.close)
+        return session
+
+    async def test_shared_between_storages(self):
+        # separate connections to the same file stand in for worker processes
+        worker1, worker2 = self.storage(), self.storage()
+        await worker1.set("token", "abc", 7200)
+        await worker1.set_many({"a": {"b": 1}, "c": [2]})
+        self.assertEqual("abc", await worker2.get("token"))
+        self.assertEqual([{"b": 1}, [2], None], await worker2.get_many(["a", "c", "d"]))
+        value, ttl = await worker2.get_with_ttl("token")
+        self.assertTrue(7100 < ttl <= 7200)
+        await worker2.delete_many(["a", "c"])
+        await worker2.delete("token")
+        self.assertEqual([None, None, None], await worker1.get_many(["a", "c", "token"]))
+
+    async def test_ttl(self):
+        session = self.storage()
+        await session.set("token", "abc", 0.01)
+        await asyncio.sleep(0.02)
+        self.assertIsNone(await session.get("token"))
+        self.assertEqual(1, session.sweep())
+
+    async def test_lease(self):
+        worker1, worker2 = self.storage(), self.storage()
+        lease = await worker1.acquire_lease("lease", 0.05)
+        self.assertTrue(lease)
+        self.assertIsNone(await worker2.acquire_lease("lease", 10))
+        await worker2.release_lease("lease", "not mine")
+        self.assertIsNone(await worker2.acquire_lease("lease", 10))
+        await asyncio.sleep(0.06)
+        # expired leases can be taken over
+        lease2 = await worker2.acquire_lease("lease", 10)
+        self.assertTrue(lease2)
+        await worker1.release_lease("lease", lease)
+        self.assertIsNone(await worker1.acquire_lease("lease", 10))
+        await worker2.release_lease("lease", lease2)
+        self.assertTrue(await worker1.acquire_lease("lease", 10))
+
+    async def test_locked_does_not_block_loop(self):
+        import sqlite3
+
+        session = self.storage()
+        await session.set("token", "abc", 7200)
+        # another worker holds the write lock
+        other = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.ensure_future(tick())
+        writing = asyncio.ensure_future(session.set("token", "def", 7200))
+        await asyncio.sleep(0.05)
+        self.assertFalse(writing.done())
+        # the event loop kept running while the write waited
+        self.assertGreater(ticks, 5)
+        self.assertEqual("abc", await session.get("token"))
+        other.execute("COMMIT")
+        await writing
+        ticker.cancel()
+        self.assertEqual("def", await session.get("token"))
+
+    async def test_locked_timeout(self):
+        import sqlite3
+
+        from aiowechatpy.session.sqlitestorage import SQLiteStorage
+
+        session = SQLiteStorage(self.path, timeout=0.05)
+        self.addCleanup(session.close)
+        await session.set("token", "abc", 7200)
+        other = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+        with self.assertRaises(sqlite3.OperationalError):
+            await session.delete_many(["token"])
+        other.execute("ROLLBACK")
+        self.assertEqual("abc", await session.get("token"))
+
+    async def test_one_fetch_per_host(self):
+        from aiowechatpy.session.sqlitestorage import SQLiteStorage
+        from helpers import TokenServer
+
+        server = TokenServer(delay=0.2)
+        transport = server.transport()
+        workers = [WeChatClient("123456", "123456", session=self.storage(), transport=transport) for _ in range(3)]
+        self.assertIsInstance(workers[0].session, SQLiteStorage)
+        tokens = await asyncio.gather(*[worker.access_token() for worker in workers])
+        self.assertEqual({"token1"}, set(tokens))
+        self.assertEqual(1, server.issued)
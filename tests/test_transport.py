@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+import httpx
+
+from aiowechatpy import WeChatClient, WeChatComponent, WeChatOAuth
+from aiowechatpy.client import WeChatComponentClient
+from aiowechatpy.transport import TransportManager, get_transport_manager
+
+
+class TransportManagerTestCase(unittest.TestCase):
+    def test_clients_share_default_manager(self):
+        client1 = WeChatClient("123456", "123456")
+        client2 = WeChatClient("654321", "654321")
+        oauth = WeChatOAuth("123456", "123456", "http://localhost")
+        self.assertIs(client1._http, get_transport_manager())
+        self.assertIs(client1._http, client2._http)
+        self.assertIs(client1._http, oauth._http)
+
+    def test_custom_manager(self):
+        manager = TransportManager()
+        client = WeChatClient("123456", "123456", transport=manager)
+        self.assertIs(manager, client._http)
+
+    def test_one_pool_per_host(self):
+        manager = TransportManager()
+        api = manager.get_client("https://api.weixin.qq.com/cgi-bin/token")
+        self.assertIs(api, manager.get_client("https://api.weixin.qq.com:443/sns/userinfo"))
+        self.assertIsNot(api, manager.get_client("https://qyapi.weixin.qq.com/cgi-bin/gettoken"))
+        self.assertIsNot(api, manager.get_client("http://api.weixin.qq.com/cgi-bin/token"))
+
+    def test_request_and_aclose(self):
+        seen = []
+
+        def handler(request):
+            seen.append(str(request.url))
+            return httpx.Response(200, json={"errcode": 0})
+
+        async def run():
+            manager = TransportManager(transport=httpx.MockTransport(handler))
+            res = await manager.get("https://api.weixin.qq.com/cgi-bin/getcallbackip")
+            pool = manager.get_client("https://api.weixin.qq.com/")
+            await manager.aclose()
+            return res, pool
+
+        res, pool = asyncio.run(run())
+        self.assertEqual(0, res.json()["errcode"])
+        self.assertEqual(["https://api.weixin.qq.com/cgi-bin/getcallbackip"], seen)
+        self.assertTrue(pool.is_closed)
+
+    def test_http2_fallback(self):
+        manager = TransportManager(http2=True, max_connections=10)
+        self.assertEqual(10, manager.limits.max_connections)
+        self.assertIsInstance(manager.http2, bool)
+
+
+class LifecycleTestCase(unittest.IsolatedAsyncioTestCase):
+    def manager(self):
+        return TransportManager(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+
+    async def test_manager_context(self):
+        async with self.manager() as manager:
+            pool = manager.get_client("https://api.weixin.qq.com/")
+        self.assertTrue(pool.is_closed)
+
+    async def test_client_context_stops_refresher(self):
+        async with WeChatClient("123456", "123456") as client:
+            refresher = client.start_refresher(interval=3600)
+            self.assertTrue(refresher.running)
+            pool = get_transport_manager().get_client("https://api.weixin.qq.com/")
+        self.assertFalse(refresher.running)
+        # the default pool is shared with other clients
+        self.assertFalse(pool.is_closed)
+        await client.aclose()
+
+    async def test_client_closes_own_manager(self):
+        manager = self.manager()
+        async with WeChatClient("123456", "123456", transport=manager):
+            pool = manager.get_client("https://api.weixin.qq.com/")
+        self.assertTrue(pool.is_closed)
+
+    async def test_component_closes_own_manager(self):
+        manager = self.manager()
+        async with WeChatComponent("123456", "123456", "123456", "a" * 43, transport=manager) as component:
+            pool = manager.get_client("https://api.weixin.qq.com/")
+            # the authorizer clients borrow the component's manager
+            async with WeChatComponentClient("654321", component):
+                pass
+            self.assertFalse(pool.is_closed)
+        self.assertTrue(pool.is_closed)
+
+    async def test_oauth_context(self):
+        async with WeChatOAuth("123456", "123456", "http://localhost") as oauth:
+            self.assertTrue(oauth.authorize_url)
+        manager = self.manager()
+        async with WeChatOAuth("123456", "123456", "http://localhost", transport=manager):
+            pool = manager.get_client("https://api.weixin.qq.com/")
+        self.assertTrue(pool.is_closed)